@@ -0,0 +1,136 @@
+import hashlib
+import math
+from typing import Any, Iterable
+
+
+class BloomFilter:
+    """A Bloom filter for fast negative membership tests.
+
+    Answers "definitely absent" or "maybe present". Bit positions come from
+    one blake2b digest of ``str(key)`` split into two halves (double
+    hashing), matching how HashTable converts keys before hashing them.
+    A lookup stops at the first unset bit, so most absent keys cost one
+    digest and a bit test or two.
+
+    Attributes:
+        capacity: Number of keys the filter is sized for
+        error_rate: Target false-positive rate at full capacity
+        bit_count: Number of bits in the filter
+        hash_count: Number of bit positions checked per key
+        negatives: Lookups rejected by the filter, as reported by the owner
+        false_positives: Lookups the filter passed for absent keys, as reported by the owner
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Expected number of keys. Must be positive.
+            error_rate: Target false-positive rate, between 0 and 1.
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range.
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        self.error_rate = error_rate
+        self.negatives = 0
+        self.false_positives = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Size and clear the bit array for the given capacity.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive")
+        self.capacity = capacity
+        self.bit_count = max(8, math.ceil(-capacity * math.log(self.error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self.bit_count + 7) // 8)
+        self._count = 0
+
+    @staticmethod
+    def _hash_pair(key: Any) -> tuple[int, int]:
+        """Compute the two base hashes of a key.
+
+        Args:
+            key: Key to hash. Will be converted to string.
+
+        Returns:
+            Start and (odd) step of the key's bit positions.
+        """
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def add(self, key: Any) -> None:
+        """Add a key to the filter.
+
+        Args:
+            key: Key to add.
+        """
+        h1, h2 = self._hash_pair(key)
+        bits, bit_count = self._bits, self.bit_count
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def rebuild(self, keys: Iterable[Any], capacity: int) -> None:
+        """Clear the filter and refill it, keeping the measured counters.
+
+        Args:
+            keys: Keys that should be present after the rebuild.
+            capacity: New expected number of keys.
+        """
+        self._allocate(capacity)
+        for key in keys:
+            self.add(key)
+
+    @property
+    def expected_error_rate(self) -> float:
+        """Theoretical false-positive rate for the keys added so far.
+
+        Returns:
+            (1 - e^(-k*n/m))^k for k hashes, n keys and m bits.
+        """
+        return (1 - math.exp(-self.hash_count * self._count / self.bit_count)) ** self.hash_count
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Measured false-positive rate over all lookups of absent keys.
+
+        Returns:
+            false_positives / (negatives + false_positives), 0.0 if none were seen.
+        """
+        absent_lookups = self.negatives + self.false_positives
+        if absent_lookups == 0:
+            return 0.0
+        return self.false_positives / absent_lookups
+
+    def __contains__(self, key: Any) -> bool:
+        """Check if key may be in the filter.
+
+        Args:
+            key: Key to check.
+
+        Returns:
+            False if key was never added, True if it probably was.
+        """
+        h1, h2 = self._hash_pair(key)
+        bits, bit_count = self._bits, self.bit_count
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % bit_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Get number of keys added since the last rebuild.
+
+        Returns:
+            Number of add() calls, including keys deleted from the owner since.
+        """
+        return self._count
@@ -0,0 +1,289 @@
+import hashlib
+import pickle
+import struct
+from array import array
+from typing import Any, Iterable, Iterator, Optional
+
+
+class FrozenHashTable:
+    """An immutable hash table built on a minimal perfect hash.
+
+    Uses the hash-and-displace (CHD) scheme: every key is hashed once into
+    a bucket index and two position hashes, and each bucket stores a
+    displacement that sends all of its keys to free slots. The slot array
+    has exactly one entry per key, so a lookup reads one displacement and
+    one slot - at most two probes, no chains to walk.
+
+    Keys are hashed through ``repr()``, so they must have a repr that is
+    stable across processes (strings, numbers, tuples of them, ...).
+
+    Attributes:
+        seed: Hash seed that produced a collision-free placement
+    """
+
+    _MAGIC = b"FHT1"
+    _HEADER = struct.Struct("<4sQQ")
+    _MAX_SEEDS = 32
+    _MAX_DISPLACEMENT_ROUNDS = 64
+
+    def __init__(self, items: Iterable[tuple[Any, Any]] = ()) -> None:
+        """Build a frozen table from key-value pairs.
+
+        Args:
+            items: Key-value pairs with unique keys.
+
+        Raises:
+            ValueError: If two keys have the same repr() or no seed
+                gives a perfect placement.
+        """
+        pairs = list(items)
+        encoded = [repr(key).encode() for key, _ in pairs]
+        if len(set(encoded)) != len(encoded):
+            raise ValueError("Keys must have distinct repr()")
+
+        for seed in range(self._MAX_SEEDS):
+            placement = self._place(encoded, seed)
+            if placement is not None:
+                break
+        else:
+            raise ValueError("Could not build a perfect hash for these keys")
+
+        displacements, slots = placement
+        self.seed = seed
+        self._displacements = displacements
+        self._keys = tuple(pairs[i][0] for i in slots)
+        self._values = tuple(pairs[i][1] for i in slots)
+
+    @staticmethod
+    def _hash(data: bytes, seed: int) -> tuple[int, int, int]:
+        """Seeded hash of an encoded key.
+
+        Args:
+            data: Key encoded as bytes.
+            seed: Seed mixed into the hash.
+
+        Returns:
+            Bucket hash and two position hashes, 32 bits each.
+        """
+        digest = hashlib.blake2b(data, digest_size=12, salt=seed.to_bytes(16, "little")).digest()
+        return struct.unpack("<III", digest)
+
+    @classmethod
+    def _place(cls, encoded: list[bytes], seed: int) -> Optional[tuple[array, list[int]]]:
+        """Find a displacement for every bucket.
+
+        Args:
+            encoded: Encoded keys.
+            seed: Hash seed to try.
+
+        Returns:
+            Displacement array and key index for every slot,
+            or None if some bucket could not be placed.
+        """
+        n = len(encoded)
+        displacements = array("q", [0] * n)
+        slots = [-1] * n
+        if n == 0:
+            return displacements, slots
+
+        buckets: list[list[tuple[int, int, int]]] = [[] for _ in range(n)]
+        for i, data in enumerate(encoded):
+            bucket_hash, f1, f2 = cls._hash(data, seed)
+            buckets[bucket_hash % n].append((i, f1, f2))
+
+        # Largest buckets first, while the slot array is still mostly empty
+        order = sorted(range(n), key=lambda b: len(buckets[b]), reverse=True)
+        for b in order:
+            bucket = buckets[b]
+            if len(bucket) <= 1:
+                break
+            for displacement in range(n * cls._MAX_DISPLACEMENT_ROUNDS):
+                d0, d1 = divmod(displacement, n)
+                taken = [(f1 + d0 * f2 + d1) % n for _, f1, f2 in bucket]
+                if len(set(taken)) == len(taken) and all(slots[s] == -1 for s in taken):
+                    break
+            else:
+                return None
+            for (i, _, _), s in zip(bucket, taken):
+                slots[s] = i
+            displacements[b] = displacement
+
+        # Single-key buckets point straight at a free slot, stored as -(slot + 1)
+        free = (s for s in range(n) if slots[s] == -1)
+        for b in order:
+            if len(buckets[b]) == 1:
+                s = next(free)
+                slots[s] = buckets[b][0][0]
+                displacements[b] = -s - 1
+        return displacements, slots
+
+    def _slot(self, key: Any) -> int:
+        """Compute the only slot a key can occupy.
+
+        Args:
+            key: Key to locate.
+
+        Returns:
+            Index in the slot array.
+        """
+        n = len(self._keys)
+        bucket_hash, f1, f2 = self._hash(repr(key).encode(), self.seed)
+        displacement = self._displacements[bucket_hash % n]
+        if displacement < 0:
+            return -displacement - 1
+        d0, d1 = divmod(displacement, n)
+        return (f1 + d0 * f2 + d1) % n
+
+    def get(self, key: Any, default: Any = None) -> Optional[Any]:
+        """Retrieve value associated with key.
+
+        Args:
+            key: Key to search for.
+            default: Value returned when key is missing.
+
+        Returns:
+            Associated value if found, default otherwise.
+        """
+        if not self._keys:
+            return default
+        slot = self._slot(key)
+        if self._keys[slot] == key:
+            return self._values[slot]
+        return default
+
+    def keys(self) -> tuple[Any, ...]:
+        """Get all keys in slot order.
+
+        Returns:
+            Tuple of all keys.
+        """
+        return self._keys
+
+    def values(self) -> tuple[Any, ...]:
+        """Get all values in slot order.
+
+        Returns:
+            Tuple of all values.
+        """
+        return self._values
+
+    def items(self) -> Iterator[tuple[Any, Any]]:
+        """Iterate over all key-value pairs.
+
+        Yields:
+            Tuples of (key, value) pairs.
+        """
+        return zip(self._keys, self._values)
+
+    def to_dict(self) -> dict[Any, Any]:
+        """Convert frozen table to dictionary.
+
+        Returns:
+            Dictionary containing all key-value pairs.
+        """
+        return dict(self.items())
+
+    def to_bytes(self) -> bytes:
+        """Serialize the table without losing the computed placement.
+
+        Returns:
+            Header, raw displacement array and pickled keys and values.
+        """
+        header = self._HEADER.pack(self._MAGIC, len(self._keys), self.seed)
+        payload = pickle.dumps((self._keys, self._values), protocol=pickle.HIGHEST_PROTOCOL)
+        return header + self._displacements.tobytes() + payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'FrozenHashTable':
+        """Load a table produced by to_bytes() without rehashing any key.
+
+        Args:
+            data: Serialized table.
+
+        Returns:
+            New FrozenHashTable instance.
+
+        Raises:
+            ValueError: If data is not a serialized FrozenHashTable.
+        """
+        magic, n, seed = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("Not a serialized FrozenHashTable")
+
+        offset = cls._HEADER.size
+        displacements = array("q")
+        displacements.frombytes(data[offset:offset + n * displacements.itemsize])
+        offset += n * displacements.itemsize
+
+        table = cls.__new__(cls)
+        table.seed = seed
+        table._displacements = displacements
+        table._keys, table._values = pickle.loads(data[offset:])
+        return table
+
+    def __reduce__(self) -> tuple[Any, tuple[bytes]]:
+        """Pickle through to_bytes() so unpickling skips the build step."""
+        return FrozenHashTable.from_bytes, (self.to_bytes(),)
+
+    def _immutable(self, *args: Any) -> None:
+        """Reject any modification.
+
+        Raises:
+            TypeError: Always.
+        """
+        raise TypeError("FrozenHashTable is immutable")
+
+    put = delete = __setitem__ = __delitem__ = _immutable
+
+    def __contains__(self, key: Any) -> bool:
+        """Check if key exists in frozen table.
+
+        Args:
+            key: Key to check.
+
+        Returns:
+            True if key exists, False otherwise.
+        """
+        return bool(self._keys) and self._keys[self._slot(key)] == key
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get value using subscript notation.
+
+        Args:
+            key: Key to look up.
+
+        Returns:
+            Value associated with key.
+
+        Raises:
+            KeyError: If key not found.
+        """
+        if self._keys:
+            slot = self._slot(key)
+            if self._keys[slot] == key:
+                return self._values[slot]
+        raise KeyError(f"Key '{key}' not found")
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over keys in slot order.
+
+        Yields:
+            Each key in the frozen table.
+        """
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        """Get number of items in frozen table.
+
+        Returns:
+            Total number of key-value pairs.
+        """
+        return len(self._keys)
+
+    def __str__(self) -> str:
+        """String representation of frozen table.
+
+        Returns:
+            String showing the stored pairs.
+        """
+        return f"FrozenHashTable({self.to_dict()})"
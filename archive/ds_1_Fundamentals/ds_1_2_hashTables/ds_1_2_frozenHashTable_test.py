@@ -0,0 +1,83 @@
+import pickle
+
+import pytest
+from ds_1_2_frozenHashTable import FrozenHashTable
+from ds_1_2_hashTables import HashTable
+
+
+class TestFrozenHashTable:
+    """Тесты для класса FrozenHashTable"""
+
+    def test_freeze(self):
+        """Тест заморозки хэш-таблицы"""
+        ht = HashTable()
+        for i in range(100):
+            ht.put(f"key{i}", i)
+        
+        frozen = ht.freeze()
+        
+        assert len(frozen) == 100
+        assert frozen.to_dict() == ht.to_dict()
+        for i in range(100):
+            assert frozen[f"key{i}"] == i
+            assert f"key{i}" in frozen
+
+    def test_missing_keys(self):
+        """Тест поиска отсутствующих ключей"""
+        frozen = FrozenHashTable([("a", None), ("b", 2)])
+        
+        assert frozen.get("a", "default") is None
+        assert frozen.get("missing") is None
+        assert frozen.get("missing", 0) == 0
+        assert "missing" not in frozen
+        
+        with pytest.raises(KeyError):
+            _ = frozen["missing"]
+
+    def test_empty_table(self):
+        """Тест пустой замороженной таблицы"""
+        frozen = HashTable().freeze()
+        
+        assert len(frozen) == 0
+        assert "key" not in frozen
+        assert frozen.get("key") is None
+
+    def test_various_key_types(self):
+        """Тест различных типов ключей"""
+        pairs = [("1", "str"), (1, "int"), (1.5, "float"), (None, "none"), ((1, 2), "tuple")]
+        frozen = FrozenHashTable(pairs)
+        
+        for key, value in pairs:
+            assert frozen[key] == value
+
+    def test_immutable(self):
+        """Тест запрета изменений"""
+        frozen = FrozenHashTable([("a", 1)])
+        
+        with pytest.raises(TypeError):
+            frozen["a"] = 2
+        with pytest.raises(TypeError):
+            del frozen["a"]
+        with pytest.raises(TypeError):
+            frozen.put("b", 2)
+        with pytest.raises(TypeError):
+            frozen.delete("a")
+
+    def test_duplicate_repr(self):
+        """Тест ключей с одинаковым repr"""
+        with pytest.raises(ValueError, match="distinct repr"):
+            FrozenHashTable([("a", 1), ("a", 2)])
+
+    def test_serialization(self):
+        """Тест сериализации в байты и через pickle"""
+        frozen = FrozenHashTable((i, str(i)) for i in range(1000))
+        
+        restored = FrozenHashTable.from_bytes(frozen.to_bytes())
+        assert restored.to_dict() == frozen.to_dict()
+        assert restored[999] == "999"
+        
+        unpickled = pickle.loads(pickle.dumps(frozen))
+        assert unpickled.to_dict() == frozen.to_dict()
+        
+        with pytest.raises(ValueError, match="Not a serialized"):
+            FrozenHashTable.from_bytes(b"XXXX" + bytes(16))
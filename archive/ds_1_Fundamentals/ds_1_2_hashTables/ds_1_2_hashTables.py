@@ -1,5 +1,110 @@
+import argparse
+import math
+import time
+from collections.abc import ItemsView, KeysView, ValuesView
 from typing import Any, Iterator, Optional, Union, Generator
 
+from ds_1_2_bloomFilter import BloomFilter
+from ds_1_2_frozenHashTable import FrozenHashTable
+
+
+# Marks a missing key, so stored None values are not mistaken for "not found"
+_MISSING = object()
+
+
+class HashTableStats:
+    """Live counters collected by a HashTable created with ``track_stats=True``.
+    
+    Attributes:
+        lookups: Number of get/put/delete operations recorded
+        probes: Total number of bucket entries compared across all lookups
+        max_probe: Longest probe sequence seen by a single lookup
+        resizes: Number of times the table was resized
+        resize_time: Total seconds spent inside resize
+    """
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters to zero."""
+        self.lookups = 0
+        self.probes = 0
+        self.max_probe = 0
+        self.resizes = 0
+        self.resize_time = 0.0
+
+    def record_probe(self, probes: int) -> None:
+        """Record a single lookup.
+        
+        Args:
+            probes: Number of bucket entries compared by the lookup.
+        """
+        self.lookups += 1
+        self.probes += probes
+        if probes > self.max_probe:
+            self.max_probe = probes
+
+    def record_resize(self, elapsed: float) -> None:
+        """Record a single resize.
+        
+        Args:
+            elapsed: Seconds spent rehashing.
+        """
+        self.resizes += 1
+        self.resize_time += elapsed
+
+    @property
+    def avg_probe(self) -> float:
+        """Average number of entries compared per lookup.
+        
+        Returns:
+            Mean probe length, 0.0 if nothing was recorded.
+        """
+        if self.lookups == 0:
+            return 0.0
+        return self.probes / self.lookups
+
+    def to_dict(self) -> dict[str, Union[int, float]]:
+        """Convert counters to dictionary.
+        
+        Returns:
+            Dictionary with every counter and the average probe length.
+        """
+        return {
+            "lookups": self.lookups,
+            "avg_probe": round(self.avg_probe, 3),
+            "max_probe": self.max_probe,
+            "resizes": self.resizes,
+            "resize_time": self.resize_time,
+        }
+
+
+class HashTableKeysView(KeysView):
+    """Live view of HashTable keys.
+    
+    Membership hashes straight to the key's bucket; set operations come
+    from ``collections.abc.Set``.
+    """
+
+
+class HashTableValuesView(ValuesView):
+    """Live view of HashTable values."""
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over values bucket by bucket, without rehashing keys."""
+        for _, value in self._mapping._iter_items():
+            yield value
+
+
+class HashTableItemsView(ItemsView):
+    """Live view of HashTable (key, value) pairs."""
+
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        """Iterate over pairs bucket by bucket, without rehashing keys."""
+        yield from self._mapping._iter_items()
+
 
 class HashTable:
     """A hash table implementation with chaining collision resolution.
@@ -9,17 +114,30 @@ class HashTable:
     Attributes:
         size: Current capacity of the hash table
         load_factor: Ratio of items to capacity (0.0 to 1.0)
+        stats: Live counters, None unless created with track_stats=True
+        bloom: Filter for absent keys, None unless created with bloom_error_rate
     """
     
-    def __init__(self, size: int = 2**4, auto_resize: bool = True) -> None:
+    def __init__(self, size: int = 2**4, auto_resize: bool = True,
+                 track_stats: bool = False, bloom_error_rate: Optional[float] = None) -> None:
         """Initialize a new hash table.
         
         Args:
             size: Initial capacity of the hash table. Must be positive.
+            auto_resize: Grow and shrink the table based on load factor.
+            track_stats: Collect probe and resize counters in ``stats``.
+            bloom_error_rate: Attach a Bloom filter with this target
+                false-positive rate, so lookups of absent keys usually
+                skip ``_hash`` and the bucket scan.
         """
         self.size = size
         self.auto_resize = auto_resize
+        self.stats: Optional[HashTableStats] = HashTableStats() if track_stats else None
         self.__table: list[list[tuple[Any, Any]]] = [[] for _ in range(size)]
+        self.__count = 0
+        self.bloom: Optional[BloomFilter] = None
+        if bloom_error_rate is not None:
+            self.bloom = BloomFilter(self._bloom_capacity(), bloom_error_rate)
 
     def _hash(self, key: Any) -> str:
         """Custom fixed-lentgh hash implementation
@@ -54,22 +172,33 @@ class HashTable:
         
         return int(hash_value, 16) % self.size
 
-    def get(self, key: Any) -> Optional[Any]:
+    def get(self, key: Any, default: Any = None) -> Optional[Any]:
         """Retrieve value associated with key.
         
         Args:
             key: Key to search for.
+            default: Value returned when key is missing.
             
         Returns:
-            Associated value if found, None otherwise.
+            Associated value if found, default otherwise.
         """
+        if self._bloom_rejects(key):
+            return default
+
         hash_index: int = self._hash_index(key)
         bucket: list[tuple[Any, Any]] = self.__table[hash_index]
 
-        for stored_key, stored_value in bucket:
+        for i, (stored_key, stored_value) in enumerate(bucket):
             if stored_key == key:
+                if self.stats is not None:
+                    self.stats.record_probe(i + 1)
                 return stored_value
-        return None
+
+        if self.stats is not None:
+            self.stats.record_probe(len(bucket))
+        if self.bloom is not None:
+            self.bloom.false_positives += 1
+        return default
 
     def put(self, key: Any, value: Any) -> int:
         """Insert or update a key-value pair.
@@ -93,9 +222,19 @@ class HashTable:
         for i, (stored_key, _) in enumerate(bucket):
             if stored_key == key:
                 bucket[i] = (key, value)
+                if self.stats is not None:
+                    self.stats.record_probe(i + 1)
                 return hash_index
 
+        if self.stats is not None:
+            self.stats.record_probe(len(bucket))
         bucket.append((key, value))
+        self.__count += 1
+
+        if self.bloom is not None:
+            self.bloom.add(key)
+            if len(self.bloom) > self.bloom.capacity:
+                self._rebuild_bloom()
         return hash_index
 
     def delete(self, key: Any) -> bool:
@@ -107,17 +246,31 @@ class HashTable:
         Returns:
             True if key was found and removed, False otherwise.
         """
+        if self._bloom_rejects(key):
+            return False
+
         hash_index: int = self._hash_index(key)
         bucket: list[tuple[Any, Any]] = self.__table[hash_index]
 
         for i, (stored_key, _) in enumerate(bucket):
             if stored_key == key:
                 del bucket[i]
+                self.__count -= 1
+                if self.stats is not None:
+                    self.stats.record_probe(i + 1)
                 
                 # Check if we need to shrink after deletion
                 if self.load_factor < 0.2 and self.size > 16:
                     self._resize(self.size // 2)
+                # Deleted keys stay in the filter, rebuild once they outnumber live ones
+                elif self.bloom is not None and len(self.bloom) > 2 * self.__count:
+                    self._rebuild_bloom()
                 return True
+
+        if self.stats is not None:
+            self.stats.record_probe(len(bucket))
+        if self.bloom is not None:
+            self.bloom.false_positives += 1
         return False
 
     def _resize(self, new_size: int) -> None:
@@ -132,13 +285,49 @@ class HashTable:
         if new_size <= 0:
             raise ValueError("Hash table size must be positive")
             
+        start = time.perf_counter() if self.stats is not None else 0.0
         old_table = self.__table
         self.size = new_size
         self.__table = [[] for _ in range(self.size)]
         
+        # Keys are already unique, so skip put() and append straight to buckets
         for bucket in old_table:
             for key, value in bucket:
-                self.put(key, value)
+                self.__table[self._hash_index(key)].append((key, value))
+
+        if self.stats is not None:
+            self.stats.record_resize(time.perf_counter() - start)
+        if self.bloom is not None:
+            self._rebuild_bloom()
+
+    def _bloom_capacity(self) -> int:
+        """Number of keys the Bloom filter should be sized for.
+        
+        Returns:
+            Table size (auto resize keeps items below it), or twice the
+            item count for tables that are not resized.
+        """
+        return max(self.size, 2 * self.__count)
+
+    def _rebuild_bloom(self) -> None:
+        """Refill the Bloom filter from the live keys."""
+        self.bloom.rebuild(iter(self), self._bloom_capacity())
+
+    def _bloom_rejects(self, key: Any) -> bool:
+        """Check the Bloom filter before touching the table.
+        
+        Args:
+            key: Key being looked up.
+            
+        Returns:
+            True if the filter proves the key is absent.
+        """
+        if self.bloom is None or key in self.bloom:
+            return False
+        self.bloom.negatives += 1
+        if self.stats is not None:
+            self.stats.record_probe(0)
+        return True
 
     @property
     def load_factor(self) -> float:
@@ -147,8 +336,7 @@ class HashTable:
         Returns:
             Current load factor rounded to 2 decimal places.
         """
-        total_items = sum(len(bucket) for bucket in self.__table)
-        return round(total_items / self.size, 2)
+        return round(self.__count / self.size, 2)
 
     @property
     def need_resize(self) -> bool:
@@ -167,31 +355,122 @@ class HashTable:
         """
         return sum(1 for bucket in self.__table if len(bucket) > 1)
 
-    def items(self) -> Iterator[tuple[Any, Any]]:
-        """Iterate over all key-value pairs.
+    def bucket_histogram(self) -> dict[int, int]:
+        """Count buckets by their length.
+        
+        Returns:
+            Mapping of bucket length to number of buckets with that length.
+        """
+        histogram: dict[int, int] = {}
+        for bucket in self.__table:
+            histogram[len(bucket)] = histogram.get(len(bucket), 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def expected_probe_length(self) -> float:
+        """Average probes for a successful lookup of every stored key.
+        
+        The i-th key of a bucket is found after i comparisons, so this is
+        computed from bucket lengths alone, without running any lookups.
+        
+        Returns:
+            Mean probe length, 0.0 for an empty table.
+        """
+        total_items = len(self)
+        if total_items == 0:
+            return 0.0
+        probes = sum(len(bucket) * (len(bucket) + 1) // 2 for bucket in self.__table)
+        return probes / total_items
+
+    def chi_squared(self) -> float:
+        """Pearson chi-squared statistic of the bucket distribution.
+        
+        Compares bucket lengths with the uniform expectation of
+        ``len(self) / size`` items per bucket. For a good hash the value
+        is close to ``size - 1``.
+        
+        Returns:
+            Chi-squared statistic, 0.0 for an empty table.
+        """
+        total_items = len(self)
+        if total_items == 0:
+            return 0.0
+        expected = total_items / self.size
+        return sum((len(bucket) - expected) ** 2 for bucket in self.__table) / expected
+
+    def uniformity_z_score(self) -> float:
+        """Normalize chi_squared() to a standard normal score.
+        
+        Uses the Wilson-Hilferty approximation with ``size - 1`` degrees
+        of freedom. Values within about ±3 mean the keys are spread
+        uniformly; large positive values mean keys are clumping.
+        
+        Returns:
+            Approximate z-score, 0.0 for an empty or single-bucket table.
+        """
+        dof = self.size - 1
+        if dof <= 0 or len(self) == 0:
+            return 0.0
+        mean = 1 - 2 / (9 * dof)
+        std = math.sqrt(2 / (9 * dof))
+        return ((self.chi_squared() / dof) ** (1 / 3) - mean) / std
+
+    def hash_report(self) -> dict[str, Any]:
+        """Collect hash quality diagnostics in one dictionary.
+        
+        Returns:
+            Distribution statistics computed from the current buckets,
+            plus the live counters when stats tracking is enabled.
+        """
+        report: dict[str, Any] = {
+            "items": len(self),
+            "size": self.size,
+            "load_factor": self.load_factor,
+            "collisions": self.get_collisions_count(),
+            "bucket_histogram": self.bucket_histogram(),
+            "expected_probe": round(self.expected_probe_length(), 3),
+            "chi_squared": round(self.chi_squared(), 3),
+            "z_score": round(self.uniformity_z_score(), 3),
+        }
+        if self.stats is not None:
+            report.update(self.stats.to_dict())
+        if self.bloom is not None:
+            report["bloom_bits"] = self.bloom.bit_count
+            report["bloom_expected_fpr"] = round(self.bloom.expected_error_rate, 5)
+            report["bloom_measured_fpr"] = round(self.bloom.false_positive_rate, 5)
+        return report
+
+    def _iter_items(self) -> Iterator[tuple[Any, Any]]:
+        """Iterate over all key-value pairs bucket by bucket.
         
         Yields:
             Tuples of (key, value) pairs.
         """
         for bucket in self.__table:
-            for key, value in bucket:
-                yield key, value
+            yield from bucket
+
+    def items(self) -> HashTableItemsView:
+        """Get a live view of all key-value pairs.
+        
+        Returns:
+            View that reflects later updates and supports set operations.
+        """
+        return HashTableItemsView(self)
 
-    def keys(self) -> list[Any]:
-        """Get all keys in hash table.
+    def keys(self) -> HashTableKeysView:
+        """Get a live view of all keys.
         
         Returns:
-            List of all keys.
+            View that reflects later updates and supports set operations.
         """
-        return [key for bucket in self.__table for key, _ in bucket]
+        return HashTableKeysView(self)
 
-    def values(self) -> list[Any]:
-        """Get all values in hash table.
+    def values(self) -> HashTableValuesView:
+        """Get a live view of all values.
         
         Returns:
-            List of all values.
+            View that reflects later updates.
         """
-        return [value for bucket in self.__table for _, value in bucket]
+        return HashTableValuesView(self)
 
     def to_dict(self) -> dict[Any, Any]:
         """Convert hash table to dictionary.
@@ -201,6 +480,14 @@ class HashTable:
         """
         return dict(self.items())
 
+    def freeze(self) -> FrozenHashTable:
+        """Build an immutable copy with guaranteed O(1) lookups.
+        
+        Returns:
+            FrozenHashTable holding the current key-value pairs.
+        """
+        return FrozenHashTable(self._iter_items())
+
     @classmethod
     def from_dict(cls, data: dict[Any, Any], size: Optional[int] = None) -> 'HashTable':
         """Create hash table from dictionary.
@@ -226,7 +513,14 @@ class HashTable:
         Returns:
             True if key exists, False otherwise.
         """
-        return key in [_key for bucket in self.__table for _key, _ in bucket]
+        if self._bloom_rejects(key):
+            return False
+        bucket: list[tuple[Any, Any]] = self.__table[self._hash_index(key)]
+        if any(stored_key == key for stored_key, _ in bucket):
+            return True
+        if self.bloom is not None:
+            self.bloom.false_positives += 1
+        return False
 
     def __str__(self) -> str:
         """String representation of hash table.
@@ -258,8 +552,8 @@ class HashTable:
         Raises:
             KeyError: If key not found.
         """
-        value = self.get(key)
-        if value is None:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
             raise KeyError(f"Key '{key}' not found")
         return value
 
@@ -290,5 +584,31 @@ class HashTable:
         Returns:
             Total number of key-value pairs.
         """
-        return sum(len(bucket) for bucket in self.__table)
-      
+        return self.__count
+
+
+def _main(argv: Optional[list[str]] = None) -> None:
+    """Print a hash quality report for keys read from a file, one per line."""
+    parser = argparse.ArgumentParser(description="HashTable hash quality report")
+    parser.add_argument("keys_file", help="text file with one key per line")
+    parser.add_argument("--size", type=int, default=2**4, help="initial table size")
+    parser.add_argument("--no-resize", action="store_true", help="disable auto resize")
+    parser.add_argument("--bloom", type=float, metavar="RATE", help="attach a Bloom filter")
+    args = parser.parse_args(argv)
+
+    ht = HashTable(args.size, auto_resize=not args.no_resize, track_stats=True,
+                   bloom_error_rate=args.bloom)
+    with open(args.keys_file, encoding="utf-8") as file:
+        keys = [line.rstrip("\n") for line in file if line.strip()]
+
+    for key in keys:
+        ht.put(key, None)
+    for key in keys:
+        ht.get(key)
+
+    for name, value in ht.hash_report().items():
+        print(f"{name:>16}: {value}")
+
+
+if __name__ == "__main__":
+    _main()
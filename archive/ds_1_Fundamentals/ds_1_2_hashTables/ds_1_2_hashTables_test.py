@@ -1,5 +1,5 @@
 import pytest
-from ds_1_2_hashTables import HashTable
+from ds_1_2_hashTables import HashTable, _main
 
 
 class TestHashTable:
@@ -340,3 +340,190 @@ class TestHashTable:
         with pytest.raises(ValueError, match="Hash table size must be positive"):
             ht._resize(-5)
 
+
+class TestHashTableViews:
+    """Тесты для представлений keys/values/items"""
+
+    def test_views_are_live(self):
+        """Тест что представления отражают изменения таблицы"""
+        ht = HashTable()
+        keys, values, items = ht.keys(), ht.values(), ht.items()
+        assert len(keys) == 0
+        
+        ht["a"] = 1
+        ht["b"] = 2
+        assert set(keys) == {"a", "b"}
+        assert sorted(values) == [1, 2]
+        assert set(items) == {("a", 1), ("b", 2)}
+        
+        del ht["a"]
+        assert list(keys) == ["b"]
+        assert len(items) == 1
+
+    def test_view_membership(self):
+        """Тест оператора in для представлений"""
+        ht = HashTable()
+        ht["a"] = None
+        
+        assert "a" in ht.keys()
+        assert "b" not in ht.keys()
+        assert ("a", None) in ht.items()
+        assert ("a", 1) not in ht.items()
+        assert None in ht.values()
+
+    def test_view_set_operations(self):
+        """Тест операций над множествами"""
+        ht = HashTable.from_dict({"a": 1, "b": 2, "c": 3})
+        
+        assert ht.keys() & {"a", "z"} == {"a"}
+        assert ht.keys() | {"z"} == {"a", "b", "c", "z"}
+        assert ht.keys() - {"a"} == {"b", "c"}
+        assert ht.items() & {("b", 2), ("c", 0)} == {("b", 2)}
+
+    def test_get_default(self):
+        """Тест значения по умолчанию в get"""
+        ht = HashTable()
+        ht["none"] = None
+        
+        assert ht.get("missing", "default") == "default"
+        assert ht.get("none", "default") is None
+        assert ht["none"] is None
+
+
+class TestHashTableStats:
+    """Тесты для инструментирования HashTable"""
+
+    def test_stats_disabled_by_default(self):
+        """Тест что счетчики выключены по умолчанию"""
+        ht = HashTable()
+        ht.put("key", "value")
+        assert ht.stats is None
+        assert "lookups" not in ht.hash_report()
+
+    def test_probe_counters(self):
+        """Тест подсчета длины проб"""
+        ht = HashTable(size=1, auto_resize=False, track_stats=True)
+        for i in range(3):
+            ht.put(f"key{i}", i)  # 0, 1, 2 сравнения
+        
+        ht.get("key2")  # 3 сравнения
+        ht.get("missing")  # 3 сравнения
+        
+        assert ht.stats.lookups == 5
+        assert ht.stats.max_probe == 3
+        assert ht.stats.avg_probe == pytest.approx(9 / 5)
+
+    def test_resize_counters(self):
+        """Тест подсчета ресайзов"""
+        ht = HashTable(size=4, track_stats=True)
+        for i in range(10):
+            ht.put(f"key{i}", i)
+        
+        assert ht.stats.resizes == 2
+        assert ht.stats.resize_time > 0
+        assert ht.stats.lookups == 10  # Перехэширование не считается поиском
+        
+        ht.stats.reset()
+        assert ht.stats.resizes == 0
+
+    def test_bucket_histogram(self):
+        """Тест гистограммы длин бакетов"""
+        ht = HashTable(size=1, auto_resize=False)
+        assert ht.bucket_histogram() == {0: 1}
+        
+        ht.put("a", 1)
+        ht.put("b", 2)
+        assert ht.bucket_histogram() == {2: 1}
+        assert ht.expected_probe_length() == pytest.approx(1.5)
+
+    def test_chi_squared(self):
+        """Тест статистики хи-квадрат"""
+        ht = HashTable(size=4, auto_resize=False)
+        assert ht.chi_squared() == 0.0
+        
+        ht.put("a", 1)
+        # Один ключ на 4 бакета: ожидание 0.25 на бакет
+        assert ht.chi_squared() == pytest.approx(3.0)
+        
+        for i in range(2000):
+            ht.put(f"key{i}", i)
+        assert abs(ht.uniformity_z_score()) < 10
+
+    def test_cli_report(self, tmp_path, capsys):
+        """Тест CLI-отчета по файлу ключей"""
+        keys_file = tmp_path / "keys.txt"
+        keys_file.write_text("\n".join(f"user{i}" for i in range(100)), encoding="utf-8")
+        
+        _main([str(keys_file)])
+        
+        output = capsys.readouterr().out
+        assert "items: 100" in output
+        assert "chi_squared" in output
+        assert "max_probe" in output
+
+
+class TestHashTableBloom:
+    """Тесты для фильтра Блума перед HashTable"""
+
+    def test_bloom_disabled_by_default(self):
+        """Тест что фильтр выключен по умолчанию"""
+        assert HashTable().bloom is None
+
+    def test_lookups_with_bloom(self):
+        """Тест что фильтр не теряет существующие ключи"""
+        ht = HashTable(bloom_error_rate=0.01)
+        for i in range(500):
+            ht.put(f"key{i}", i)
+        
+        for i in range(500):
+            assert ht.get(f"key{i}") == i
+            assert f"key{i}" in ht
+        assert ht.get("missing", "default") == "default"
+        assert ht.delete("missing") is False
+
+    def test_negative_lookups_rejected(self):
+        """Тест отсечения отсутствующих ключей"""
+        ht = HashTable(bloom_error_rate=0.01, track_stats=True)
+        for i in range(500):
+            ht.put(f"key{i}", i)
+        ht.stats.reset()
+        
+        for i in range(5000):
+            ht.get(f"missing{i}")
+        
+        assert ht.bloom.negatives + ht.bloom.false_positives == 5000
+        assert ht.bloom.false_positive_rate < 0.05
+        
+        for i in range(5000):
+            ht.delete(f"missing{i}")
+            assert f"missing{i}" not in ht
+        assert ht.bloom.negatives + ht.bloom.false_positives == 15000
+        assert ht.stats.avg_probe < 0.1
+        assert "bloom_measured_fpr" in ht.hash_report()
+
+    def test_bloom_rebuilt_after_deletes(self):
+        """Тест перестроения фильтра после удалений"""
+        ht = HashTable(size=64, bloom_error_rate=0.01)
+        for i in range(40):
+            ht.put(i, i)
+        for i in range(30):
+            ht.delete(i)
+        
+        assert len(ht.bloom) <= 2 * len(ht)
+        for i in range(30, 40):
+            assert ht[i] == i
+
+    def test_bloom_without_resize(self):
+        """Тест роста фильтра в таблице без ресайза"""
+        ht = HashTable(size=4, auto_resize=False, bloom_error_rate=0.01)
+        for i in range(100):
+            ht.put(i, i)
+        
+        assert ht.bloom.capacity >= 100
+        assert all(ht.get(i) == i for i in range(100))
+
+    def test_invalid_error_rate(self):
+        """Тест неверной вероятности ошибки"""
+        with pytest.raises(ValueError, match="Error rate"):
+            HashTable(bloom_error_rate=1.5)
+
@@ -0,0 +1,401 @@
+import io
+import multiprocessing
+import pickle
+import struct
+import time
+import zlib
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Iterator, Optional
+
+
+# Key types whose pickles depend only on their value
+_KEY_TYPES = (type(None), bool, int, float, str, bytes)
+
+
+def _key_bytes(key: Any) -> bytes:
+    """Pickle a key so that equal keys give equal bytes in every process.
+
+    Raises:
+        TypeError: If the key is not built from _KEY_TYPES and tuples.
+    """
+    stack = [key]
+    while stack:
+        item = stack.pop()
+        if type(item) is tuple:
+            stack.extend(item)
+        elif type(item) not in _KEY_TYPES:
+            raise TypeError(f"Unsupported key type: {type(item).__name__}")
+
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer)
+    # Without the memo a repeated object pickles like an equal copy
+    pickler.fast = True
+    pickler.dump(key)
+    return buffer.getvalue()
+
+
+class ShardedHashTable:
+    """A hash table shared between processes through shared memory.
+
+    Keys are split by hash into independent shards. Every shard is one
+    ``multiprocessing.shared_memory`` segment holding a fixed number of
+    fixed-size slots (open addressing with linear probing) and has its
+    own lock, so processes working on different shards never wait for
+    each other.
+
+    Keys and values are stored pickled, and keys are compared by their
+    pickled bytes. Keys are therefore limited to None, bool, int, float,
+    str, bytes and tuples of them, whose pickles depend only on their
+    value; sets pickle in a per-process order and arbitrary objects may
+    pickle differently when equal. Equal keys of different types, such
+    as 1 and 1.0, are distinct. Pass the table to worker processes as a
+    Process argument: only segment names and locks are pickled, never
+    the data.
+
+    Attributes:
+        shards: Number of shards
+        capacity: Number of slots in each shard
+        slot_size: Bytes per slot, including the slot header
+    """
+
+    _SHARD_HEADER = struct.Struct("<QQ")  # live items, tombstones
+    _SLOT_HEADER = struct.Struct("<BIII")  # state, hash, key length, value length
+    _EMPTY, _USED, _DELETED = 0, 1, 2
+
+    def __init__(self, shards: int = 8, capacity: int = 2**12, slot_size: int = 128) -> None:
+        """Allocate shared memory for every shard.
+
+        Args:
+            shards: Number of shards. Must be positive.
+            capacity: Number of slots per shard. Must be positive.
+            slot_size: Bytes per slot; bounds the size of pickled key plus value.
+
+        Raises:
+            ValueError: If any size is too small.
+        """
+        if shards <= 0 or capacity <= 0:
+            raise ValueError("Shard count and capacity must be positive")
+        if slot_size <= self._SLOT_HEADER.size:
+            raise ValueError(f"Slot size must exceed {self._SLOT_HEADER.size} bytes")
+
+        self.shards = shards
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self._owner = True
+        segment_size = self._SHARD_HEADER.size + capacity * slot_size
+        self._segments = [SharedMemory(create=True, size=segment_size) for _ in range(shards)]
+        self._locks = [multiprocessing.Lock() for _ in range(shards)]
+        for segment in self._segments:
+            segment.buf[:segment_size] = bytes(segment_size)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle segment names and locks instead of the stored data."""
+        return {
+            "shards": self.shards,
+            "capacity": self.capacity,
+            "slot_size": self.slot_size,
+            "names": [segment.name for segment in self._segments],
+            "locks": self._locks,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Attach to the segments of the table that was pickled."""
+        self.shards = state["shards"]
+        self.capacity = state["capacity"]
+        self.slot_size = state["slot_size"]
+        self._owner = False
+        self._segments = [SharedMemory(name=name) for name in state["names"]]
+        self._locks = state["locks"]
+
+    def _locate(self, key_bytes: bytes) -> tuple[int, int]:
+        """Compute shard index and key hash.
+
+        Args:
+            key_bytes: Pickled key.
+
+        Returns:
+            Shard index and 32-bit hash of the key.
+        """
+        key_hash = zlib.crc32(key_bytes)
+        return key_hash % self.shards, key_hash
+
+    def _slot_offset(self, slot: int) -> int:
+        """Byte offset of a slot inside its shard segment."""
+        return self._SHARD_HEADER.size + slot * self.slot_size
+
+    def _find(self, buf: memoryview, key_bytes: bytes, key_hash: int) -> tuple[Optional[int], Optional[int]]:
+        """Probe a shard for a key. Caller must hold the shard lock.
+
+        Args:
+            buf: Shard segment buffer.
+            key_bytes: Pickled key.
+            key_hash: Hash of the key.
+
+        Returns:
+            Slot holding the key (or None) and first reusable slot (or None).
+        """
+        slot = (key_hash // self.shards) % self.capacity
+        free: Optional[int] = None
+        header_size = self._SLOT_HEADER.size
+
+        for _ in range(self.capacity):
+            offset = self._slot_offset(slot)
+            state, stored_hash, key_len, _ = self._SLOT_HEADER.unpack_from(buf, offset)
+            if state == self._EMPTY:
+                return None, slot if free is None else free
+            if state == self._DELETED:
+                if free is None:
+                    free = slot
+            elif (stored_hash == key_hash and key_len == len(key_bytes)
+                  and buf[offset + header_size:offset + header_size + key_len] == key_bytes):
+                return slot, free
+            slot = (slot + 1) % self.capacity
+        return None, free
+
+    def _read_value(self, buf: memoryview, slot: int) -> Any:
+        """Unpickle the value stored in a slot."""
+        offset = self._slot_offset(slot)
+        _, _, key_len, value_len = self._SLOT_HEADER.unpack_from(buf, offset)
+        start = offset + self._SLOT_HEADER.size + key_len
+        return pickle.loads(buf[start:start + value_len])
+
+    def _write(self, buf: memoryview, slot: int, key_hash: int, key_bytes: bytes, value_bytes: bytes) -> None:
+        """Store a pickled pair in a slot."""
+        offset = self._slot_offset(slot)
+        self._SLOT_HEADER.pack_into(buf, offset, self._USED, key_hash, len(key_bytes), len(value_bytes))
+        start = offset + self._SLOT_HEADER.size
+        buf[start:start + len(key_bytes)] = key_bytes
+        start += len(key_bytes)
+        buf[start:start + len(value_bytes)] = value_bytes
+
+    def get(self, key: Any, default: Any = None) -> Optional[Any]:
+        """Retrieve value associated with key.
+
+        Args:
+            key: Key to search for.
+            default: Value returned when key is missing.
+
+        Returns:
+            Associated value if found, default otherwise.
+        """
+        key_bytes = _key_bytes(key)
+        shard, key_hash = self._locate(key_bytes)
+        buf = self._segments[shard].buf
+
+        with self._locks[shard]:
+            slot, _ = self._find(buf, key_bytes, key_hash)
+            if slot is None:
+                return default
+            return self._read_value(buf, slot)
+
+    def put(self, key: Any, value: Any) -> int:
+        """Insert or update a key-value pair.
+
+        Args:
+            key: Key to insert/update.
+            value: Value to associate with key.
+
+        Returns:
+            Index of the shard where the pair was stored.
+
+        Raises:
+            ValueError: If pickled key and value do not fit in one slot.
+            OverflowError: If the shard has no free slot left.
+            TypeError: If the key type is not supported.
+        """
+        key_bytes = _key_bytes(key)
+        value_bytes = pickle.dumps(value)
+        if len(key_bytes) + len(value_bytes) > self.slot_size - self._SLOT_HEADER.size:
+            raise ValueError(f"Key and value take more than {self.slot_size} bytes")
+
+        shard, key_hash = self._locate(key_bytes)
+        buf = self._segments[shard].buf
+
+        with self._locks[shard]:
+            slot, free = self._find(buf, key_bytes, key_hash)
+            if slot is not None:
+                self._write(buf, slot, key_hash, key_bytes, value_bytes)
+                return shard
+            if free is None:
+                raise OverflowError(f"Shard {shard} is full")
+
+            count, tombstones = self._SHARD_HEADER.unpack_from(buf, 0)
+            state = self._SLOT_HEADER.unpack_from(buf, self._slot_offset(free))[0]
+            if state == self._DELETED:
+                tombstones -= 1
+            self._write(buf, free, key_hash, key_bytes, value_bytes)
+            self._SHARD_HEADER.pack_into(buf, 0, count + 1, tombstones)
+        return shard
+
+    def delete(self, key: Any) -> bool:
+        """Remove key-value pair from the table.
+
+        Args:
+            key: Key to remove.
+
+        Returns:
+            True if key was found and removed, False otherwise.
+        """
+        key_bytes = _key_bytes(key)
+        shard, key_hash = self._locate(key_bytes)
+        buf = self._segments[shard].buf
+
+        with self._locks[shard]:
+            slot, _ = self._find(buf, key_bytes, key_hash)
+            if slot is None:
+                return False
+
+            count, tombstones = self._SHARD_HEADER.unpack_from(buf, 0)
+            buf[self._slot_offset(slot)] = self._DELETED
+            self._SHARD_HEADER.pack_into(buf, 0, count - 1, tombstones + 1)
+
+            # Too many tombstones make every miss probe the whole shard
+            if tombstones + 1 > self.capacity // 4:
+                self._compact(buf)
+        return True
+
+    def _compact(self, buf: memoryview) -> None:
+        """Rehash live pairs of a shard to drop tombstones. Caller must hold the lock."""
+        header_size = self._SLOT_HEADER.size
+        pairs = []
+        for slot in range(self.capacity):
+            offset = self._slot_offset(slot)
+            state, key_hash, key_len, value_len = self._SLOT_HEADER.unpack_from(buf, offset)
+            if state == self._USED:
+                start = offset + header_size
+                pairs.append((key_hash, bytes(buf[start:start + key_len]),
+                              bytes(buf[start + key_len:start + key_len + value_len])))
+
+        size = self._SHARD_HEADER.size + self.capacity * self.slot_size
+        buf[:size] = bytes(size)
+        for key_hash, key_bytes, value_bytes in pairs:
+            _, free = self._find(buf, key_bytes, key_hash)
+            self._write(buf, free, key_hash, key_bytes, value_bytes)
+        self._SHARD_HEADER.pack_into(buf, 0, len(pairs), 0)
+
+    def items(self) -> Iterator[tuple[Any, Any]]:
+        """Iterate over all key-value pairs, one shard snapshot at a time.
+
+        Yields:
+            Tuples of (key, value) pairs.
+        """
+        header_size = self._SLOT_HEADER.size
+        for segment, lock in zip(self._segments, self._locks):
+            buf = segment.buf
+            with lock:
+                raw = []
+                for slot in range(self.capacity):
+                    offset = self._slot_offset(slot)
+                    state, _, key_len, value_len = self._SLOT_HEADER.unpack_from(buf, offset)
+                    if state == self._USED:
+                        start = offset + header_size
+                        raw.append((bytes(buf[start:start + key_len]),
+                                    bytes(buf[start + key_len:start + key_len + value_len])))
+            for key_bytes, value_bytes in raw:
+                yield pickle.loads(key_bytes), pickle.loads(value_bytes)
+
+    def keys(self) -> list[Any]:
+        """Get all keys in the table.
+
+        Returns:
+            List of all keys.
+        """
+        return [key for key, _ in self.items()]
+
+    def to_dict(self) -> dict[Any, Any]:
+        """Convert the table to dictionary.
+
+        Returns:
+            Dictionary containing all key-value pairs.
+        """
+        return dict(self.items())
+
+    def close(self) -> None:
+        """Detach this process from the shared memory segments."""
+        for segment in self._segments:
+            segment.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segments. Only the creating process should call this."""
+        for segment in self._segments:
+            segment.unlink()
+
+    def __enter__(self) -> 'ShardedHashTable':
+        """Enter context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Detach, and destroy the segments if this process created them."""
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def __contains__(self, key: Any) -> bool:
+        """Check if key exists in the table."""
+        key_bytes = _key_bytes(key)
+        shard, key_hash = self._locate(key_bytes)
+        with self._locks[shard]:
+            slot, _ = self._find(self._segments[shard].buf, key_bytes, key_hash)
+        return slot is not None
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get value using subscript notation.
+
+        Raises:
+            KeyError: If key not found.
+        """
+        key_bytes = _key_bytes(key)
+        shard, key_hash = self._locate(key_bytes)
+        buf = self._segments[shard].buf
+        with self._locks[shard]:
+            slot, _ = self._find(buf, key_bytes, key_hash)
+            if slot is None:
+                raise KeyError(f"Key '{key}' not found")
+            return self._read_value(buf, slot)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set value using subscript notation."""
+        self.put(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete key using del statement.
+
+        Raises:
+            KeyError: If key not found.
+        """
+        if not self.delete(key):
+            raise KeyError(f"Key '{key}' not found")
+
+    def __len__(self) -> int:
+        """Get number of items across all shards."""
+        total = 0
+        for segment, lock in zip(self._segments, self._locks):
+            with lock:
+                total += self._SHARD_HEADER.unpack_from(segment.buf, 0)[0]
+        return total
+
+
+def _benchmark_worker(table: ShardedHashTable, worker: int, operations: int) -> None:
+    """Put and then get a private range of keys."""
+    for i in range(operations):
+        table.put(f"w{worker}-{i}", i)
+    for i in range(operations):
+        table.get(f"w{worker}-{i}")
+    table.close()
+
+
+if __name__ == "__main__":
+    operations = 20_000
+    for processes in (1, 2, 4, 8):
+        with ShardedHashTable(shards=16, capacity=2**14) as table:
+            workers = [
+                multiprocessing.Process(target=_benchmark_worker, args=(table, w, operations))
+                for w in range(processes)
+            ]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            print(f"{processes} processes: {2 * operations * processes / elapsed:,.0f} ops/sec")
@@ -0,0 +1,116 @@
+import multiprocessing
+
+import pytest
+from ds_1_2_shardedHashTable import ShardedHashTable
+
+
+def _put_range(table, start, stop):
+    """Записывает ключи из диапазона в дочернем процессе"""
+    for i in range(start, stop):
+        table.put(f"key{i}", i)
+    table.close()
+
+
+def _put_tuple_key(table):
+    """Записывает в дочернем процессе ключ-кортеж, дважды ссылающийся на одну строку"""
+    name = "".join(["shared"] * 3)
+    table.put((name, name, 1), "from child")
+    table.close()
+
+
+class TestShardedHashTable:
+    """Тесты для класса ShardedHashTable"""
+
+    def test_put_get_delete(self):
+        """Тест базовых операций"""
+        with ShardedHashTable(shards=4, capacity=64) as table:
+            table.put("a", 1)
+            table["b"] = [1, 2, 3]
+            table.put("a", "updated")
+            
+            assert table.get("a") == "updated"
+            assert table["b"] == [1, 2, 3]
+            assert table.get("missing", 0) == 0
+            assert "a" in table
+            assert len(table) == 2
+            
+            assert table.delete("a") is True
+            assert table.delete("a") is False
+            assert "a" not in table
+            with pytest.raises(KeyError):
+                _ = table["a"]
+            with pytest.raises(KeyError):
+                del table["a"]
+
+    def test_items(self):
+        """Тест обхода всех пар"""
+        with ShardedHashTable(shards=3, capacity=64) as table:
+            data = {f"key{i}": i for i in range(50)}
+            for key, value in data.items():
+                table.put(key, value)
+            
+            assert table.to_dict() == data
+            assert set(table.keys()) == set(data)
+
+    def test_limits(self):
+        """Тест переполнения шарда и слишком больших значений"""
+        with ShardedHashTable(shards=1, capacity=4, slot_size=64) as table:
+            with pytest.raises(ValueError, match="more than 64 bytes"):
+                table.put("key", "x" * 100)
+            
+            for i in range(4):
+                table.put(i, i)
+            with pytest.raises(OverflowError):
+                table.put(4, 4)
+
+    def test_tombstones_are_reused(self):
+        """Тест повторного использования удаленных слотов"""
+        with ShardedHashTable(shards=1, capacity=16) as table:
+            for _ in range(10):
+                for i in range(10):
+                    table.put(i, i)
+                for i in range(10):
+                    table.delete(i)
+            
+            assert len(table) == 0
+            table.put("key", "value")
+            assert table["key"] == "value"
+
+    def test_shared_between_processes(self):
+        """Тест записи из нескольких процессов"""
+        with ShardedHashTable(shards=4, capacity=256) as table:
+            workers = [
+                multiprocessing.Process(target=_put_range, args=(table, w * 100, (w + 1) * 100))
+                for w in range(3)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            
+            assert len(table) == 300
+            assert all(table[f"key{i}"] == i for i in range(300))
+
+    def test_equal_keys_across_processes(self):
+        """Тест равных ключей с разной структурой объектов в разных процессах"""
+        with ShardedHashTable(shards=4, capacity=64) as table:
+            worker = multiprocessing.Process(target=_put_tuple_key, args=(table,))
+            worker.start()
+            worker.join()
+            
+            key = ("shared" * 3, "".join(["shared"] * 3), 1)
+            assert key[0] is not key[1]
+            assert table[key] == "from child"
+            table.put(key, "from parent")
+            assert len(table) == 1
+
+    def test_unsupported_keys(self):
+        """Тест ключей, которые сериализуются неоднозначно"""
+        with ShardedHashTable(shards=2, capacity=16) as table:
+            for key in (frozenset({"a", "b"}), ("ok", {"a"}), [1, 2], object()):
+                with pytest.raises(TypeError):
+                    table.put(key, 1)
+                with pytest.raises(TypeError):
+                    _ = key in table
+            table.put((None, True, 1, 1.5, "s", b"b", ()), 1)
+            assert table[(None, True, 1, 1.5, "s", b"b", ())] == 1
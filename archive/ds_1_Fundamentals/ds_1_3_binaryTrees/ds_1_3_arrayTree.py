@@ -0,0 +1,411 @@
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+# Index that stands for a missing child
+_NIL = -1
+
+
+class ArrayBinarySearchTree:
+    """
+    AVL-balanced binary search tree stored in parallel typed arrays.
+
+    Node i is values[i], left[i], right[i] and heights[i]; children are
+    slot indices and -1 means no child. Deleted slots go to a free list
+    threaded through the left array and are reused by later inserts.
+    A node costs itemsize + 9 bytes and no Python objects, so large
+    trees are several times smaller than BinarySearchTree and are not
+    scanned by the garbage collector.
+
+    Attributes:
+        root (int): slot of the root node, -1 for an empty tree
+        typecode (str): array typecode of the values, e.g. "q" or "d"
+    """
+    def __init__(self, typecode: str = "q") -> None:
+        """
+        Initialize an empty tree.
+
+        Args:
+            typecode: Numeric array typecode used to store values
+        """
+        self.typecode = typecode
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Clear the entire tree and release its slots.
+        """
+        self.root = _NIL
+        self._values = array(self.typecode)
+        self._left = array("i")
+        self._right = array("i")
+        self._heights = array("b")
+        self._free = _NIL
+        self._count = 0
+
+    def _allocate(self, value: int) -> int:
+        """
+        Take a slot from the free list, or append a new one.
+
+        Returns:
+            Slot index of the new leaf
+        """
+        if self._free != _NIL:
+            index = self._free
+            # Store first: a value the typecode rejects must not unlink the slot
+            self._values[index] = value
+            self._free = self._left[index]
+            self._left[index] = self._right[index] = _NIL
+            self._heights[index] = 1
+        else:
+            index = len(self._values)
+            self._values.append(value)
+            self._left.append(_NIL)
+            self._right.append(_NIL)
+            self._heights.append(1)
+        self._count += 1
+        return index
+
+    def _release(self, index: int) -> None:
+        """
+        Put a slot on the free list.
+        """
+        self._left[index] = self._free
+        self._free = index
+        self._count -= 1
+
+    def _height(self, index: int) -> int:
+        """
+        Height of a subtree, 0 for an empty one.
+        """
+        return self._heights[index] if index != _NIL else 0
+
+    def _update(self, index: int) -> None:
+        """
+        Recompute the cached height of a node from its children.
+        """
+        self._heights[index] = 1 + max(self._height(self._left[index]), self._height(self._right[index]))
+
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        """
+        Put new in place of old under parent, or at the root if parent is -1.
+        """
+        if parent == _NIL:
+            self.root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+
+    def _rotate_left(self, index: int) -> int:
+        """
+        Rotate a subtree left.
+
+        Returns:
+            New root of the subtree
+        """
+        pivot = self._right[index]
+        self._right[index] = self._left[pivot]
+        self._left[pivot] = index
+        self._update(index)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, index: int) -> int:
+        """
+        Rotate a subtree right.
+
+        Returns:
+            New root of the subtree
+        """
+        pivot = self._left[index]
+        self._left[index] = self._right[pivot]
+        self._right[pivot] = index
+        self._update(index)
+        self._update(pivot)
+        return pivot
+
+    def _retrace(self, path: list[int]) -> None:
+        """
+        Walk a root-to-node path bottom-up, refreshing heights and
+        rotating where the AVL balance is broken.
+        """
+        left, right = self._left, self._right
+        for i in range(len(path) - 1, -1, -1):
+            index = path[i]
+            self._update(index)
+            balance_factor = self._height(left[index]) - self._height(right[index])
+            if balance_factor > 1:
+                if self._height(left[left[index]]) < self._height(right[left[index]]):
+                    left[index] = self._rotate_left(left[index])
+                balanced = self._rotate_right(index)
+            elif balance_factor < -1:
+                if self._height(right[right[index]]) < self._height(left[right[index]]):
+                    right[index] = self._rotate_right(right[index])
+                balanced = self._rotate_left(index)
+            else:
+                continue
+            self._replace_child(path[i - 1] if i else _NIL, index, balanced)
+
+    def insert(self, value: int) -> None:
+        """
+        Insert the value into the tree.
+        """
+        index = self._allocate(value)
+        if self.root == _NIL:
+            self.root = index
+            return
+
+        values, left, right = self._values, self._left, self._right
+        path: list[int] = []
+        current = self.root
+        while current != _NIL:
+            path.append(current)
+            current = left[current] if value < values[current] else right[current]
+
+        parent = path[-1]
+        if value < values[parent]:
+            left[parent] = index
+        else:
+            right[parent] = index
+        self._retrace(path)
+
+    def insert_from_iterable(self, iter_values: Iterable[int]) -> None:
+        """
+        Insert a values from iterable object into the tree.
+        """
+        for iter_value in iter_values:
+            self.insert(iter_value)
+
+    @classmethod
+    def from_sorted(cls, values: Sequence[int], typecode: str = "q") -> "ArrayBinarySearchTree":
+        """
+        Build a perfectly balanced tree from ascending values in O(n).
+        Slot i holds the i-th smallest value, so the values array is
+        copied in one step and only child links are computed.
+
+        Args:
+            values: Values in ascending order
+            typecode: Numeric array typecode used to store values
+
+        Returns:
+            New tree holding the values
+
+        Raises:
+            ValueError: If values are not sorted
+        """
+        tree = cls(typecode)
+        tree._values = array(typecode, values)
+        n = len(tree._values)
+        if any(tree._values[i] > tree._values[i + 1] for i in range(n - 1)):
+            raise ValueError("Values must be sorted in ascending order")
+
+        tree._left = array("i", [_NIL]) * n
+        tree._right = array("i", [_NIL]) * n
+        tree._heights = array("b", [0]) * n
+        tree._count = n
+
+        stack: list[tuple[int, int, int, bool]] = [(0, n, _NIL, False)]
+        while stack:
+            lo, hi, parent, is_left = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # A median-split subtree of k nodes has height k.bit_length()
+            tree._heights[mid] = (hi - lo).bit_length()
+            if parent == _NIL:
+                tree.root = mid
+            elif is_left:
+                tree._left[parent] = mid
+            else:
+                tree._right[parent] = mid
+            stack.append((lo, mid, mid, True))
+            stack.append((mid + 1, hi, mid, False))
+        return tree
+
+    def search(self, value: int) -> int | None:
+        """
+        Search for a value in the tree.
+
+        Returns:
+            Slot index of the value if found, None otherwise
+        """
+        values, left, right = self._values, self._left, self._right
+        index = self.root
+        while index != _NIL:
+            if value == values[index]:
+                return index
+            index = left[index] if value < values[index] else right[index]
+        return None
+
+    def delete(self, value: int) -> None:
+        """
+        Delete a value from the tree.
+        Does nothing if value not found.
+        """
+        values, left, right = self._values, self._left, self._right
+        path: list[int] = []
+        index = self.root
+        while index != _NIL and value != values[index]:
+            path.append(index)
+            index = left[index] if value < values[index] else right[index]
+        if index == _NIL:
+            return
+
+        if left[index] != _NIL and right[index] != _NIL:
+            target = index
+            path.append(index)
+            index = left[index]
+            while right[index] != _NIL:
+                path.append(index)
+                index = right[index]
+            values[target] = values[index]
+
+        child = left[index] if left[index] != _NIL else right[index]
+        self._replace_child(path[-1] if path else _NIL, index, child)
+        self._release(index)
+        self._retrace(path)
+
+    @property
+    def min(self) -> int | None:
+        """
+        Get the minimum value in the tree.
+
+        Returns:
+            Minimum value or None if tree is empty
+        """
+        index = self.root
+        if index == _NIL:
+            return None
+        while self._left[index] != _NIL:
+            index = self._left[index]
+        return self._values[index]
+
+    @property
+    def max(self) -> int | None:
+        """
+        Get the maximum value in the tree.
+
+        Returns:
+            Maximum value or None if tree is empty
+        """
+        index = self.root
+        if index == _NIL:
+            return None
+        while self._right[index] != _NIL:
+            index = self._right[index]
+        return self._values[index]
+
+    def is_empty(self) -> bool:
+        """
+        Check if the tree is empty.
+
+        Returns:
+            True if tree is empty, False otherwise
+        """
+        return self.root == _NIL
+
+    @property
+    def height(self) -> int:
+        """
+        Get the height of the tree from the root's cached height.
+
+        Returns:
+            Height of the tree (0 for empty tree)
+        """
+        return self._height(self.root)
+
+    def iter_inorder(self) -> Iterator[int]:
+        """
+        Lazy in-order traversal: Left -> Root -> Right
+
+        Yields:
+            Values in in-order sequence
+        """
+        values, left, right = self._values, self._left, self._right
+        stack: list[int] = []
+        index = self.root
+        while stack or index != _NIL:
+            while index != _NIL:
+                stack.append(index)
+                index = left[index]
+            index = stack.pop()
+            yield values[index]
+            index = right[index]
+
+    def iter_preorder(self) -> Iterator[int]:
+        """
+        Lazy pre-order traversal: Root -> Left -> Right
+
+        Yields:
+            Values in pre-order sequence
+        """
+        stack = [self.root] if self.root != _NIL else []
+        while stack:
+            index = stack.pop()
+            yield self._values[index]
+            if self._right[index] != _NIL:
+                stack.append(self._right[index])
+            if self._left[index] != _NIL:
+                stack.append(self._left[index])
+
+    def iter_postorder(self) -> Iterator[int]:
+        """
+        Lazy post-order traversal: Left -> Right -> Root
+
+        Yields:
+            Values in post-order sequence
+        """
+        left, right = self._left, self._right
+        stack: list[int] = []
+        index = self.root
+        last_visited = _NIL
+        while stack or index != _NIL:
+            while index != _NIL:
+                stack.append(index)
+                index = left[index]
+            top = stack[-1]
+            if right[top] != _NIL and right[top] != last_visited:
+                index = right[top]
+            else:
+                stack.pop()
+                yield self._values[top]
+                last_visited = top
+
+    def inorder(self) -> list[int]:
+        """
+        In-order traversal, values in ascending order.
+        """
+        return list(self.iter_inorder())
+
+    def preorder(self) -> list[int]:
+        """
+        Pre-order traversal.
+        """
+        return list(self.iter_preorder())
+
+    def postorder(self) -> list[int]:
+        """
+        Post-order traversal.
+        """
+        return list(self.iter_postorder())
+
+    def __contains__(self, value) -> bool:
+        """
+        Search the value in the tree.
+
+        Returns:
+            True if value in the tree, False otherwise
+        """
+        return self.search(value) is not None
+
+    def __len__(self) -> int:
+        """
+        Number of values in the tree.
+        """
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate over values in ascending order.
+        """
+        return self.iter_inorder()
@@ -0,0 +1,162 @@
+import gc
+import random
+import tracemalloc
+
+import pytest
+from ds_1_3_arrayTree import ArrayBinarySearchTree
+from ds_1_3_binaryTrees import BinarySearchTree, Node
+
+
+def traced_size(build):
+    """
+    Объем памяти, выделенной при построении дерева.
+    """
+    gc.collect()
+    tracemalloc.start()
+    tree = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, tree
+
+
+class TestArrayBST:
+    """
+    Класс тестирования дерева на массивах.
+    """
+
+    def test_insert_search_delete(self):
+        """
+        Вставка, поиск и удаление значений.
+        """
+        tree = ArrayBinarySearchTree()
+        tree.insert_from_iterable([1, 3, 7, 8, 4, 2, 7, 8])
+
+        assert 7 in tree
+        assert 5 not in tree
+        assert len(tree) == 8
+
+        tree.delete(8)
+        assert 8 in tree
+        tree.delete(8)
+        assert 8 not in tree
+        assert tree.inorder() == [1, 2, 3, 4, 7, 7]
+        assert tree.min == 1
+        assert tree.max == 7
+
+    def test_sorted_input_stays_balanced(self):
+        """
+        Отсортированные данные не вырождают дерево.
+        """
+        tree = ArrayBinarySearchTree()
+        tree.insert_from_iterable(range(4096))
+
+        assert tree.height <= 14
+        assert list(tree) == list(range(4096))
+
+    def test_free_list_reuses_slots(self):
+        """
+        Освобожденные слоты используются повторно.
+        """
+        tree = ArrayBinarySearchTree()
+        tree.insert_from_iterable(range(100))
+        for value in range(50):
+            tree.delete(value)
+        tree.insert_from_iterable(range(1000, 1050))
+
+        assert len(tree._values) == 100
+        assert tree.inorder() == list(range(50, 100)) + list(range(1000, 1050))
+
+    def test_random_operations(self):
+        """
+        Случайные операции совпадают со списком-эталоном.
+        """
+        rng = random.Random(1)
+        tree = ArrayBinarySearchTree()
+        values = []
+
+        for _ in range(2000):
+            if values and rng.random() < 0.4:
+                value = rng.choice(values)
+                values.remove(value)
+                tree.delete(value)
+            else:
+                value = rng.randint(0, 200)
+                values.append(value)
+                tree.insert(value)
+
+        assert tree.inorder() == sorted(values)
+        assert len(tree) == len(values)
+
+    def test_traversals(self):
+        """
+        Тест трех видов обходов дерева.
+        """
+        tree = ArrayBinarySearchTree.from_sorted([3, 4, 5, 6, 7, 8, 9])
+
+        assert tree.inorder() == [3, 4, 5, 6, 7, 8, 9]
+        assert tree.preorder() == [6, 4, 3, 5, 8, 7, 9]
+        assert tree.postorder() == [3, 5, 4, 7, 9, 8, 6]
+        assert tree.height == 3
+
+    def test_rejected_value_keeps_free_slot(self):
+        """
+        Значение, которое не подходит типу массива, не теряет свободный слот.
+        """
+        tree = ArrayBinarySearchTree("q")
+        tree.insert_from_iterable([1, 2])
+        tree.delete(2)
+        free = tree._free
+        with pytest.raises(TypeError):
+            tree.insert(1.5)
+        assert tree._free == free and len(tree) == 1
+
+        tree.insert(3)
+        assert len(tree._values) == 2
+        assert tree.inorder() == [1, 3]
+
+    def test_float_values(self):
+        """
+        Хранение вещественных значений.
+        """
+        tree = ArrayBinarySearchTree("d")
+        tree.insert_from_iterable([2.5, -1.0, 3.25])
+
+        assert tree.inorder() == [-1.0, 2.5, 3.25]
+        assert tree.search(2.5) is not None
+
+    def test_empty_tree_operations(self):
+        """
+        Тест операций на пустом дереве.
+        """
+        tree = ArrayBinarySearchTree()
+
+        assert tree.is_empty()
+        assert tree.height == 0
+        assert tree.min is None
+        assert tree.max is None
+        assert tree.inorder() == []
+        tree.delete(1)
+
+    def test_from_sorted_rejects_unsorted(self):
+        """
+        Неотсортированные данные вызывают ошибку.
+        """
+        with pytest.raises(ValueError, match="sorted"):
+            ArrayBinarySearchTree.from_sorted([2, 1])
+
+    def test_memory_footprint(self):
+        """
+        Дерево на массивах как минимум в 3 раза компактнее дерева из узлов.
+        """
+        values = list(range(10**6, 10**6 + 20000))
+
+        node_size, _ = traced_size(lambda: BinarySearchTree.from_sorted(values))
+        array_size, _ = traced_size(lambda: ArrayBinarySearchTree.from_sorted(values))
+
+        assert node_size >= 3 * array_size
+
+    def test_node_has_no_dict(self):
+        """
+        Узел использует __slots__.
+        """
+        assert not hasattr(Node(1), "__dict__")
@@ -0,0 +1,591 @@
+from bisect import bisect_left, bisect_right, insort_right
+from typing import Iterable, Iterator
+
+
+class BTreeNode:
+    """
+    Node of a B-tree, holds several sorted keys in one list.
+
+    Attributes:
+        keys (list[int]): sorted keys of the node
+        children (list[BTreeNode]): child nodes, empty for a leaf
+        next (BTreeNode | None): next leaf, used only by BPlusTree
+    """
+    __slots__ = ("keys", "children", "next")
+
+    def __init__(self, keys: list[int] | None = None, children: list["BTreeNode"] | None = None) -> None:
+        """
+        Initialize node.
+        """
+        self.keys = keys if keys is not None else []
+        self.children = children if children is not None else []
+        self.next = None
+
+    @property
+    def is_leaf(self) -> bool:
+        """
+        Check if the node has no children.
+        """
+        return not self.children
+
+    def __repr__(self) -> str:
+        """
+        Representation of the node.
+        """
+        return f"BTreeNode({self.keys})"
+
+
+class BTree:
+    """
+    A B-tree with the same interface as BinarySearchTree.
+
+    Every node holds up to order - 1 sorted keys, so one node visit
+    replaces several binary-node hops and the keys of a node sit next
+    to each other in one list. All leaves are on the same level.
+    Equal values are allowed, as in BinarySearchTree.
+
+    Attributes:
+        root (BTreeNode): root node, an empty leaf for an empty tree
+        order (int): maximum number of children of a node
+    """
+    def __init__(self, order: int = 32) -> None:
+        """
+        Initialize tree.
+
+        Args:
+            order: Maximum number of children of a node, at least 3
+
+        Raises:
+            ValueError: If order is less than 3
+        """
+        if order < 3:
+            raise ValueError("B-tree order must be at least 3")
+        self.order = order
+        self.clear()
+
+    @property
+    def _min_keys(self) -> int:
+        """
+        Minimum number of keys in a non-root node.
+        """
+        return (self.order + 1) // 2 - 1
+
+    def clear(self) -> None:
+        """
+        Clear the entire tree.
+        """
+        self.root = BTreeNode()
+        self._count = 0
+
+    def insert(self, value: int) -> None:
+        """
+        Insert the value into the tree, splitting full nodes on the way up.
+        """
+        path: list[tuple[BTreeNode, int]] = []
+        node = self.root
+        while node.children:
+            i = bisect_right(node.keys, value)
+            path.append((node, i))
+            node = node.children[i]
+
+        insort_right(node.keys, value)
+        self._count += 1
+
+        while len(node.keys) > self.order - 1:
+            separator, right = self._split(node)
+            if not path:
+                self.root = BTreeNode([separator], [node, right])
+                break
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, right)
+            node = parent
+
+    def _split(self, node: BTreeNode) -> tuple[int, BTreeNode]:
+        """
+        Split an overfull node in two around its middle key.
+
+        Returns:
+            Key that moves up to the parent and the new right node
+        """
+        mid = len(node.keys) // 2
+        separator = node.keys[mid]
+        right = BTreeNode(node.keys[mid + 1:], node.children[mid + 1:])
+        del node.keys[mid:]
+        del node.children[mid + 1:]
+        return separator, right
+
+    def insert_from_iterable(self, iter_values: Iterable[int]) -> None:
+        """
+        Insert a values from iterable object into the tree.
+        """
+        for iter_value in iter_values:
+            self.insert(iter_value)
+
+    def search(self, value: int) -> BTreeNode | None:
+        """
+        Search for a value in the tree.
+
+        Returns:
+            Node holding the value if found, None otherwise
+        """
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, value)
+            if i < len(node.keys) and node.keys[i] == value:
+                return node
+            if not node.children:
+                return None
+            node = node.children[i]
+
+    def delete(self, value: int) -> None:
+        """
+        Delete a value from the tree.
+        Does nothing if value not found.
+        """
+        path: list[tuple[BTreeNode, int]] = []
+        node = self.root
+        while True:
+            i = bisect_left(node.keys, value)
+            if i < len(node.keys) and node.keys[i] == value:
+                break
+            if not node.children:
+                return
+            path.append((node, i))
+            node = node.children[i]
+
+        if node.children:
+            # Replace with the in-order predecessor, which is always in a leaf
+            target = node
+            path.append((node, i))
+            node = node.children[i]
+            while node.children:
+                path.append((node, len(node.children) - 1))
+                node = node.children[-1]
+            target.keys[i] = node.keys.pop()
+        else:
+            del node.keys[i]
+
+        self._count -= 1
+        self._fix_underflow(node, path)
+
+    def _fix_underflow(self, node: BTreeNode, path: list[tuple[BTreeNode, int]]) -> None:
+        """
+        Refill nodes that dropped below the minimum, walking up the path.
+        A node borrows a key from a sibling through the parent, or is
+        merged with a sibling, which can leave the parent short in turn.
+        """
+        while path and len(node.keys) < self._min_keys:
+            parent, i = path.pop()
+            left = parent.children[i - 1] if i > 0 else None
+            right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+
+            if left is not None and len(left.keys) > self._min_keys:
+                self._borrow_from_left(parent, i, left, node)
+                return
+            if right is not None and len(right.keys) > self._min_keys:
+                self._borrow_from_right(parent, i, node, right)
+                return
+
+            if left is not None:
+                self._merge(parent, i - 1, left, node)
+            else:
+                self._merge(parent, i, node, right)
+            node = parent
+
+        if not self.root.keys and self.root.children:
+            self.root = self.root.children[0]
+
+    def _borrow_from_left(self, parent: BTreeNode, i: int, left: BTreeNode, node: BTreeNode) -> None:
+        """
+        Rotate the last key of the left sibling through the parent into node.
+        """
+        node.keys.insert(0, parent.keys[i - 1])
+        parent.keys[i - 1] = left.keys.pop()
+        if left.children:
+            node.children.insert(0, left.children.pop())
+
+    def _borrow_from_right(self, parent: BTreeNode, i: int, node: BTreeNode, right: BTreeNode) -> None:
+        """
+        Rotate the first key of the right sibling through the parent into node.
+        """
+        node.keys.append(parent.keys[i])
+        parent.keys[i] = right.keys.pop(0)
+        if right.children:
+            node.children.append(right.children.pop(0))
+
+    def _merge(self, parent: BTreeNode, i: int, left: BTreeNode, right: BTreeNode) -> None:
+        """
+        Merge children i and i + 1 of parent together with their separator.
+        """
+        left.keys.append(parent.keys.pop(i))
+        left.keys.extend(right.keys)
+        left.children.extend(right.children)
+        del parent.children[i + 1]
+
+    def _leftmost_leaf(self) -> BTreeNode:
+        """
+        Leaf holding the smallest keys.
+        """
+        node = self.root
+        while node.children:
+            node = node.children[0]
+        return node
+
+    @property
+    def min(self) -> int | None:
+        """
+        Get the minimum value in the tree.
+
+        Returns:
+            Minimum value or None if tree is empty
+        """
+        if self.is_empty():
+            return None
+        return self._leftmost_leaf().keys[0]
+
+    @property
+    def max(self) -> int | None:
+        """
+        Get the maximum value in the tree.
+
+        Returns:
+            Maximum value or None if tree is empty
+        """
+        if self.is_empty():
+            return None
+        node = self.root
+        while node.children:
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def is_empty(self) -> bool:
+        """
+        Check if the tree is empty.
+
+        Returns:
+            True if tree is empty, False otherwise
+        """
+        return self._count == 0
+
+    @property
+    def height(self) -> int:
+        """
+        Number of levels in the tree, all leaves share the same depth.
+
+        Returns:
+            Height of the tree (0 for empty tree)
+        """
+        if self.is_empty():
+            return 0
+        levels = 1
+        node = self.root
+        while node.children:
+            node = node.children[0]
+            levels += 1
+        return levels
+
+    def _iter_from(self, lo: int | None = None, inclusive: bool = True) -> Iterator[int]:
+        """
+        Lazy in-order walk starting at lo, or at the smallest value if lo is None.
+        Only the nodes on the path to lo are touched before the first value.
+        """
+        if self.is_empty():
+            return
+        stack: list[tuple[BTreeNode, int]] = []
+        node = self.root
+        while True:
+            if lo is None:
+                i = 0
+            else:
+                i = bisect_left(node.keys, lo) if inclusive else bisect_right(node.keys, lo)
+            stack.append((node, i))
+            if not node.children:
+                break
+            node = node.children[i]
+
+        # A frame (node, i) means: the next value of node is keys[i],
+        # and child i + 1 must be walked right after it
+        while stack:
+            node, i = stack.pop()
+            if i >= len(node.keys):
+                continue
+            stack.append((node, i + 1))
+            yield node.keys[i]
+            if node.children:
+                child = node.children[i + 1]
+                while True:
+                    stack.append((child, 0))
+                    if not child.children:
+                        break
+                    child = child.children[0]
+
+    def iter_inorder(self) -> Iterator[int]:
+        """
+        Lazy in-order traversal, values in ascending order.
+
+        Yields:
+            Values in in-order sequence
+        """
+        return self._iter_from()
+
+    def iter_preorder(self) -> Iterator[int]:
+        """
+        Lazy pre-order traversal: node keys, then each child subtree.
+
+        Yields:
+            Keys in pre-order sequence
+        """
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            yield from node.keys
+            stack.extend(reversed(node.children))
+
+    def iter_postorder(self) -> Iterator[int]:
+        """
+        Lazy post-order traversal: each child subtree, then node keys.
+
+        Yields:
+            Keys in post-order sequence
+        """
+        stack: list[tuple[BTreeNode, bool]] = [(self.root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded or not node.children:
+                yield from node.keys
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+
+    def inorder(self) -> list[int]:
+        """
+        In-order traversal, values in ascending order.
+        """
+        return list(self.iter_inorder())
+
+    def preorder(self) -> list[int]:
+        """
+        Pre-order traversal.
+        """
+        return list(self.iter_preorder())
+
+    def postorder(self) -> list[int]:
+        """
+        Post-order traversal.
+        """
+        return list(self.iter_postorder())
+
+    def range(self, lo: int, hi: int, inclusive: bool | tuple[bool, bool] = True) -> Iterator[int]:
+        """
+        Lazily yield values between lo and hi in ascending order, O(log n + k).
+
+        Args:
+            lo: Lower bound
+            hi: Upper bound
+            inclusive: Whether the bounds are included, either one flag
+                for both or a (lo_inclusive, hi_inclusive) pair
+
+        Yields:
+            Values in the range in in-order sequence
+        """
+        lo_inclusive, hi_inclusive = inclusive if isinstance(inclusive, tuple) else (inclusive, inclusive)
+        for value in self._iter_from(lo, lo_inclusive):
+            if value > hi or (not hi_inclusive and value == hi):
+                return
+            yield value
+
+    def __contains__(self, value) -> bool:
+        """
+        Search the value in the tree.
+
+        Returns:
+            True if value in the tree, False otherwise
+        """
+        return self.search(value) is not None
+
+    def __len__(self) -> int:
+        """
+        Number of values in the tree.
+        """
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate over values in ascending order.
+        """
+        return self.iter_inorder()
+
+
+class BPlusTree(BTree):
+    """
+    A B+-tree: every value lives in a leaf and leaves are chained.
+
+    Internal nodes only hold separator copies for routing, so they fit
+    more children per node. In-order traversal and range scans find the
+    first leaf once and then walk the leaf chain sequentially.
+    Child i of a node holds values between keys[i - 1] and keys[i],
+    both inclusive, since equal values may span a leaf split.
+    """
+    @property
+    def _min_leaf_keys(self) -> int:
+        """
+        Minimum number of keys in a non-root leaf.
+        """
+        return self.order // 2
+
+    def insert(self, value: int) -> None:
+        """
+        Insert the value into its leaf, splitting full nodes on the way up.
+        """
+        path: list[tuple[BTreeNode, int]] = []
+        node = self.root
+        while node.children:
+            i = bisect_right(node.keys, value)
+            path.append((node, i))
+            node = node.children[i]
+
+        insort_right(node.keys, value)
+        self._count += 1
+        if len(node.keys) <= self.order - 1:
+            return
+
+        # A leaf keeps all its keys and copies the first key of the new leaf up
+        mid = len(node.keys) // 2
+        right = BTreeNode(node.keys[mid:])
+        del node.keys[mid:]
+        right.next, node.next = node.next, right
+        separator = right.keys[0]
+
+        while True:
+            if not path:
+                self.root = BTreeNode([separator], [node, right])
+                return
+            parent, i = path.pop()
+            parent.keys.insert(i, separator)
+            parent.children.insert(i + 1, right)
+            if len(parent.keys) <= self.order - 1:
+                return
+            node = parent
+            separator, right = self._split(node)
+
+    def _find_leaf(self, value: int) -> tuple[list[tuple[BTreeNode, int]], BTreeNode, int] | None:
+        """
+        Find a leaf holding value together with the path to it.
+        Equal values can continue past a separator, so children to the
+        right are tried while the separator equals value.
+
+        Returns:
+            Path of (node, child index) pairs, the leaf and the key index,
+            or None if value is not in the tree
+        """
+        stack: list[tuple[BTreeNode, list[tuple[BTreeNode, int]]]] = [(self.root, [])]
+        while stack:
+            node, path = stack.pop()
+            if not node.children:
+                i = bisect_left(node.keys, value)
+                if i < len(node.keys) and node.keys[i] == value:
+                    return path, node, i
+                continue
+            first = bisect_left(node.keys, value)
+            last = bisect_right(node.keys, value)
+            for i in range(last, first - 1, -1):
+                stack.append((node.children[i], path + [(node, i)]))
+        return None
+
+    def search(self, value: int) -> BTreeNode | None:
+        """
+        Search for a value in the tree.
+
+        Returns:
+            Leaf holding the value if found, None otherwise
+        """
+        found = self._find_leaf(value)
+        return found[1] if found is not None else None
+
+    def delete(self, value: int) -> None:
+        """
+        Delete a value from the tree.
+        Does nothing if value not found.
+        """
+        found = self._find_leaf(value)
+        if found is None:
+            return
+        path, leaf, i = found
+        del leaf.keys[i]
+        self._count -= 1
+
+        if not path or len(leaf.keys) >= self._min_leaf_keys:
+            return
+
+        parent, i = path.pop()
+        left = parent.children[i - 1] if i > 0 else None
+        right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+
+        if left is not None and len(left.keys) > self._min_leaf_keys:
+            leaf.keys.insert(0, left.keys.pop())
+            parent.keys[i - 1] = leaf.keys[0]
+            return
+        if right is not None and len(right.keys) > self._min_leaf_keys:
+            leaf.keys.append(right.keys.pop(0))
+            parent.keys[i] = right.keys[0]
+            return
+
+        # Merge two leaves and drop the separator between them
+        if left is not None:
+            left.keys.extend(leaf.keys)
+            left.next = leaf.next
+            del parent.keys[i - 1]
+            del parent.children[i]
+        else:
+            leaf.keys.extend(right.keys)
+            leaf.next = right.next
+            del parent.keys[i]
+            del parent.children[i + 1]
+        self._fix_underflow(parent, path)
+
+    def _iter_from(self, lo: int | None = None, inclusive: bool = True) -> Iterator[int]:
+        """
+        Lazy in-order walk starting at lo, or at the smallest value if lo is None.
+        Descends once to the first leaf, then follows the leaf chain.
+        """
+        node = self.root
+        while node.children:
+            node = node.children[0 if lo is None else bisect_left(node.keys, lo)]
+
+        if lo is None:
+            i = 0
+        else:
+            i = bisect_left(node.keys, lo) if inclusive else bisect_right(node.keys, lo)
+        while node is not None:
+            keys = node.keys
+            while i < len(keys):
+                yield keys[i]
+                i += 1
+            node = node.next
+            if node is not None and lo is not None and not inclusive:
+                i = bisect_right(node.keys, lo)
+            else:
+                i = 0
+
+    def iter_preorder(self) -> Iterator[int]:
+        """
+        Lazy pre-order traversal of the stored values.
+        Internal nodes only hold separator copies, so every value is
+        yielded once from its leaf and leaves come left to right.
+
+        Yields:
+            Values in pre-order sequence
+        """
+        return self._iter_from()
+
+    def iter_postorder(self) -> Iterator[int]:
+        """
+        Lazy post-order traversal of the stored values.
+        Separator copies are skipped as in iter_preorder, so leaves
+        come left to right as well.
+
+        Yields:
+            Values in post-order sequence
+        """
+        return self._iter_from()
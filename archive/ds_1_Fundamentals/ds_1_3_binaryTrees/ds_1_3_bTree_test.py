@@ -0,0 +1,174 @@
+import random
+
+import pytest
+from ds_1_3_bTree import BPlusTree, BTree
+
+
+def check_invariants(tree):
+    """
+    Проверка свойств B-дерева: порядок ключей, заполненность узлов,
+    одинаковая глубина листьев и цепочка листьев для B+-дерева.
+    """
+    leaf_depths = set()
+    leaves = []
+    stack = [(tree.root, 0, None, None)]
+    while stack:
+        node, depth, lo, hi = stack.pop()
+        assert node.keys == sorted(node.keys)
+        assert len(node.keys) <= tree.order - 1
+        if node is not tree.root:
+            minimum = tree._min_keys if node.children else getattr(tree, "_min_leaf_keys", tree._min_keys)
+            assert len(node.keys) >= minimum
+        assert all((lo is None or key >= lo) and (hi is None or key <= hi) for key in node.keys)
+        if not node.children:
+            leaf_depths.add(depth)
+            leaves.append(node)
+            continue
+        assert len(node.children) == len(node.keys) + 1
+        bounds = [lo] + node.keys + [hi]
+        for i, child in reversed(list(enumerate(node.children))):
+            stack.append((child, depth + 1, bounds[i], bounds[i + 1]))
+    assert len(leaf_depths) <= 1
+
+    if isinstance(tree, BPlusTree):
+        chained = []
+        leaf = leaves[0] if leaves else None
+        while leaf is not None:
+            chained.append(leaf)
+            leaf = leaf.next
+        assert chained == leaves
+        assert sum(len(leaf.keys) for leaf in leaves) == len(tree)
+
+
+@pytest.fixture(params=[BTree, BPlusTree])
+def tree_class(request):
+    return request.param
+
+
+class TestBTree:
+    """
+    Класс тестирования B-дерева и B+-дерева.
+    """
+
+    def test_order_validation(self, tree_class):
+        """
+        Порядок меньше 3 недопустим.
+        """
+        with pytest.raises(ValueError):
+            tree_class(order=2)
+
+    def test_empty_tree(self, tree_class):
+        """
+        Пустое дерево.
+        """
+        tree = tree_class(order=4)
+        assert tree.is_empty()
+        assert tree.min is None and tree.max is None
+        assert tree.height == 0
+        assert tree.inorder() == []
+        assert list(tree.range(0, 10)) == []
+        assert tree.search(1) is None
+        tree.delete(1)
+        assert len(tree) == 0
+
+    def test_insert_search_delete(self, tree_class):
+        """
+        Вставка, поиск и удаление значений, включая дубликаты.
+        """
+        tree = tree_class(order=3)
+        tree.insert_from_iterable([1, 3, 7, 8, 4, 2, 7, 8])
+
+        assert 7 in tree
+        assert 5 not in tree
+        assert 7 in tree.search(7).keys
+        assert len(tree) == 8
+        assert tree.min == 1 and tree.max == 8
+
+        tree.delete(8)
+        assert 8 in tree
+        tree.delete(8)
+        assert 8 not in tree
+        assert tree.inorder() == [1, 2, 3, 4, 7, 7]
+        check_invariants(tree)
+
+    def test_traversals(self):
+        """
+        Обходы B-дерева в прямом и обратном порядке.
+        Обходы B+-дерева выдают каждое значение один раз, без копий разделителей.
+        """
+        tree = BTree(order=3)
+        tree.insert_from_iterable([1, 2, 3])
+        assert tree.preorder() == [2, 1, 3]
+        assert tree.postorder() == [1, 3, 2]
+        assert tree.height == 2
+
+        tree = BPlusTree(order=3)
+        values = [5, 1, 9, 3, 7, 3, 5, 11]
+        tree.insert_from_iterable(values)
+        assert tree.height > 2
+        assert tree.preorder() == sorted(values)
+        assert tree.postorder() == sorted(values)
+
+    @pytest.mark.parametrize("order", [3, 4, 5, 8, 33])
+    def test_random_operations(self, tree_class, order):
+        """
+        Случайные вставки и удаления сохраняют свойства дерева.
+        """
+        rng = random.Random(order)
+        tree = tree_class(order=order)
+        expected = []
+        for _ in range(2000):
+            value = rng.randrange(200)
+            if rng.random() < 0.6:
+                tree.insert(value)
+                expected.append(value)
+            else:
+                tree.delete(value)
+                if value in expected:
+                    expected.remove(value)
+        check_invariants(tree)
+        assert tree.inorder() == sorted(expected)
+        assert len(tree) == len(expected)
+
+        for value in list(expected):
+            tree.delete(value)
+        check_invariants(tree)
+        assert tree.is_empty()
+        assert tree.height == 0
+
+    def test_range(self, tree_class):
+        """
+        Диапазонные запросы с разными границами.
+        """
+        tree = tree_class(order=4)
+        values = [5, 1, 9, 3, 7, 3, 5, 11, 5]
+        tree.insert_from_iterable(values)
+
+        assert list(tree.range(3, 7)) == [3, 3, 5, 5, 5, 7]
+        assert list(tree.range(3, 7, inclusive=False)) == [5, 5, 5]
+        assert list(tree.range(3, 7, inclusive=(True, False))) == [3, 3, 5, 5, 5]
+        assert list(tree.range(4, 4)) == []
+        assert list(tree.range(-10, 100)) == sorted(values)
+
+    def test_range_duplicates_across_nodes(self, tree_class):
+        """
+        Дубликаты, разнесенные по разным узлам, находятся и удаляются.
+        """
+        tree = tree_class(order=3)
+        tree.insert_from_iterable([5] * 20 + [1, 9])
+        check_invariants(tree)
+        assert list(tree.range(5, 5)) == [5] * 20
+        assert list(tree.range(5, 9, inclusive=(False, True))) == [9]
+        for _ in range(20):
+            tree.delete(5)
+            check_invariants(tree)
+        assert tree.inorder() == [1, 9]
+
+    def test_height_is_logarithmic(self, tree_class):
+        """
+        Высота дерева с большим порядком мала.
+        """
+        tree = tree_class(order=64)
+        tree.insert_from_iterable(range(100000))
+        assert tree.height <= 4
+        assert list(tree.range(500, 505)) == [500, 501, 502, 503, 504, 505]
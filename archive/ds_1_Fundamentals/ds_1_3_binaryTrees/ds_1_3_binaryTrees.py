@@ -1,14 +1,31 @@
+import io
+import mmap
+import pickle
+import struct
+import sys
+from array import array
 from random import randint
+from typing import Iterable, Iterator, Sequence, TextIO
+
+# Marks an exhausted iterator while merging sorted sequences
+_END = object()
+
 
 class Node:
     """
-    Class-node, instances of the class will be a node of a binary tree
+    Class-node, instances of the class will be a node of a binary tree.
+    Uses __slots__, so nodes carry no per-instance __dict__.
 
     Attributes:
         value (int): node value
         left (Node): left child node
         right (Node): right child node
+        height (int): height of the subtree rooted at the node
+        size (int): number of nodes in the subtree rooted at the node
+        red (bool): node color, used only by red-black balancing
     """
+    __slots__ = ("value", "left", "right", "height", "size", "red")
+
     def __init__(self, value: int) -> None:
         """
         Initialize node.
@@ -16,6 +33,9 @@ class Node:
         self.value = value
         self.left = None
         self.right = None
+        self.height = 1
+        self.size = 1
+        self.red = True
 
     def __str__(self) -> str:
         """
@@ -30,42 +50,429 @@ class Node:
         return f"Node({self.value})"
 
 
+def _height(node: Node | None) -> int:
+    """
+    Height of a subtree, 0 for an empty one.
+    """
+    return node.height if node is not None else 0
+
+
+def _size(node: Node | None) -> int:
+    """
+    Number of nodes in a subtree, 0 for an empty one.
+    """
+    return node.size if node is not None else 0
+
+
+def _is_red(node: Node | None) -> bool:
+    """
+    Check the color of a node, empty subtrees are black.
+    """
+    return node is not None and node.red
+
+
+def _merge_unique(left: Iterator[int], right: Iterator[int], keep_left: bool,
+                  keep_both: bool, keep_right: bool) -> list[int]:
+    """
+    Merge two ascending sequences into one ascending list without duplicates.
+
+    Args:
+        left: Ascending values of the first set
+        right: Ascending values of the second set
+        keep_left: Keep values found only in left
+        keep_both: Keep values found in both
+        keep_right: Keep values found only in right
+
+    Returns:
+        Ascending list of the kept values
+    """
+    result: list[int] = []
+    a, b = next(left, _END), next(right, _END)
+
+    while a is not _END or b is not _END:
+        if b is _END or (a is not _END and a < b):
+            value, keep = a, keep_left
+        elif a is _END or b < a:
+            value, keep = b, keep_right
+        else:
+            value, keep = a, keep_both
+        if keep:
+            result.append(value)
+        while a is not _END and a == value:
+            a = next(left, _END)
+        while b is not _END and b == value:
+            b = next(right, _END)
+
+    return result
+
+
 class BinarySearchTree:
     """
     A class for representing the operation of binary trees.
 
     Attributes:
         root (Node): root of a binary tree.
+        balance (str | None): balancing strategy - None, "avl" or "rb".
+        persistent (bool): whether writes copy nodes instead of changing them.
     """
-    def __init__(self) -> None:
+    BALANCE_MODES = (None, "avl", "rb")
+    # Class of the created nodes, subclasses may add fields kept by _update
+    NODE_CLASS = Node
+    # Nodes shown by str(), larger trees are cut off with a marker line
+    STR_MAX_NODES = 500
+
+    # Serialized layout: header, one shape byte per node in pre-order
+    # (padded to 8 bytes) and the pre-order values as a typed array,
+    # or pickled when they are not all ints or all floats
+    _MAGIC = b"BST1"
+    _HEADER = struct.Struct("<4sBcxxQ")
+    _HAS_LEFT, _HAS_RIGHT, _IS_RED = 1, 2, 4
+
+    def __init__(self, balance: str | None = None, persistent: bool = False) -> None:
         """
         Initialize binary tree.
+
+        Args:
+            balance: None for a plain tree, "avl" for an AVL tree or
+                "rb" for a red-black tree. Balanced trees keep their
+                height O(log n) for any insertion order.
+            persistent: Never change a node once it is part of the tree.
+                insert and delete copy the nodes they touch and return
+                a new root, so earlier roots and snapshots stay intact.
+
+        Raises:
+            ValueError: If balance is not a known strategy, or is "rb"
+                for a persistent tree
         """
+        if balance not in self.BALANCE_MODES:
+            raise ValueError(f"Unknown balance mode: {balance!r}")
+        if persistent and balance == "rb":
+            raise ValueError("Persistent trees support only plain and AVL balancing")
+        self.balance = balance
+        self.persistent = persistent
         self.root = None
+        self._read_only = False
+        # Nodes copied or created by the current persistent write
+        self._fresh: set[Node] = set()
+        self._min: Node | None = None
+        self._max: Node | None = None
 
-    def insert(self, value: int) -> None:
+    def insert(self, value: int) -> Node:
         """
         Insert the value into the tree.
+
+        Returns:
+            Root of the tree after the insertion
+
+        Raises:
+            TypeError: If the tree is a read-only snapshot
         """
-        if not self.root:
-            self.root = Node(value)
+        self._check_writable()
+        node = self.NODE_CLASS(value)
+        if self.root is None:
+            node.red = False
+            self.root = self._min = self._max = node
+            return node
+
+        # Equal values go right, so a new maximum may equal the old one
+        if value < self._min.value:
+            self._min = node
+        if value >= self._max.value:
+            self._max = node
+
+        path: list[Node] = []
+        current = self.root
+        while current is not None:
+            path.append(current)
+            current = current.left if value < current.value else current.right
+
+        if self.persistent:
+            self._copy_path(path)
+            self._fresh.add(node)
+
+        parent = path[-1]
+        if value < parent.value:
+            parent.left = node
         else:
-            self._insert_recursive(self.root, value)
+            parent.right = node
 
-    def _insert_recursive(self, node: Node, value: int) -> None:
+        self._retrace(path)
+        if self.balance == "rb":
+            self._retrace(self._rb_fix_insert(node, path))
+        self._end_write()
+        return self.root
+
+    def _check_writable(self) -> None:
         """
-        Recursively insert value into the tree.
+        Refuse changes to a read-only snapshot.
+
+        Raises:
+            TypeError: If the tree is a snapshot
         """
-        if value < node.value:
-            if node.left is None:
-                node.left = Node(value)
-            else:
-                self._insert_recursive(node.left, value)
+        if self._read_only:
+            raise TypeError("Snapshot of a BinarySearchTree is read-only")
+
+    def _writable(self, node: Node) -> Node:
+        """
+        Get a node that may be changed by the current write.
+        A persistent tree copies nodes that older versions can still reach.
+
+        Returns:
+            The node itself, or its copy sharing both children
+        """
+        if not self.persistent or node in self._fresh:
+            return node
+        copy = self.NODE_CLASS(node.value)
+        copy.left, copy.right, copy.red = node.left, node.right, node.red
+        self._update(copy)
+        self._fresh.add(copy)
+        return copy
+
+    def _copy_path(self, path: list[Node]) -> None:
+        """
+        Replace the nodes of a root-to-node path with linked copies
+        and make the copied root the root of the tree.
+
+        Args:
+            path: Nodes from the root down, replaced in place by the copies
+        """
+        for i, node in enumerate(path):
+            copy = self._writable(node)
+            if i:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = copy
+                else:
+                    parent.right = copy
+            path[i] = copy
+        self.root = path[0]
+
+    def _end_write(self) -> None:
+        """
+        Finish a persistent write: forget the fresh nodes, which now
+        belong to the new version, and refresh the cached extremes.
+        """
+        if self.persistent:
+            self._fresh.clear()
+            self._refresh_extremes()
+
+    def snapshot(self) -> "BinarySearchTree":
+        """
+        Read-only view of the current version in O(1).
+        The snapshot shares all nodes with the tree and is not affected
+        by later writes, so it can be read without locks.
+
+        Returns:
+            Read-only tree holding the current values
+
+        Raises:
+            ValueError: If the tree is not persistent
+        """
+        if not self.persistent:
+            raise ValueError("Snapshots need a persistent tree")
+        snapshot = type(self)(self.balance, persistent=True)
+        snapshot.root, snapshot._min, snapshot._max = self.root, self._min, self._max
+        snapshot._read_only = True
+        return snapshot
+
+    def _update(self, node: Node) -> None:
+        """
+        Recompute the cached height and size of a node from its children.
+        """
+        node.height = 1 + max(_height(node.left), _height(node.right))
+        node.size = 1 + _size(node.left) + _size(node.right)
+
+    def _refresh_extremes(self) -> None:
+        """
+        Find the minimum and maximum nodes again after the root changed.
+        """
+        if self.root is None:
+            self._min = self._max = None
         else:
-            if node.right is None:
-                node.right = Node(value)
+            self._min = self.find_min(self.root)
+            self._max = self.find_max(self.root)
+
+    def _replace_child(self, parent: Node | None, old: Node, new: Node | None) -> None:
+        """
+        Put new in place of old under parent, or at the root if parent is None.
+        """
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _rotate_left(self, node: Node) -> Node:
+        """
+        Rotate a subtree left.
+
+        Returns:
+            New root of the subtree (former right child)
+        """
+        node = self._writable(node)
+        pivot = self._writable(node.right)
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node: Node) -> Node:
+        """
+        Rotate a subtree right.
+
+        Returns:
+            New root of the subtree (former left child)
+        """
+        node = self._writable(node)
+        pivot = self._writable(node.left)
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _retrace(self, path: list[Node]) -> None:
+        """
+        Walk a root-to-node path bottom-up, refreshing cached data and
+        restoring AVL balance where needed.
+
+        Args:
+            path: Nodes from the root down to the changed position
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            self._update(node)
+            if self.balance == "avl":
+                balanced = self._avl_rebalance(node)
+                if balanced is not node:
+                    self._replace_child(path[i - 1] if i else None, node, balanced)
+
+    def _avl_rebalance(self, node: Node) -> Node:
+        """
+        Rotate a subtree whose children heights differ by more than one.
+
+        Returns:
+            Root of the balanced subtree
+        """
+        balance_factor = _height(node.left) - _height(node.right)
+        if balance_factor > 1:
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance_factor < -1:
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _rb_fix_insert(self, node: Node, path: list[Node]) -> list[Node]:
+        """
+        Restore red-black properties after inserting a red node.
+
+        Args:
+            node: Inserted node
+            path: Ancestors of node from the root, consumed by the fix-up
+
+        Returns:
+            Ancestors of the highest rotated node, which need their cached data refreshed
+        """
+        while path and path[-1].red:
+            # A red parent is never the root, so the grandparent exists
+            parent = path.pop()
+            grand = path.pop()
+            great = path[-1] if path else None
+
+            if parent is grand.left:
+                uncle = grand.right
+                if _is_red(uncle):
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = grand
+                    continue
+                if node is parent.right:
+                    grand.left = self._rotate_left(parent)
+                    parent = grand.left
+                parent.red = False
+                grand.red = True
+                self._replace_child(great, grand, self._rotate_right(grand))
+            else:
+                uncle = grand.left
+                if _is_red(uncle):
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = grand
+                    continue
+                if node is parent.left:
+                    grand.right = self._rotate_right(parent)
+                    parent = grand.right
+                parent.red = False
+                grand.red = True
+                self._replace_child(great, grand, self._rotate_left(grand))
+            break
+
+        self.root.red = False
+        return path
+
+    def _rb_fix_delete(self, node: Node | None, path: list[Node]) -> list[Node]:
+        """
+        Restore red-black properties after removing a black node.
+
+        Args:
+            node: Node that took the removed node's place (may be None)
+            path: Ancestors of that position from the root, consumed by the fix-up
+
+        Returns:
+            Ancestors of the highest rotated node, which need their cached data refreshed
+        """
+        while path and not _is_red(node):
+            parent = path[-1]
+            grand = path[-2] if len(path) > 1 else None
+
+            # The removed node was black, so the sibling subtree is never empty
+            if node is parent.left:
+                sibling = parent.right
+                if sibling.red:
+                    sibling.red, parent.red = False, True
+                    self._replace_child(grand, parent, self._rotate_left(parent))
+                    path.insert(len(path) - 1, sibling)
+                    grand, sibling = sibling, parent.right
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    node = path.pop()
+                    continue
+                if not _is_red(sibling.right):
+                    sibling.left.red, sibling.red = False, True
+                    parent.right = sibling = self._rotate_right(sibling)
+                sibling.red, parent.red = parent.red, False
+                sibling.right.red = False
+                self._replace_child(grand, parent, self._rotate_left(parent))
             else:
-                self._insert_recursive(node.right, value)
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red, parent.red = False, True
+                    self._replace_child(grand, parent, self._rotate_right(parent))
+                    path.insert(len(path) - 1, sibling)
+                    grand, sibling = sibling, parent.left
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    node = path.pop()
+                    continue
+                if not _is_red(sibling.left):
+                    sibling.right.red, sibling.red = False, True
+                    parent.left = sibling = self._rotate_left(sibling)
+                sibling.red, parent.red = parent.red, False
+                sibling.left.red = False
+                self._replace_child(grand, parent, self._rotate_right(parent))
+            path.insert(len(path) - 1, sibling)
+            break
+
+        if node is not None:
+            node.red = False
+        if self.root is not None:
+            self.root.red = False
+        return path
     
     def insert_from_iterable(self, iter_values) -> None:
         """
@@ -74,6 +481,229 @@ class BinarySearchTree:
         for iter_value in iter_values:
             self.insert(iter_value)
 
+    @classmethod
+    def from_sorted(cls, values: Sequence[int], balance: str | None = None) -> "BinarySearchTree":
+        """
+        Build a perfectly balanced tree from ascending values in O(n).
+        Every node takes the middle of its range, so no comparisons or
+        rotations are needed and the result is valid for any balance mode.
+
+        Args:
+            values: Values in ascending order (duplicates allowed)
+            balance: Balancing strategy of the new tree
+
+        Returns:
+            New tree holding the values
+
+        Raises:
+            ValueError: If values are not sorted
+        """
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        if any(values[i] > values[i + 1] for i in range(len(values) - 1)):
+            raise ValueError("Values must be sorted in ascending order")
+
+        tree = cls(balance=balance)
+        # In a median-split tree every empty subtree sits on one of the two
+        # lowest levels, so coloring the lowest level red satisfies red-black rules
+        red_depth = len(values).bit_length() - 1 if len(values) > 1 else -1
+
+        stack: list[tuple[int, int, Node | None, bool, int]] = [(0, len(values), None, False, 0)]
+        while stack:
+            lo, hi, parent, is_left, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            node = tree.NODE_CLASS(values[mid])
+            node.red = depth == red_depth
+            if parent is None:
+                tree.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((lo, mid, node, True, depth + 1))
+            stack.append((mid + 1, hi, node, False, depth + 1))
+
+        for node in tree._iter_nodes_postorder():
+            tree._update(node)
+        tree._refresh_extremes()
+        return tree
+
+    @classmethod
+    def from_iterable(cls, values: Iterable[int], balance: str | None = None) -> "BinarySearchTree":
+        """
+        Build a balanced tree from values in any order.
+        Sorts once and builds with from_sorted(), O(n log n) in total.
+
+        Args:
+            values: Values to insert
+            balance: Balancing strategy of the new tree
+
+        Returns:
+            New tree holding the values
+        """
+        return cls.from_sorted(sorted(values), balance=balance)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the tree together with its exact shape and colors.
+        Integer and float values are stored as a raw "q" or "d" array,
+        anything else is pickled.
+
+        Returns:
+            Header, shape bytes and pre-order values
+        """
+        values: list = []
+        shape = bytearray()
+        for node in self._iter_nodes_preorder():
+            values.append(node.value)
+            shape.append((self._HAS_LEFT if node.left is not None else 0)
+                         | (self._HAS_RIGHT if node.right is not None else 0)
+                         | (self._IS_RED if node.red else 0))
+        shape.extend(bytes(-len(shape) % 8))
+
+        typecode, payload = "p", None
+        for code, kind in (("q", int), ("d", float)):
+            if all(type(value) is kind for value in values):
+                try:
+                    typecode, payload = code, array(code, values).tobytes()
+                except OverflowError:
+                    pass
+                break
+        if payload is None:
+            payload = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+
+        header = self._HEADER.pack(self._MAGIC, self.BALANCE_MODES.index(self.balance),
+                                   typecode.encode(), len(values))
+        return header + bytes(shape) + payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview | mmap.mmap) -> "BinarySearchTree":
+        """
+        Load a tree produced by to_bytes() in O(n) without comparing values.
+        Typed values are read in place, so data can be a memory map.
+
+        Args:
+            data: Serialized tree
+
+        Returns:
+            New tree with the same shape, colors and balancing strategy
+
+        Raises:
+            ValueError: If data is not a serialized BinarySearchTree
+        """
+        magic, balance_code, typecode, n = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC or balance_code >= len(cls.BALANCE_MODES):
+            raise ValueError("Not a serialized BinarySearchTree")
+
+        tree = cls(cls.BALANCE_MODES[balance_code])
+        offset = cls._HEADER.size
+        values_offset = offset + n + (-n % 8)
+        with memoryview(data) as view:
+            shape = view[offset:offset + n]
+            if typecode == b"p":
+                values = pickle.loads(view[values_offset:])
+            else:
+                values = view[values_offset:].cast(typecode.decode())
+            try:
+                tree._link_preorder(values, shape, n)
+            finally:
+                if isinstance(values, memoryview):
+                    values.release()
+                shape.release()
+        return tree
+
+    def _link_preorder(self, values: Sequence, shape: Sequence[int], n: int) -> None:
+        """
+        Recreate nodes from pre-order values and shape bytes.
+        Each node fills the most recent open child slot and opens its
+        own slots, right first so the left subtree follows directly.
+        """
+        slots: list[tuple[Node | None, bool]] = [(None, False)] if n else []
+        for i in range(n):
+            node = self.NODE_CLASS(values[i])
+            flags = shape[i]
+            node.red = bool(flags & self._IS_RED)
+            parent, is_left = slots.pop()
+            if parent is None:
+                self.root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            if flags & self._HAS_RIGHT:
+                slots.append((node, False))
+            if flags & self._HAS_LEFT:
+                slots.append((node, True))
+        if slots:
+            raise ValueError("Not a serialized BinarySearchTree")
+
+        for node in self._iter_nodes_postorder():
+            self._update(node)
+        self._refresh_extremes()
+
+    def to_file(self, path: str) -> None:
+        """
+        Write the tree to a file in the to_bytes() format.
+
+        Args:
+            path: File to write
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def from_file(cls, path: str, use_mmap: bool = True) -> "BinarySearchTree":
+        """
+        Load a tree written by to_file().
+
+        Args:
+            path: File to read
+            use_mmap: Map the file into memory instead of reading it,
+                typed values are then decoded straight from the mapping
+
+        Returns:
+            New tree with the saved shape
+        """
+        with open(path, "rb") as file:
+            if not use_mmap:
+                return cls.from_bytes(file.read())
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                return cls.from_bytes(mapping)
+
+    def union(self, other: "BinarySearchTree") -> "BinarySearchTree":
+        """
+        Values present in either tree, as a new balanced tree.
+        Merges both in-order sequences, O(n + m).
+
+        Returns:
+            New tree with distinct values of both trees
+        """
+        values = _merge_unique(self.iter_inorder(), other.iter_inorder(), True, True, True)
+        return self.from_sorted(values, balance=self.balance)
+
+    def intersection(self, other: "BinarySearchTree") -> "BinarySearchTree":
+        """
+        Values present in both trees, as a new balanced tree.
+        Merges both in-order sequences, O(n + m).
+
+        Returns:
+            New tree with distinct common values
+        """
+        values = _merge_unique(self.iter_inorder(), other.iter_inorder(), False, True, False)
+        return self.from_sorted(values, balance=self.balance)
+
+    def difference(self, other: "BinarySearchTree") -> "BinarySearchTree":
+        """
+        Values present in this tree but not in other, as a new balanced tree.
+        Merges both in-order sequences, O(n + m).
+
+        Returns:
+            New tree with distinct values missing from other
+        """
+        values = _merge_unique(self.iter_inorder(), other.iter_inorder(), True, False, False)
+        return self.from_sorted(values, balance=self.balance)
+
     def search(self, value: int) -> Node | None:
         """
         Search for a value in the tree.
@@ -81,96 +711,307 @@ class BinarySearchTree:
         Returns:
             Node if found, None otherwise
         """
-        if self.root is None:
-            return None
-        return self._search_recursive(self.root, value)
-   
-    def _search_recursive(self, node: Node | None, value: int) -> Node | None:
-        """
-        Recursively search for a value.
-        """
-        if node is None:
-            return None
-        if value == node.value:
-            return node
-        elif value < node.value:
-            return self._search_recursive(node.left, value)
-        else:
-            return self._search_recursive(node.right, value)
+        node = self.root
+        while node is not None:
+            if value == node.value:
+                return node
+            node = node.left if value < node.value else node.right
+        return None
 
-    def delete(self, value: int) -> None:
+    def delete(self, value: int) -> Node | None:
         """
         Delete a value from the tree.
         Does nothing if value not found.
-        """
-        if not self.search(value):
-            return
-        self.root = self._delete_recursive(self.root, value)
 
-    def _delete_recursive(self, node: Node | None, value: int) -> Node | None:
-        """
-        Recursively delete a value from the tree.
+        Returns:
+            Root of the tree after the deletion
+
+        Raises:
+            TypeError: If the tree is a read-only snapshot
         """
+        self._check_writable()
+        path: list[Node] = []
+        node = self.root
+        while node is not None and value != node.value:
+            path.append(node)
+            node = node.left if value < node.value else node.right
         if node is None:
-            return None
+            return self.root
 
-        if value < node.value:
-            node.left = self._delete_recursive(node.left, value)
-        elif value > node.value:
-            node.right = self._delete_recursive(node.right, value)
-        else:
-            if node.left is None and node.right is None:
-                return None
-            elif node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
-            else:
-                max_left_node = self.find_max(node.left)
-                node.value = max_left_node.value
-                node.left = self._delete_recursive(node.left, max_left_node.value)
+        # A node with two children takes the value of its in-order
+        # predecessor, and the predecessor node is removed instead
+        target_depth = None
+        if node.left is not None and node.right is not None:
+            target_depth = len(path)
+            path.append(node)
+            node = node.left
+            while node.right is not None:
+                path.append(node)
+                node = node.right
 
-        return node
+        if self.persistent and path:
+            self._copy_path(path)
+        if target_depth is not None:
+            path[target_depth].value = node.value
+
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+
+        self._retrace(path)
+        if self.balance == "rb" and not node.red:
+            self._retrace(self._rb_fix_delete(child, path))
+        if self.persistent:
+            self._end_write()
+        elif node is self._min or node is self._max:
+            self._refresh_extremes()
+        return self.root
 
     def find_min(self, node: Node) -> Node:
         """
         Find the minimum value in a subtree.
         """
-        if node.left is None:
-            return node
-        return self.find_min(node.left)
+        while node.left is not None:
+            node = node.left
+        return node
 
     def find_max(self, node: Node) -> Node:
         """
         Find the maximum value in a subtree.
         """
-        if node.right is None:
-            return node
-        return self.find_max(node.right)
+        while node.right is not None:
+            node = node.right
+        return node
 
     @property
     def min(self) -> Node | None:
         """
         Get the minimum value in the tree.
+        The node is cached and kept current by insert and delete.
         
         Returns:
             Node with minimum value or None if tree is empty
         """
-        if self.is_empty():
-            return None
-        return self.find_min(self.root)
+        return self._min
               
     @property
     def max(self) -> Node | None:
         """
         Get the maximum value in the tree.
+        The node is cached and kept current by insert and delete.
         
         Returns:
             Node with maximum value or None if tree is empty
         """
-        if self.is_empty():
-            return None
-        return self.find_max(self.root)
+        return self._max
+
+    def rank(self, value: int) -> int:
+        """
+        Count values strictly less than value, O(log n) on a balanced tree.
+        
+        Returns:
+            Number of smaller values (the index value would take in inorder())
+        """
+        count = 0
+        node = self.root
+        while node is not None:
+            if value <= node.value:
+                node = node.left
+            else:
+                count += _size(node.left) + 1
+                node = node.right
+        return count
+
+    def _rank_le(self, value: int) -> int:
+        """
+        Count values less than or equal to value.
+        """
+        count = 0
+        node = self.root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            else:
+                count += _size(node.left) + 1
+                node = node.right
+        return count
+
+    def select(self, k: int) -> Node:
+        """
+        Find the k-th smallest value (0-based), O(log n) on a balanced tree.
+        select(int(q * len(tree))) answers percentile queries.
+        
+        Returns:
+            Node at position k of the in-order sequence
+            
+        Raises:
+            IndexError: If k is outside [0, len(tree))
+        """
+        if not 0 <= k < len(self):
+            raise IndexError("Rank out of range")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, lo: int, hi: int) -> int:
+        """
+        Count values with lo <= value <= hi without visiting them.
+        
+        Returns:
+            Number of values in the closed range
+        """
+        if hi < lo:
+            return 0
+        return self._rank_le(hi) - self.rank(lo)
+
+    def floor(self, value: int) -> Node | None:
+        """
+        Find the largest value less than or equal to value.
+        
+        Returns:
+            Node with the floor value or None if every value is greater
+        """
+        best = None
+        node = self.root
+        while node is not None:
+            if node.value <= value:
+                best, node = node, node.right
+            else:
+                node = node.left
+        return best
+
+    def ceiling(self, value: int) -> Node | None:
+        """
+        Find the smallest value greater than or equal to value.
+        
+        Returns:
+            Node with the ceiling value or None if every value is smaller
+        """
+        best = None
+        node = self.root
+        while node is not None:
+            if node.value >= value:
+                best, node = node, node.left
+            else:
+                node = node.right
+        return best
+
+    def successor(self, value: int) -> Node | None:
+        """
+        Find the smallest value strictly greater than value.
+        value does not have to be in the tree.
+        
+        Returns:
+            Node with the next value or None if there is none
+        """
+        return next(self._iter_ascending(value, inclusive=False), None)
+
+    def predecessor(self, value: int) -> Node | None:
+        """
+        Find the largest value strictly less than value.
+        value does not have to be in the tree.
+        
+        Returns:
+            Node with the previous value or None if there is none
+        """
+        return next(self._iter_descending(value, inclusive=False), None)
+
+    def _iter_ascending(self, lo: int, inclusive: bool) -> Iterator[Node]:
+        """
+        Lazy in-order walk that starts at lo, skipping every subtree below it.
+        
+        Args:
+            lo: Lower bound
+            inclusive: Whether values equal to lo are included
+        """
+        stack: list[Node] = []
+
+        def push_left(node: Node | None) -> None:
+            while node is not None:
+                if node.value > lo or (inclusive and node.value == lo):
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+
+        push_left(self.root)
+        while stack:
+            node = stack.pop()
+            yield node
+            push_left(node.right)
+
+    def _iter_descending(self, hi: int, inclusive: bool) -> Iterator[Node]:
+        """
+        Lazy reverse in-order walk that starts at hi, skipping every subtree above it.
+        
+        Args:
+            hi: Upper bound
+            inclusive: Whether values equal to hi are included
+        """
+        stack: list[Node] = []
+
+        def push_right(node: Node | None) -> None:
+            while node is not None:
+                if node.value < hi or (inclusive and node.value == hi):
+                    stack.append(node)
+                    node = node.right
+                else:
+                    node = node.left
+
+        push_right(self.root)
+        while stack:
+            node = stack.pop()
+            yield node
+            push_right(node.left)
+
+    def iter_successors(self, value: int) -> Iterator[int]:
+        """
+        Lazily yield values greater than value in ascending order.
+        Costs O(log n) to start and amortized O(1) per value.
+        
+        Yields:
+            Values after value in in-order sequence
+        """
+        for node in self._iter_ascending(value, inclusive=False):
+            yield node.value
+
+    def iter_predecessors(self, value: int) -> Iterator[int]:
+        """
+        Lazily yield values less than value in descending order.
+        Costs O(log n) to start and amortized O(1) per value.
+        
+        Yields:
+            Values before value in reverse in-order sequence
+        """
+        for node in self._iter_descending(value, inclusive=False):
+            yield node.value
+
+    def range(self, lo: int, hi: int, inclusive: bool | tuple[bool, bool] = True) -> Iterator[int]:
+        """
+        Lazily yield values between lo and hi in ascending order.
+        Subtrees outside the bounds are never visited, so the cost is
+        O(log n + k) for k yielded values.
+        
+        Args:
+            lo: Lower bound
+            hi: Upper bound
+            inclusive: Whether the bounds are included, either one flag
+                for both or a (lo_inclusive, hi_inclusive) pair
+        
+        Yields:
+            Values in the range in in-order sequence
+        """
+        lo_inclusive, hi_inclusive = inclusive if isinstance(inclusive, tuple) else (inclusive, inclusive)
+        for node in self._iter_ascending(lo, lo_inclusive):
+            if node.value > hi or (not hi_inclusive and node.value == hi):
+                return
+            yield node.value
 
     def is_empty(self) -> bool:
         """
@@ -184,21 +1025,84 @@ class BinarySearchTree:
     @property
     def height(self) -> int:
         """
-        Calculate the height of the tree.
+        Get the height of the tree.
+        Every node caches the height of its subtree, so this is O(1).
         
         Returns:
             Height of the tree (0 for empty tree)
         """
-        return self._height_recursive(self.root)
+        return _height(self.root)
+
+    def iter_inorder(self) -> Iterator[int]:
+        """
+        Lazy in-order traversal: Left -> Root -> Right
+        Yields values in ascending order, walking the tree with an
+        explicit stack so deep trees cannot overflow the call stack.
+        
+        Yields:
+            Values in in-order sequence
+        """
+        stack: list[Node] = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
 
-    def _height_recursive(self, node: Node | None) -> int:
+    def iter_preorder(self) -> Iterator[int]:
         """
-        Recursively calculate height of a subtree.
+        Lazy pre-order traversal: Root -> Left -> Right
+        
+        Yields:
+            Values in pre-order sequence
         """
-        if node is None:
-            return 0
-        return 1 + max(self._height_recursive(node.left), 
-                       self._height_recursive(node.right))
+        for node in self._iter_nodes_preorder():
+            yield node.value
+
+    def _iter_nodes_preorder(self) -> Iterator[Node]:
+        """
+        Pre-order walk over nodes, a parent always comes before its children.
+        """
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+
+    def iter_postorder(self) -> Iterator[int]:
+        """
+        Lazy post-order traversal: Left -> Right -> Root
+        
+        Yields:
+            Values in post-order sequence
+        """
+        for node in self._iter_nodes_postorder():
+            yield node.value
+
+    def _iter_nodes_postorder(self) -> Iterator[Node]:
+        """
+        Post-order walk over nodes, children always come before their parent.
+        """
+        stack: list[Node] = []
+        node = self.root
+        last_visited = None
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right is not None and top.right is not last_visited:
+                node = top.right
+            else:
+                stack.pop()
+                yield top
+                last_visited = top
 
     def inorder(self) -> list[int]:
         """
@@ -208,18 +1112,7 @@ class BinarySearchTree:
         Returns:
             List of values in in-order sequence
         """
-        result: list[int] = []
-        self._inorder_recursive(self.root, result)
-        return result
-
-    def _inorder_recursive(self, node: Node | None, result: list[int]) -> None:
-        """
-        Recursively perform in-order traversal.
-        """
-        if node:
-            self._inorder_recursive(node.left, result)
-            result.append(node.value)
-            self._inorder_recursive(node.right, result)
+        return list(self.iter_inorder())
 
     def preorder(self) -> list[int]:
         """
@@ -229,18 +1122,7 @@ class BinarySearchTree:
         Returns:
             List of values in pre-order sequence
         """
-        result: list[int] = []
-        self._preorder_recursive(self.root, result)
-        return result
-
-    def _preorder_recursive(self, node: Node | None, result: list[int]) -> None:
-        """
-        Recursively perform pre-order traversal.
-        """
-        if node:
-            result.append(node.value)
-            self._preorder_recursive(node.left, result)
-            self._preorder_recursive(node.right, result)
+        return list(self.iter_preorder())
 
     def postorder(self) -> list[int]:
         """
@@ -250,48 +1132,62 @@ class BinarySearchTree:
         Returns:
             List of values in post-order sequence
         """
-        result: list[int] = []
-        self._postorder_recursive(self.root, result)
-        return result
-
-    def _postorder_recursive(self, node: Node | None, result: list[int]) -> None:
-        """
-        Recursively perform post-order traversal.
-        """
-        if node:
-            self._postorder_recursive(node.left, result)
-            self._postorder_recursive(node.right, result)
-            result.append(node.value)
+        return list(self.iter_postorder())
 
     def clear(self) -> None:
         """
         Clear the entire tree.
         Uses post-order traversal for proper memory management.
+
+        Raises:
+            TypeError: If the tree is a read-only snapshot
         """
+        self._check_writable()
         self.root = None
+        self._min = self._max = None
 
-    def _build_tree_string(self, node: Node | None, prefix: str, is_left: bool) -> str:
+    def render(self, stream: TextIO | None = None, max_depth: int | None = None,
+               max_nodes: int | None = None) -> None:
         """
-        Visual tree representation.
+        Write a visual tree representation line by line, right subtree on top.
+        Iterative, so deep trees do not hit the recursion limit.
 
         Args:
-            node: Current node to process
-            prefix: Prefix string for formatting
-            is_left: Whether the node is a left child
-
-        Returns:
-            String representation of the tree
+            stream: Text stream to write to, sys.stdout by default
+            max_depth: Deepest level to show, the root is level 0; a node
+                with hidden children is marked with their count
+            max_nodes: Maximum number of nodes to show before the
+                remaining ones are replaced by one marker line
         """
-        result = ""
-
-        if node is None:
-            return result
+        if stream is None:
+            stream = sys.stdout
+        if self.root is None:
+            stream.write("Empty tree\n")
+            return
 
-        result += self._build_tree_string(node.right, prefix + ("│   " if is_left else "    "), False)
-        result += prefix + ("└── " if is_left else "┌── ") + str(node.value) + "\n"
-        result += self._build_tree_string(node.left, prefix + ("    " if is_left else "│   "), True)
+        written = hidden = 0
+        # Entries are (node, prefix, is_left, depth, expanded)
+        stack: list[tuple[Node, str, bool, int, bool]] = [(self.root, "", True, 0, False)]
+        while stack:
+            node, prefix, is_left, depth, expanded = stack.pop()
+            if not expanded:
+                shown = max_depth is None or depth < max_depth
+                if shown and node.left is not None:
+                    stack.append((node.left, prefix + ("    " if is_left else "│   "), True, depth + 1, False))
+                stack.append((node, prefix, is_left, depth, True))
+                if shown and node.right is not None:
+                    stack.append((node.right, prefix + ("│   " if is_left else "    "), False, depth + 1, False))
+                continue
 
-        return result
+            if max_nodes is not None and written >= max_nodes:
+                stream.write(f"... {len(self) - written - hidden} more nodes\n")
+                return
+            line = prefix + ("└── " if is_left else "┌── ") + str(node.value)
+            if max_depth is not None and depth >= max_depth and node.size > 1:
+                line += f" (+{node.size - 1} hidden)"
+                hidden += node.size - 1
+            stream.write(line + "\n")
+            written += 1
 
     def __contains__(self, value) -> bool:
         """
@@ -313,5 +1209,21 @@ class BinarySearchTree:
         """
         if self.is_empty():
             return "Empty tree"
-        return self._build_tree_string(self.root, "", True)
+        buffer = io.StringIO()
+        self.render(buffer, max_nodes=self.STR_MAX_NODES)
+        return buffer.getvalue()
 
+    def __len__(self) -> int:
+        """
+        Number of values in the tree, read from the root's cached size.
+        """
+        return _size(self.root)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Iterate over values in ascending order.
+
+        Yields:
+            Values in in-order sequence
+        """
+        return self.iter_inorder()
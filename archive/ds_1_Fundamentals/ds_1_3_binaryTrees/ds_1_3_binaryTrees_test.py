@@ -1,7 +1,39 @@
+import io
+import math
+import random
+
 import pytest
 from ds_1_3_binaryTrees import BinarySearchTree, Node 
 
 
+def check_invariants(node, balance):
+    """
+    Проверяет порядок, высоты и свойства балансировки поддерева.
+    Возвращает высоту и черную высоту поддерева.
+    """
+    if node is None:
+        return 0, 1
+    left_height, left_black = check_invariants(node.left, balance)
+    right_height, right_black = check_invariants(node.right, balance)
+
+    if node.left is not None:
+        assert node.left.value <= node.value
+    if node.right is not None:
+        assert node.right.value >= node.value
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.size == 1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+
+    if balance == "avl":
+        assert abs(left_height - right_height) <= 1
+    if balance == "rb":
+        assert left_black == right_black
+        if node.red:
+            assert not (node.left and node.left.red)
+            assert not (node.right and node.right.red)
+
+    return node.height, left_black + (0 if node.red else 1)
+
+
 class TestBST:
     """
     Класс тестирования бинарного дерева поиска.
@@ -149,3 +181,470 @@ class TestBST:
         assert bst.max is None
         assert bst.search(1) is None
 
+
+    def test_lazy_traversals(self):
+        """
+        Тест ленивых обходов дерева.
+        """
+        bst = BinarySearchTree()
+        bst.insert_from_iterable((7, 5, 8, 4, 6, 9, 3))
+
+        assert list(bst.iter_inorder()) == bst.inorder() == [3, 4, 5, 6, 7, 8, 9]
+        assert list(bst.iter_preorder()) == [7, 5, 4, 3, 6, 8, 9]
+        assert list(bst.iter_postorder()) == [3, 4, 6, 5, 9, 8, 7]
+        assert list(bst) == [3, 4, 5, 6, 7, 8, 9]
+
+        inorder = bst.iter_inorder()
+        assert next(inorder) == 3
+        assert next(inorder) == 4
+
+    def test_deep_tree_without_recursion(self):
+        """
+        Тест вырожденного дерева глубже лимита рекурсии.
+        """
+        bst = BinarySearchTree()
+        n = 2000
+
+        bst.insert_from_iterable(range(n))
+
+        assert bst.height == n
+        assert n - 1 in bst
+        assert bst.max.value == n - 1
+        assert bst.inorder() == list(range(n))
+        assert len(bst.preorder()) == len(bst.postorder()) == n
+
+        bst.delete(n - 1)
+        assert bst.height == n - 1
+
+@pytest.mark.parametrize("balance", ["avl", "rb"])
+class TestBalancedBST:
+    """
+    Класс тестирования самобалансирующихся деревьев.
+    """
+
+    def test_sorted_input_stays_logarithmic(self, balance):
+        """
+        Отсортированные данные не вырождают дерево в список.
+        """
+        bst = BinarySearchTree(balance=balance)
+        n = 5000
+
+        bst.insert_from_iterable(range(n))
+
+        assert bst.height <= 2 * math.log2(n + 1)
+        assert bst.inorder() == list(range(n))
+        check_invariants(bst.root, balance)
+        if balance == "rb":
+            assert not bst.root.red
+
+    def test_random_insert_and_delete(self, balance):
+        """
+        Случайные вставки и удаления сохраняют свойства дерева.
+        """
+        rng = random.Random(0)
+        bst = BinarySearchTree(balance=balance)
+        values = []
+
+        for _ in range(2000):
+            if values and rng.random() < 0.4:
+                value = rng.choice(values)
+                values.remove(value)
+                bst.delete(value)
+            else:
+                value = rng.randint(0, 300)
+                values.append(value)
+                bst.insert(value)
+            check_invariants(bst.root, balance)
+            assert len(bst) == len(values)
+            if values:
+                assert bst.min.value == min(values)
+                assert bst.max.value == max(values)
+
+        assert bst.inorder() == sorted(values)
+
+    def test_same_public_api(self, balance):
+        """
+        Сбалансированное дерево поддерживает те же операции.
+        """
+        bst = BinarySearchTree(balance=balance)
+        bst.insert_from_iterable([1, 3, 7, 8, 4, 2, 7, 8])
+
+        bst.delete(8)
+        assert 8 in bst
+        bst.delete(8)
+        assert 8 not in bst
+
+        assert bst.min.value == 1
+        assert bst.max.value == 7
+        assert bst.search(4).value == 4
+
+        bst.delete(100)
+        bst.clear()
+        assert bst.is_empty()
+
+
+class TestBulkOperations:
+    """
+    Класс тестирования массового построения и слияния деревьев.
+    """
+
+    @pytest.mark.parametrize("balance", [None, "avl", "rb"])
+    def test_from_sorted(self, balance):
+        """
+        Построение идеально сбалансированного дерева.
+        """
+        for n in range(50):
+            bst = BinarySearchTree.from_sorted(list(range(n)), balance=balance)
+
+            assert bst.inorder() == list(range(n))
+            assert bst.height == n.bit_length()
+            assert bst.balance == balance
+            check_invariants(bst.root, balance)
+
+        # После построения дерево остается рабочим
+        bst.insert(100)
+        bst.delete(0)
+        check_invariants(bst.root, balance)
+        assert bst.min.value == 1
+
+    def test_from_sorted_rejects_unsorted(self):
+        """
+        Неотсортированные данные вызывают ошибку.
+        """
+        with pytest.raises(ValueError, match="sorted"):
+            BinarySearchTree.from_sorted([3, 1, 2])
+
+    def test_from_iterable(self):
+        """
+        Построение из неотсортированных данных.
+        """
+        values = [5, 1, 9, 3, 3, 7]
+        bst = BinarySearchTree.from_iterable(values, balance="avl")
+
+        assert bst.inorder() == sorted(values)
+        assert bst.height == 3
+
+    def test_set_operations(self):
+        """
+        Объединение, пересечение и разность деревьев.
+        """
+        first = BinarySearchTree.from_iterable([1, 2, 2, 3, 5, 8])
+        second = BinarySearchTree.from_iterable([2, 3, 4, 8, 9])
+
+        assert first.union(second).inorder() == [1, 2, 3, 4, 5, 8, 9]
+        assert first.intersection(second).inorder() == [2, 3, 8]
+        assert first.difference(second).inorder() == [1, 5]
+        assert second.difference(first).inorder() == [4, 9]
+        assert first.union(BinarySearchTree()).inorder() == [1, 2, 3, 5, 8]
+        assert first.intersection(BinarySearchTree()).is_empty()
+
+
+class TestOrderStatistics:
+    """
+    Класс тестирования порядковых статистик.
+    """
+
+    @pytest.mark.parametrize("balance", [None, "avl", "rb"])
+    def test_rank_and_select(self, balance):
+        """
+        Ранг значения и k-я порядковая статистика.
+        """
+        values = [50, 20, 80, 20, 10, 90, 60, 30]
+        bst = BinarySearchTree(balance=balance)
+        bst.insert_from_iterable(values)
+        ordered = sorted(values)
+
+        assert len(bst) == 8
+        for k, value in enumerate(ordered):
+            assert bst.select(k).value == value
+        assert bst.rank(20) == 1
+        assert bst.rank(21) == 3
+        assert bst.rank(5) == 0
+        assert bst.rank(100) == 8
+
+        with pytest.raises(IndexError):
+            bst.select(8)
+        with pytest.raises(IndexError):
+            bst.select(-1)
+
+    def test_count_range(self):
+        """
+        Подсчет значений в диапазоне.
+        """
+        bst = BinarySearchTree.from_iterable([1, 3, 3, 5, 7, 9])
+
+        assert bst.count_range(3, 7) == 4
+        assert bst.count_range(4, 4) == 0
+        assert bst.count_range(0, 100) == 6
+        assert bst.count_range(7, 3) == 0
+
+    def test_len_and_extremes_after_updates(self):
+        """
+        Размер и кэшированные min/max после вставок и удалений.
+        """
+        bst = BinarySearchTree()
+        assert len(bst) == 0
+
+        bst.insert_from_iterable([5, 3, 8, 1, 9])
+        bst.delete(1)
+        bst.delete(9)
+        assert len(bst) == 3
+        assert bst.min.value == 3
+        assert bst.max.value == 8
+
+        bst.clear()
+        assert len(bst) == 0
+        assert bst.min is None
+
+
+class TestRangeQueries:
+    """
+    Класс тестирования диапазонных запросов.
+    """
+
+    def setup_method(self):
+        """
+        Дерево со значениями 0, 10, ..., 90.
+        """
+        self.bst = BinarySearchTree.from_iterable(range(0, 100, 10), balance="rb")
+
+    def test_range(self):
+        """
+        Значения в диапазоне с разными границами.
+        """
+        assert list(self.bst.range(20, 50)) == [20, 30, 40, 50]
+        assert list(self.bst.range(20, 50, inclusive=False)) == [30, 40]
+        assert list(self.bst.range(20, 50, inclusive=(True, False))) == [20, 30, 40]
+        assert list(self.bst.range(15, 25)) == [20]
+        assert list(self.bst.range(91, 200)) == []
+        assert list(self.bst.range(-5, 5)) == [0]
+
+    def test_range_is_lazy(self):
+        """
+        Диапазон возвращает генератор.
+        """
+        values = self.bst.range(0, 90)
+        assert next(values) == 0
+        assert next(values) == 10
+
+    def test_floor_and_ceiling(self):
+        """
+        Ближайшие значения снизу и сверху.
+        """
+        assert self.bst.floor(35).value == 30
+        assert self.bst.floor(30).value == 30
+        assert self.bst.floor(-1) is None
+        assert self.bst.ceiling(35).value == 40
+        assert self.bst.ceiling(40).value == 40
+        assert self.bst.ceiling(91) is None
+
+    def test_successor_and_predecessor(self):
+        """
+        Следующее и предыдущее значения.
+        """
+        assert self.bst.successor(30).value == 40
+        assert self.bst.successor(35).value == 40
+        assert self.bst.successor(90) is None
+        assert self.bst.predecessor(30).value == 20
+        assert self.bst.predecessor(0) is None
+
+        assert list(self.bst.iter_successors(60)) == [70, 80, 90]
+        assert list(self.bst.iter_predecessors(30)) == [20, 10, 0]
+
+    def test_duplicates(self):
+        """
+        Повторяющиеся значения в диапазоне.
+        """
+        bst = BinarySearchTree(balance="avl")
+        bst.insert_from_iterable([5, 5, 5, 3, 7, 5])
+
+        assert list(bst.range(5, 5)) == [5, 5, 5, 5]
+        assert bst.successor(5).value == 7
+        assert bst.predecessor(5).value == 3
+
+
+def test_unknown_balance_mode():
+    """
+    Неизвестная стратегия балансировки вызывает ошибку.
+    """
+    with pytest.raises(ValueError, match="Unknown balance mode"):
+        BinarySearchTree(balance="splay")
+
+
+
+@pytest.mark.parametrize("balance", [None, "avl"])
+class TestPersistentBST:
+    """
+    Класс тестирования персистентного дерева и снимков.
+    """
+
+    def test_old_versions_stay_intact(self, balance):
+        """
+        Снимки и старые корни не меняются после новых вставок и удалений.
+        """
+        rng = random.Random(7)
+        bst = BinarySearchTree(balance=balance, persistent=True)
+        expected = []
+        versions = []
+        for _ in range(500):
+            value = rng.randrange(60)
+            if rng.random() < 0.6:
+                bst.insert(value)
+                expected.append(value)
+            else:
+                bst.delete(value)
+                if value in expected:
+                    expected.remove(value)
+            versions.append((bst.snapshot(), sorted(expected)))
+
+        for snapshot, values in versions:
+            assert snapshot.inorder() == values
+            assert len(snapshot) == len(values)
+            if values:
+                assert snapshot.min.value == values[0]
+                assert snapshot.max.value == values[-1]
+            check_invariants(snapshot.root, balance)
+
+    def test_insert_returns_new_root_sharing_subtrees(self, balance):
+        """
+        Вставка копирует только путь от корня, остальные узлы общие.
+        """
+        bst = BinarySearchTree(balance=balance, persistent=True)
+        bst.insert_from_iterable([50, 25, 75, 10, 30, 60, 90])
+        old_root = bst.root
+
+        new_root = bst.insert(95)
+
+        assert new_root is bst.root and new_root is not old_root
+        assert new_root.left is old_root.left
+        assert old_root.size == 7 and new_root.size == 8
+
+    def test_snapshot_is_read_only(self, balance):
+        """
+        Снимок нельзя изменить.
+        """
+        bst = BinarySearchTree(balance=balance, persistent=True)
+        bst.insert(1)
+        snapshot = bst.snapshot()
+
+        with pytest.raises(TypeError):
+            snapshot.insert(2)
+        with pytest.raises(TypeError):
+            snapshot.delete(1)
+        with pytest.raises(TypeError):
+            snapshot.clear()
+
+        bst.clear()
+        assert snapshot.inorder() == [1]
+
+
+def test_persistent_mode_restrictions():
+    """
+    Персистентное красно-черное дерево и снимки обычного дерева недоступны.
+    """
+    with pytest.raises(ValueError):
+        BinarySearchTree(balance="rb", persistent=True)
+    with pytest.raises(ValueError):
+        BinarySearchTree().snapshot()
+
+
+class TestSerialization:
+    """
+    Класс тестирования сериализации дерева.
+    """
+
+    @pytest.mark.parametrize("balance", [None, "avl", "rb"])
+    def test_round_trip_keeps_shape(self, balance):
+        """
+        Загрузка восстанавливает ту же форму, цвета и кэшированные данные.
+        """
+        rng = random.Random(3)
+        bst = BinarySearchTree(balance=balance)
+        bst.insert_from_iterable(rng.randrange(1000) for _ in range(500))
+
+        loaded = BinarySearchTree.from_bytes(bst.to_bytes())
+
+        assert loaded.balance == balance
+        assert loaded.preorder() == bst.preorder()
+        assert loaded.height == bst.height and len(loaded) == len(bst)
+        assert loaded.min.value == bst.min.value and loaded.max.value == bst.max.value
+        check_invariants(loaded.root, balance)
+        loaded.insert(-1)
+        check_invariants(loaded.root, balance)
+
+    @pytest.mark.parametrize("values", [[], [2.5, -1.0, 7.25], ["b", "a", "c"], [2 ** 70, 1]])
+    def test_value_types(self, values):
+        """
+        Целые, вещественные и произвольные значения.
+        """
+        bst = BinarySearchTree(balance="avl")
+        bst.insert_from_iterable(values)
+
+        loaded = BinarySearchTree.from_bytes(bst.to_bytes())
+
+        assert loaded.inorder() == sorted(values)
+        assert all(type(a) is type(b) for a, b in zip(loaded.inorder(), sorted(values)))
+
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_file_round_trip(self, tmp_path, use_mmap):
+        """
+        Сохранение в файл и загрузка с отображением в память.
+        """
+        bst = BinarySearchTree.from_sorted(range(1000), balance="rb")
+        path = tmp_path / "tree.bin"
+        bst.to_file(path)
+
+        loaded = BinarySearchTree.from_file(path, use_mmap=use_mmap)
+
+        assert loaded.preorder() == bst.preorder()
+        check_invariants(loaded.root, "rb")
+
+    def test_rejects_foreign_data(self):
+        """
+        Чужие данные вызывают ошибку.
+        """
+        with pytest.raises(ValueError):
+            BinarySearchTree.from_bytes(b"NOPE" + bytes(12))
+
+
+class TestRendering:
+    """
+    Класс тестирования вывода дерева.
+    """
+
+    def test_full_render(self):
+        """
+        Полный вывод: правое поддерево сверху, левое снизу.
+        """
+        bst = BinarySearchTree()
+        bst.insert_from_iterable([2, 1, 3])
+
+        assert str(bst) == "│   ┌── 3\n└── 2\n    └── 1\n"
+        assert str(BinarySearchTree()) == "Empty tree"
+
+    def test_limits_mark_hidden_nodes(self):
+        """
+        Ограничения глубины и числа узлов заменяются маркерами.
+        """
+        bst = BinarySearchTree.from_sorted(range(15))
+        stream = io.StringIO()
+        bst.render(stream, max_depth=1)
+        assert stream.getvalue() == "│   ┌── 11 (+6 hidden)\n└── 7\n    └── 3 (+6 hidden)\n"
+
+        stream = io.StringIO()
+        bst.render(stream, max_nodes=4)
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 5
+        assert lines[-1] == "... 11 more nodes"
+
+    def test_deep_tree_str(self):
+        """
+        Вырожденное дерево выводится без рекурсии и с ограничением.
+        """
+        bst = BinarySearchTree()
+        bst.insert_from_iterable(range(5000))
+
+        lines = str(bst).splitlines()
+
+        assert len(lines) == BinarySearchTree.STR_MAX_NODES + 1
+        assert lines[-1] == f"... {5000 - BinarySearchTree.STR_MAX_NODES} more nodes"
@@ -0,0 +1,165 @@
+from typing import Iterable, Iterator, Sequence
+
+from ds_1_3_binaryTrees import BinarySearchTree, Node
+
+Interval = tuple[int, int]
+
+
+class IntervalNode(Node):
+    """
+    Node of an interval tree, its value is a (start, end) pair.
+
+    Attributes:
+        max_end (int): largest end of an interval in the subtree
+    """
+    __slots__ = ("max_end",)
+
+    def __init__(self, value: Interval) -> None:
+        """
+        Initialize node.
+        """
+        super().__init__(value)
+        self.max_end = value[1]
+
+    def __repr__(self) -> str:
+        """
+        Representation of the node.
+        """
+        return f"IntervalNode({self.value}, max_end={self.max_end})"
+
+
+class IntervalTree(BinarySearchTree):
+    """
+    Balanced search tree of closed intervals ordered by start, then end.
+
+    Every node caches the largest end in its subtree, so overlap queries
+    skip any subtree whose intervals all end before the query starts and
+    stop once intervals start after the query ends.
+    """
+    NODE_CLASS = IntervalNode
+
+    def __init__(self, balance: str | None = "avl", persistent: bool = False) -> None:
+        """
+        Initialize interval tree.
+
+        Args:
+            balance: Balancing strategy, AVL by default
+            persistent: Copy nodes on write, see BinarySearchTree
+        """
+        super().__init__(balance, persistent)
+
+    @staticmethod
+    def _check_interval(interval: Interval) -> None:
+        """
+        Validate an interval.
+
+        Raises:
+            ValueError: If interval is not a (start, end) pair with start <= end
+        """
+        if len(interval) != 2 or interval[0] > interval[1]:
+            raise ValueError(f"Invalid interval: {interval!r}")
+
+    def _update(self, node: IntervalNode) -> None:
+        """
+        Recompute cached height, size and maximum end of a node.
+        """
+        super()._update(node)
+        max_end = node.value[1]
+        if node.left is not None and node.left.max_end > max_end:
+            max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+    def insert(self, interval: Interval) -> IntervalNode:
+        """
+        Insert a (start, end) interval into the tree.
+
+        Returns:
+            Root of the tree after the insertion
+
+        Raises:
+            ValueError: If the interval is invalid
+        """
+        self._check_interval(interval)
+        return super().insert(tuple(interval))
+
+    @classmethod
+    def from_sorted(cls, values: Sequence[Interval], balance: str | None = "avl") -> "IntervalTree":
+        """
+        Build a balanced tree from intervals sorted by start, then end, in O(n).
+
+        Args:
+            values: Intervals in ascending order
+            balance: Balancing strategy of the new tree
+
+        Returns:
+            New tree holding the intervals
+
+        Raises:
+            ValueError: If an interval is invalid or values are not sorted
+        """
+        values = [tuple(interval) for interval in values]
+        for interval in values:
+            cls._check_interval(interval)
+        return super().from_sorted(values, balance=balance)
+
+    @classmethod
+    def from_iterable(cls, values: Iterable[Interval], balance: str | None = "avl") -> "IntervalTree":
+        """
+        Build a balanced tree from intervals in any order.
+
+        Args:
+            values: Intervals to insert
+            balance: Balancing strategy of the new tree
+
+        Returns:
+            New tree holding the intervals
+        """
+        return cls.from_sorted(sorted(tuple(interval) for interval in values), balance=balance)
+
+    def overlap(self, start: int, end: int) -> Iterator[Interval]:
+        """
+        Lazily yield intervals that share at least one point with [start, end].
+
+        Args:
+            start: Start of the query interval
+            end: End of the query interval
+
+        Yields:
+            Overlapping intervals in ascending order
+        """
+        stack: list[IntervalNode] = []
+        node = self.root
+        while True:
+            while node is not None and node.max_end >= start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            low, high = node.value
+            if low > end:
+                return
+            if high >= start:
+                yield node.value
+            node = node.right
+
+    def stab(self, point: int) -> Iterator[Interval]:
+        """
+        Lazily yield intervals that contain the point.
+
+        Yields:
+            Intervals with start <= point <= end in ascending order
+        """
+        return self.overlap(point, point)
+
+    @property
+    def max_end(self) -> int | None:
+        """
+        Largest end of an interval in the tree.
+
+        Returns:
+            Maximum end or None if tree is empty
+        """
+        return self.root.max_end if self.root is not None else None
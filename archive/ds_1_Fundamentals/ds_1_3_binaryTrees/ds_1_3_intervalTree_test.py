@@ -0,0 +1,104 @@
+import random
+
+import pytest
+from ds_1_3_intervalTree import IntervalTree
+
+
+def check_max_end(node):
+    """
+    Проверяет кэшированный максимальный конец во всех поддеревьях.
+    """
+    if node is None:
+        return float("-inf")
+    expected = max(node.value[1], check_max_end(node.left), check_max_end(node.right))
+    assert node.max_end == expected
+    return expected
+
+
+def random_intervals(rng, count):
+    """
+    Случайные интервалы на отрезке [0, 1000].
+    """
+    intervals = []
+    for _ in range(count):
+        start = rng.randrange(1000)
+        intervals.append((start, start + rng.randrange(50)))
+    return intervals
+
+
+class TestIntervalTree:
+    """
+    Класс тестирования дерева интервалов.
+    """
+
+    def test_stab_and_overlap(self):
+        """
+        Запросы точки и пересечения на небольшом примере.
+        """
+        tree = IntervalTree()
+        tree.insert_from_iterable([(1, 5), (3, 8), (10, 12), (6, 6), (0, 20)])
+
+        assert list(tree.stab(6)) == [(0, 20), (3, 8), (6, 6)]
+        assert list(tree.stab(9)) == [(0, 20)]
+        assert list(tree.overlap(8, 10)) == [(0, 20), (3, 8), (10, 12)]
+        assert list(tree.stab(21)) == []
+        assert tree.max_end == 20
+
+    @pytest.mark.parametrize("balance", [None, "avl", "rb"])
+    def test_matches_linear_scan(self, balance):
+        """
+        Результаты совпадают с полным перебором после вставок и удалений.
+        """
+        rng = random.Random(5)
+        intervals = random_intervals(rng, 400)
+        tree = IntervalTree(balance=balance)
+        tree.insert_from_iterable(intervals)
+        for interval in intervals[::3]:
+            tree.delete(interval)
+            intervals.remove(interval)
+
+        check_max_end(tree.root)
+        for _ in range(200):
+            start = rng.randrange(1050)
+            end = start + rng.randrange(30)
+            expected = sorted(i for i in intervals if i[0] <= end and i[1] >= start)
+            assert list(tree.overlap(start, end)) == expected
+
+    def test_from_sorted(self):
+        """
+        Построение из отсортированных интервалов.
+        """
+        rng = random.Random(9)
+        intervals = sorted(random_intervals(rng, 1000))
+
+        tree = IntervalTree.from_sorted(intervals)
+
+        check_max_end(tree.root)
+        assert tree.balance == "avl"
+        assert tree.inorder() == intervals
+        assert list(tree.stab(500)) == [i for i in intervals if i[0] <= 500 <= i[1]]
+
+    def test_persistent_snapshot(self):
+        """
+        Снимок персистентного дерева сохраняет старые интервалы.
+        """
+        tree = IntervalTree(persistent=True)
+        tree.insert_from_iterable([(1, 3), (2, 9), (5, 6)])
+        snapshot = tree.snapshot()
+
+        tree.delete((2, 9))
+        tree.insert((4, 4))
+
+        check_max_end(tree.root)
+        check_max_end(snapshot.root)
+        assert list(snapshot.stab(4)) == [(2, 9)]
+        assert list(tree.stab(4)) == [(4, 4)]
+
+    def test_invalid_interval(self):
+        """
+        Интервал с началом больше конца вызывает ошибку.
+        """
+        with pytest.raises(ValueError):
+            IntervalTree().insert((5, 1))
+        with pytest.raises(ValueError):
+            IntervalTree.from_sorted([(1, 2), (3, 0)])
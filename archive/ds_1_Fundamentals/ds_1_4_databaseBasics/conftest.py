@@ -0,0 +1,26 @@
+import pytest
+from ds_1_4_databases import DatabaseManager
+
+
+@pytest.fixture
+def make_manager():
+    """
+    Создает DatabaseManager с таблицами и тестовыми данными, закрывает их после теста.
+    """
+    managers = []
+
+    def make(db_name=":memory:", **options):
+        manager = DatabaseManager(db_name, **options)
+        managers.append(manager)
+        manager.create_tables()
+        manager.insert_sample_data()
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def db(make_manager):
+    return make_manager()
@@ -0,0 +1,224 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterable, Sequence
+
+from ds_1_4_databases import DatabaseManager, iter_rows
+
+# Marks the end of a streamed result
+_DONE = object()
+# Transaction open in the current task, which nested writes join instead of waiting for the write lock
+_transaction: ContextVar["AsyncTransaction | None"] = ContextVar("transaction", default=None)
+
+
+class _Running:
+    """Connection a worker thread is using, so a cancelled caller can interrupt it"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.conn: sqlite3.Connection | None = None
+
+    def attach(self, conn: sqlite3.Connection | None) -> None:
+        with self.lock:
+            self.conn = conn
+
+    def interrupt(self) -> None:
+        """Abort the running statement, if the connection is still in use"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.interrupt()
+
+
+class AsyncTransaction:
+    """Statements of one write transaction, run in order on the writer thread"""
+
+    def __init__(self, db: "AsyncDatabaseManager", conn: sqlite3.Connection) -> None:
+        self._db = db
+        self._conn = conn
+
+    async def execute(self, query: str, params: Sequence[Any] | dict = ()) -> list[tuple]:
+        """Execute one statement inside the transaction and return its rows"""
+        return await self._db._call(self._db._writer, lambda conn: conn.execute(query, params).fetchall(),
+                                    self._conn)
+
+    async def executemany(self, query: str, seq_of_params: Iterable[Sequence[Any] | dict]) -> int:
+        """Execute a statement for every parameter set inside the transaction"""
+        return await self._db._call(self._db._writer, lambda conn: conn.executemany(query, seq_of_params).rowcount,
+                                    self._conn)
+
+
+class AsyncDatabaseManager:
+    """Asyncio front end for DatabaseManager
+
+    Reads run on a thread pool sized like the reader pool, writes run on
+    one writer thread and are serialized with an asyncio lock, so the
+    event loop never waits for SQLite. Writes made inside transaction()
+    join it, like nested pool.writer() blocks. A cancelled call
+    interrupts its statement. At most max_pending calls are queued at
+    once, and a streamed query prefetches at most `prefetch` batches
+    ahead of the consumer.
+    """
+
+    def __init__(self, db_name: str, pool_size: int = 4, max_pending: int = 64, prefetch: int = 2) -> None:
+        if max_pending < 1 or prefetch < 1:
+            raise ValueError("max_pending and prefetch must be positive")
+        self.manager = DatabaseManager(db_name, pool_size)
+        self.pool = self.manager.pool
+        self.prefetch = prefetch
+        self._readers = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._pending = asyncio.Semaphore(max_pending)
+        self._write_lock = asyncio.Lock()
+
+    async def _call(self, executor: ThreadPoolExecutor, func: Callable[[sqlite3.Connection], Any],
+                    conn: sqlite3.Connection | None = None) -> Any:
+        """Run func with a pooled (or the given) connection on an executor thread"""
+        running = _Running()
+
+        def work() -> Any:
+            if conn is not None:
+                running.attach(conn)
+                try:
+                    return func(conn)
+                finally:
+                    running.attach(None)
+            borrow = self.pool.reader if executor is self._readers else self.pool.writer
+            with borrow() as borrowed:
+                running.attach(borrowed)
+                try:
+                    return func(borrowed)
+                finally:
+                    running.attach(None)
+
+        async with self._pending:
+            future = asyncio.get_running_loop().run_in_executor(executor, work)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                running.interrupt()
+                raise
+
+    async def execute_query(self, query: str, params: Sequence[Any] | dict = ()) -> list[dict]:
+        """Execute SQL query and return results as dictionaries"""
+        return await self._call(self._readers, lambda conn: list(iter_rows(conn, query, params, row_format="dict")))
+
+    async def iter_query(self, query: str, params: Sequence[Any] | dict = (),
+                         batch_size: int = 1000, row_format: str = "dict") -> AsyncIterator[Any]:
+        """Execute SQL query and yield rows lazily as a producer thread fetches them"""
+        loop = asyncio.get_running_loop()
+        batches: asyncio.Queue = asyncio.Queue()
+        free_slots = threading.Semaphore(self.prefetch)
+        stop = threading.Event()
+        running = _Running()
+
+        def produce() -> None:
+            try:
+                with self.pool.reader() as conn:
+                    running.attach(conn)
+                    try:
+                        rows = iter_rows(conn, query, params, batch_size, row_format)
+                        batch: list = []
+                        for row in rows:
+                            batch.append(row)
+                            if len(batch) == batch_size:
+                                if not send(batch):
+                                    return
+                                batch = []
+                        if batch and not send(batch):
+                            return
+                    finally:
+                        running.attach(None)
+                loop.call_soon_threadsafe(batches.put_nowait, _DONE)
+            except BaseException as error:
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(batches.put_nowait, error)
+
+        def send(batch: list) -> bool:
+            # Wait for the consumer to free a slot, giving up once it has gone away
+            while not free_slots.acquire(timeout=0.05):
+                if stop.is_set():
+                    return False
+            loop.call_soon_threadsafe(batches.put_nowait, batch)
+            return not stop.is_set()
+
+        async with self._pending:
+            producer = loop.run_in_executor(self._readers, produce)
+            try:
+                while True:
+                    batch = await batches.get()
+                    if batch is _DONE:
+                        break
+                    if isinstance(batch, BaseException):
+                        raise batch
+                    for row in batch:
+                        yield row
+                    free_slots.release()
+            finally:
+                stop.set()
+                running.interrupt()
+                await asyncio.shield(producer)
+
+    async def executemany(self, query: str, seq_of_params: Iterable[Sequence[Any] | dict]) -> int:
+        """Execute a statement for every parameter set in its own transaction, or in the open one"""
+        transaction = self._open_transaction()
+        if transaction is not None:
+            return await transaction.executemany(query, seq_of_params)
+        async with self._write_lock:
+            return await self._call(self._writer, lambda conn: conn.executemany(query, seq_of_params).rowcount)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncTransaction]:
+        """Open a write transaction, committed on success and rolled back on error
+
+        Inside an open transaction of the same task the outer one is yielded
+        and the outermost block decides between commit and rollback.
+        """
+        transaction = self._open_transaction()
+        if transaction is not None:
+            yield transaction
+            return
+        async with self._write_lock:
+            loop = asyncio.get_running_loop()
+            writer = self.pool.writer()
+            conn = await loop.run_in_executor(self._writer, writer.__enter__)
+            try:
+                token = _transaction.set(AsyncTransaction(self, conn))
+                try:
+                    yield _transaction.get()
+                finally:
+                    _transaction.reset(token)
+            except BaseException as error:
+                await asyncio.shield(loop.run_in_executor(
+                    self._writer, _suppress_exit, writer, type(error), error, error.__traceback__))
+                raise
+            else:
+                await loop.run_in_executor(self._writer, writer.__exit__, None, None, None)
+
+    def _open_transaction(self) -> AsyncTransaction | None:
+        """This manager's transaction open in the current task, if any"""
+        transaction = _transaction.get()
+        return transaction if transaction is not None and transaction._db is self else None
+
+    async def close(self) -> None:
+        """Wait for running calls and close all pooled connections"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._readers.shutdown)
+        await loop.run_in_executor(None, self._writer.shutdown)
+        self.manager.close()
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+def _suppress_exit(writer: Any, *exc_info: Any) -> None:
+    """Roll back a writer block without re-raising its error on the worker thread"""
+    try:
+        writer.__exit__(*exc_info)
+    except BaseException:
+        pass
@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import pytest
+from ds_1_4_asyncDatabases import AsyncDatabaseManager
+
+SLOW_QUERY = """
+    WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 3000000)
+    SELECT SUM(n) AS total FROM seq
+"""
+
+
+def run(coroutine_function, tmp_path):
+    """
+    Запускает тест с асинхронным менеджером над файловой базой.
+    """
+    async def main():
+        async with AsyncDatabaseManager(str(tmp_path / "async.db"), pool_size=2) as db:
+            db.manager.create_tables()
+            db.manager.insert_sample_data()
+            return await coroutine_function(db)
+    return asyncio.run(main())
+
+
+class TestAsyncDatabaseManager:
+    """
+    Класс тестирования асинхронного интерфейса к базе данных.
+    """
+
+    def test_execute_query(self, tmp_path):
+        """
+        Результат совпадает с синхронным execute_query.
+        """
+        async def check(db):
+            rows = await db.execute_query("SELECT name FROM users WHERE age < ? ORDER BY name", (20,))
+            assert rows == [{"name": "Alice"}, {"name": "Morty"}]
+        run(check, tmp_path)
+
+    def test_async_iteration(self, tmp_path):
+        """
+        Асинхронная итерация по строкам, включая досрочный выход.
+        """
+        async def check(db):
+            rows = [row async for row in db.iter_query("SELECT user_id FROM users ORDER BY user_id",
+                                                         batch_size=2, row_format="tuple")]
+            assert rows == [(1,), (2,), (3,), (4,), (5,), (6,)]
+
+            query = "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq) SELECT n FROM seq"
+            stream = db.iter_query(query, batch_size=100, row_format="tuple")
+            async for (n,) in stream:
+                if n == 250:
+                    break
+            await stream.aclose()
+            assert await db.execute_query("SELECT COUNT(*) AS n FROM users") == [{"n": 6}]
+        run(check, tmp_path)
+
+    def test_executemany_and_transactions(self, tmp_path):
+        """
+        Пакетная вставка, фиксация и откат транзакции.
+        """
+        async def check(db):
+            inserted = await db.executemany("INSERT INTO products VALUES (?, ?, ?, ?)",
+                                            [(201, "Pen", 1.5, "Office"), (202, "Ink", 3.0, "Office")])
+            assert inserted == 2
+
+            async with db.transaction() as tx:
+                await tx.execute("DELETE FROM products WHERE product_id = ?", (201,))
+            with pytest.raises(RuntimeError):
+                async with db.transaction() as tx:
+                    await tx.execute("DELETE FROM products WHERE product_id = ?", (202,))
+                    raise RuntimeError
+
+            rows = await db.execute_query("SELECT product_id FROM products WHERE category = 'Office'")
+            assert rows == [{"product_id": 202}]
+        run(check, tmp_path)
+
+    def test_writes_inside_transaction_join_it(self, tmp_path):
+        """
+        executemany и вложенная транзакция внутри transaction() не ждут блокировку записи,
+        а входят в открытую транзакцию и откатываются вместе с ней.
+        """
+        async def check(db):
+            async def nested_writes():
+                async with db.transaction() as tx:
+                    await tx.execute("DELETE FROM products WHERE product_id = ?", (101,))
+                    assert await db.executemany("INSERT INTO products VALUES (?, ?, ?, ?)",
+                                                [(201, "Pen", 1.5, "Office")]) == 1
+                    async with db.transaction() as inner:
+                        assert inner is tx
+                        await inner.execute("DELETE FROM products WHERE product_id = ?", (201,))
+                    raise RuntimeError
+
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(nested_writes(), timeout=5)
+            rows = await db.execute_query("SELECT COUNT(*) AS n FROM products WHERE product_id IN (101, 201)")
+            assert rows == [{"n": 1}]
+        run(check, tmp_path)
+
+    def test_event_loop_stays_responsive(self, tmp_path):
+        """
+        Во время долгого запроса цикл событий продолжает работать.
+        """
+        async def check(db):
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            rows = await db.execute_query(SLOW_QUERY)
+            task.cancel()
+            assert rows == [{"total": 3000000 * 3000001 // 2}]
+            assert ticks > 5
+        run(check, tmp_path)
+
+    def test_cancellation_interrupts_query(self, tmp_path):
+        """
+        Отмена задачи прерывает выполняющийся запрос.
+        """
+        async def check(db):
+            query = SLOW_QUERY.replace("3000000", "300000000")
+            task = asyncio.create_task(db.execute_query(query))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await db.execute_query("SELECT 1 AS one")
+            assert time.perf_counter() - started < 2
+        run(check, tmp_path)
+
+    def test_invalid_limits(self, tmp_path):
+        """
+        Неположительные ограничения очереди вызывают ошибку.
+        """
+        with pytest.raises(ValueError):
+            AsyncDatabaseManager(str(tmp_path / "x.db"), max_pending=0)
+
+
+    def test_memory_database_reads_during_transaction(self):
+        """
+        База ":memory:" читается во время открытой транзакции записи.
+        """
+        async def main():
+            async with AsyncDatabaseManager(":memory:", pool_size=2) as db:
+                db.manager.create_tables()
+                db.manager.insert_sample_data()
+                async with db.transaction() as tx:
+                    await tx.execute("DELETE FROM users WHERE user_id = 6")
+                    rows = await db.execute_query("SELECT COUNT(*) AS n FROM users")
+                assert rows == [{"n": 6}]
+                return await db.execute_query("SELECT COUNT(*) AS n FROM users")
+        assert asyncio.run(main()) == [{"n": 5}]
@@ -0,0 +1,234 @@
+import argparse
+import csv
+import re
+import sqlite3
+import time
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+# PRAGMAs applied for the duration of a load and restored afterwards
+BULK_PRAGMAS = {
+    "synchronous": "OFF",
+    "cache_size": "-65536",
+    "temp_store": "MEMORY",
+}
+# Used unless the database is in WAL, which already appends cheaply and
+# cannot leave WAL while pooled readers are open
+BULK_JOURNAL_MODE = "MEMORY"
+# Plain decimal numbers only: int() and float() also accept "1_000", "nan" and "inf"
+_INTEGER = re.compile(r"[+-]?[0-9]+")
+_REAL = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+class LoadReport:
+    """Outcome of one bulk load"""
+
+    def __init__(self, table: str, rows: int, batches: int, seconds: float) -> None:
+        self.table = table
+        self.rows = rows
+        self.batches = batches
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "rows": self.rows,
+            "batches": self.batches,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second),
+        }
+
+    def __str__(self) -> str:
+        return (f"{self.table}: {self.rows} rows in {self.batches} batches, "
+                f"{self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for use in SQL"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _value_type(value: str) -> str:
+    """SQLite type of a single non-empty CSV value"""
+    if _INTEGER.fullmatch(value):
+        return "INTEGER"
+    if _REAL.fullmatch(value):
+        return "REAL"
+    return "TEXT"
+
+
+def infer_column_types(path: str, sample_rows: int = 1000, delimiter: str = ",") -> dict[str, str]:
+    """Guess INTEGER, REAL or TEXT for every column from the first sample_rows rows
+
+    Empty values are treated as NULL and do not affect the guess.
+    """
+    ranks = {"INTEGER": 0, "REAL": 1, "TEXT": 2}
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader)
+        types = [None] * len(header)
+        for row in islice(reader, sample_rows):
+            for i, value in enumerate(row[:len(header)]):
+                if value == "" or types[i] == "TEXT":
+                    continue
+                kind = _value_type(value)
+                if types[i] is None or ranks[kind] > ranks[types[i]]:
+                    types[i] = kind
+    return {name: kind or "TEXT" for name, kind in zip(header, types)}
+
+
+def _converter(kind: str) -> Callable[[str], Any]:
+    """Parse a CSV value for a column type, empty strings become NULL
+
+    Values that do not parse are kept as text, SQLite stores them as they are.
+    """
+    parse, pattern = {"INTEGER": (int, _INTEGER), "REAL": (float, _REAL)}.get(kind.upper(), (None, None))
+
+    def convert(value: str) -> Any:
+        if value == "":
+            return None
+        if parse is None or not pattern.fullmatch(value):
+            return value
+        return parse(value)
+
+    return convert
+
+
+def _converted_rows(reader: Iterator[list[str]], converters: Sequence[Callable[[str], Any]]) -> Iterator[tuple]:
+    width = len(converters)
+    for row in reader:
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        yield tuple(convert(value) for convert, value in zip(converters, row))
+
+
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: dict[str, str]) -> dict[str, str]:
+    """Set PRAGMAs and return their previous values"""
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = str(conn.execute(f"PRAGMA {name}").fetchone()[0])
+        conn.execute(f"PRAGMA {name}={value}")
+    return previous
+
+
+def _restore_indexes(conn: sqlite3.Connection, indexes: list[tuple[str, str]]) -> list[tuple[str, sqlite3.Error]]:
+    """Run each (name, CREATE INDEX) pair and return the ones that failed with their errors"""
+    failed = []
+    for name, sql in indexes:
+        try:
+            conn.execute(sql)
+        except sqlite3.Error as error:
+            failed.append((name, error))
+    return failed
+
+
+def _unrestored_message(table: str, failed: list[tuple[str, sqlite3.Error]]) -> str:
+    return f"Indexes on {table} could not be restored: " + ", ".join(f"{name} ({error})" for name, error in failed)
+
+
+def load_csv(conn: sqlite3.Connection, path: str, table: str, column_types: Optional[dict[str, str]] = None,
+             batch_size: int = 50_000, indexes: Iterable[str | Sequence[str]] = (),
+             delimiter: str = ",", sample_rows: int = 1000) -> LoadReport:
+    """Stream a CSV file with a header row into a table
+
+    The table is created if needed, with column_types or inferred types.
+    Rows are inserted with executemany in transactions of batch_size rows
+    while BULK_PRAGMAS are in effect. Indexes already on the table are
+    dropped for the load and recreated at the end, together with the
+    requested ones (a column name or a sequence of names per index).
+    An index that cannot be recreated, e.g. a UNIQUE one over duplicate
+    rows, raises sqlite3.OperationalError after the load, or is noted on
+    the load's own error.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+    if conn.in_transaction:
+        conn.commit()
+    if column_types is None:
+        column_types = infer_column_types(path, sample_rows, delimiter)
+
+    quoted_table = quote_identifier(table)
+    columns = ", ".join(f"{quote_identifier(name)} {kind}" for name, kind in column_types.items())
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {quoted_table} ({columns})")
+
+    existing = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)).fetchall()
+    requested = []
+    for index in indexes:
+        index_columns = [index] if isinstance(index, str) else list(index)
+        name = f"idx_{table}_{'_'.join(index_columns)}"
+        requested.append((name, f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)} ON {quoted_table} "
+                                f"({', '.join(quote_identifier(column) for column in index_columns)})"))
+
+    pragmas = dict(BULK_PRAGMAS)
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        pragmas["journal_mode"] = BULK_JOURNAL_MODE
+    previous = _apply_pragmas(conn, pragmas)
+
+    dropped: list[tuple[str, str]] = []
+    load_error = None
+    rows = batches = 0
+    started = time.perf_counter()
+    try:
+        for name, sql in existing:
+            conn.execute(f"DROP INDEX {quote_identifier(name)}")
+            dropped.append((name, sql))
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            header = next(reader)
+            converters = [_converter(column_types.get(name, "TEXT")) for name in header]
+            insert = (f"INSERT INTO {quoted_table} ({', '.join(quote_identifier(name) for name in header)}) "
+                      f"VALUES ({', '.join('?' * len(header))})")
+            stream = _converted_rows(reader, converters)
+            while batch := list(islice(stream, batch_size)):
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(insert, batch)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                rows += len(batch)
+                batches += 1
+    except BaseException as error:
+        load_error = error
+        raise
+    finally:
+        # One index at a time, so a failing one neither hides the load error nor skips the rest
+        unrestored = _restore_indexes(conn, dropped + requested)
+        conn.commit()
+        _apply_pragmas(conn, previous)
+        if unrestored and load_error is not None:
+            load_error.add_note(_unrestored_message(table, unrestored))
+    if unrestored:
+        raise sqlite3.OperationalError(_unrestored_message(table, unrestored)) from unrestored[0][1]
+
+    return LoadReport(table, rows, batches, time.perf_counter() - started)
+
+
+def _main(argv: Optional[list[str]] = None) -> None:
+    """Load a CSV file into a SQLite table and print the throughput"""
+    parser = argparse.ArgumentParser(description="Bulk CSV to SQLite loader")
+    parser.add_argument("csv_file", help="CSV file with a header row")
+    parser.add_argument("database", help="SQLite database file")
+    parser.add_argument("table", help="target table, created if missing")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="rows per transaction")
+    parser.add_argument("--index", action="append", default=[], metavar="COLUMNS",
+                        help="comma-separated columns to index after the load, may be repeated")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.database)
+    try:
+        report = load_csv(conn, args.csv_file, args.table, batch_size=args.batch_size,
+                          indexes=[index.split(",") for index in args.index])
+    finally:
+        conn.close()
+    print(report)
+
+
+if __name__ == "__main__":
+    _main()
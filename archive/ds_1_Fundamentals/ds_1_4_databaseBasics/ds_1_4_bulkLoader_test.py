@@ -0,0 +1,128 @@
+import csv
+import sqlite3
+from pathlib import Path
+
+import pytest
+from ds_1_4_bulkLoader import infer_column_types, load_csv
+from ds_1_4_databases import DatabaseManager
+
+TITANIC = Path(__file__).resolve().parents[3] / "learning" / "titanic" / "titanic.csv"
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "bulk.db")
+    yield conn
+    conn.close()
+
+
+class TestBulkLoader:
+    """
+    Класс тестирования пакетной загрузки CSV.
+    """
+
+    def test_infer_column_types(self):
+        """
+        Типы столбцов определяются по выборке строк.
+        """
+        types = infer_column_types(TITANIC)
+        assert types["PassengerId"] == "INTEGER"
+        assert types["Age"] == "REAL"
+        assert types["Fare"] == "REAL"
+        assert types["Name"] == "TEXT"
+        assert types["Cabin"] == "TEXT"
+
+    def test_numeric_lookalikes_stay_text(self, conn, tmp_path):
+        """
+        Строки, которые int() и float() принимают, но которые не являются десятичными числами, остаются текстом.
+        """
+        path = tmp_path / "codes.csv"
+        words = ["1_000", "nan", "inf", "-Infinity", "١٢"]
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["word", "count", "ratio"])
+            writer.writerows((word, i, f"{i}.5e-1") for i, word in enumerate(words))
+            writer.writerow(["x", "+3", ".5"])
+        assert infer_column_types(path) == {"word": "TEXT", "count": "INTEGER", "ratio": "REAL"}
+
+        load_csv(conn, path, "codes", column_types={"word": "REAL", "count": "INTEGER", "ratio": "REAL"})
+        rows = conn.execute("SELECT word, typeof(word), count, ratio FROM codes").fetchall()
+        assert [(word, kind) for word, kind, _, _ in rows[:-1]] == [(word, "text") for word in words]
+        assert rows[-1][2:] == (3, 0.5)
+
+    def test_load_titanic(self, conn):
+        """
+        Загрузка titanic.csv небольшими пакетами с отложенным индексом.
+        """
+        report = load_csv(conn, TITANIC, "passengers", batch_size=100, indexes=["Pclass", ("Sex", "Age")])
+
+        assert report.rows == 891 and report.batches == 9
+        assert report.rows_per_second > 0
+        assert conn.execute("SELECT COUNT(*) FROM passengers").fetchone()[0] == 891
+        assert conn.execute("SELECT COUNT(*) FROM passengers WHERE Age IS NULL").fetchone()[0] == 177
+        assert conn.execute("SELECT typeof(Fare), typeof(Survived) FROM passengers LIMIT 1").fetchone() == ("real", "integer")
+        indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert indexes == {"idx_passengers_Pclass", "idx_passengers_Sex_Age"}
+
+    def test_pragmas_restored_and_existing_indexes_kept(self, conn, tmp_path):
+        """
+        Настройки PRAGMA восстанавливаются, существующие индексы пересоздаются.
+        """
+        path = tmp_path / "points.csv"
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["x", "label"])
+            writer.writerows((i, f"p{i}") for i in range(1000))
+        conn.execute("CREATE TABLE points (x INTEGER, label TEXT)")
+        conn.execute("CREATE INDEX points_label ON points (label)")
+        before = [conn.execute(f"PRAGMA {name}").fetchone()[0] for name in ("synchronous", "cache_size", "journal_mode")]
+
+        load_csv(conn, path, "points", batch_size=300)
+        load_csv(conn, path, "points", column_types={"x": "INTEGER", "label": "TEXT"})
+
+        after = [conn.execute(f"PRAGMA {name}").fetchone()[0] for name in ("synchronous", "cache_size", "journal_mode")]
+        assert after == before
+        assert conn.execute("SELECT COUNT(*) FROM points").fetchone()[0] == 2000
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM points WHERE label = 'p5'").fetchall()
+        assert "points_label" in plan[0][-1]
+
+    def test_unrestored_indexes_are_reported(self, conn, tmp_path):
+        """
+        Индекс, который нельзя пересоздать, не мешает восстановить остальные и приводит к ошибке;
+        при ошибке самой загрузки пробрасывается она, с заметкой о потерянных индексах.
+        """
+        path = tmp_path / "points.csv"
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["x", "label"])
+            writer.writerows((i % 10, f"p{i}") for i in range(100))
+        conn.execute("CREATE TABLE points (x INTEGER, label TEXT)")
+        conn.execute("CREATE UNIQUE INDEX points_x ON points (x)")
+        conn.execute("CREATE INDEX points_label ON points (label)")
+
+        with pytest.raises(sqlite3.OperationalError, match="points_x") as raised:
+            load_csv(conn, path, "points", batch_size=30)
+        assert isinstance(raised.value.__cause__, sqlite3.IntegrityError)
+        indexes = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert indexes == {"points_label"}
+        assert conn.execute("SELECT COUNT(*) FROM points").fetchone()[0] == 100
+
+        conn.execute("CREATE UNIQUE INDEX points_label_unique ON points (label)")
+        broken = tmp_path / "broken.csv"
+        with open(broken, "wb") as file:
+            file.write(b"x,label\n" + b"".join(b"%d,p%d\n" % (i, i % 100) for i in range(5000)) + b"1,\xff\n")
+        with pytest.raises(UnicodeDecodeError) as raised:
+            load_csv(conn, broken, "points", batch_size=30)
+        assert any("points_label_unique" in note for note in raised.value.__notes__)
+        assert not conn.in_transaction
+
+    def test_database_manager_load(self, tmp_path):
+        """
+        Загрузка через DatabaseManager и чтение через пул.
+        """
+        with DatabaseManager(str(tmp_path / "manager.db")) as db:
+            report = db.load_csv(TITANIC, "passengers")
+            rows = db.execute_query("SELECT Pclass, COUNT(*) AS n FROM passengers GROUP BY Pclass ORDER BY Pclass")
+
+        assert report.rows == 891
+        assert rows == [{"Pclass": 1, "n": 216}, {"Pclass": 2, "n": 184}, {"Pclass": 3, "n": 491}]
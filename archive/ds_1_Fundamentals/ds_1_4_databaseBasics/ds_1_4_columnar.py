@@ -0,0 +1,137 @@
+import math
+import sqlite3
+from array import array
+from typing import Any, Iterator, Sequence
+
+# Largest integer magnitude a double holds exactly
+_EXACT_INT = 2 ** 53
+
+
+def _is_number(value: Any) -> bool:
+    return value is None or type(value) is float or (type(value) is int and -_EXACT_INT <= value <= _EXACT_INT)
+
+
+class _ColumnBuilder:
+    """Accumulate one result column, narrowing it as values arrive
+
+    A column starts as array('q') and becomes array('d') on the first
+    REAL or NULL value, with NULL stored as NaN (SQLite never returns
+    NaN, it stores it as NULL). Text and blobs turn it into a plain list
+    with None for NULL, and so do integers beyond 2**53 that would have
+    to become doubles, whichever batch they arrive in.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self) -> None:
+        self.data: array | list = array("q")
+
+    def extend(self, values: Sequence[Any]) -> None:
+        data = self.data
+        if isinstance(data, list):
+            data.extend(values)
+            return
+        if data.typecode == "q":
+            size = len(data)
+            try:
+                data.extend(values)
+                return
+            except (TypeError, OverflowError):
+                # array.extend keeps the values appended before the failing one
+                del data[size:]
+
+        # array('d') would silently round integers beyond 2**53
+        if all(_is_number(value) for value in values) and (
+                data.typecode == "d" or all(-_EXACT_INT <= value <= _EXACT_INT for value in data)):
+            if data.typecode == "q":
+                self.data = data = array("d", data)
+            data.extend([math.nan if value is None else value for value in values])
+        elif data.typecode == "d":
+            self.data = [None if value != value else value for value in data] + list(values)
+        else:
+            self.data = data.tolist() + list(values)
+
+
+class ColumnarResult:
+    """Query result stored column by column
+
+    Integer columns are array('q'), real columns (and integer columns
+    with NULLs) array('d') with NaN for NULL, other columns lists.
+    """
+
+    def __init__(self, names: Sequence[str], columns: Sequence[array | list]) -> None:
+        self.names = list(names)
+        self.columns = list(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, key: str | int) -> array | list:
+        """Column by name (the first one if names repeat) or by position"""
+        if isinstance(key, int):
+            return self.columns[key]
+        try:
+            return self.columns[self.names.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def iter_rows(self) -> Iterator[tuple]:
+        """Rows as tuples, NaN in numeric columns turned back into None"""
+        columns = [[None if value != value else value for value in column]
+                   if isinstance(column, array) and column.typecode == "d" else column
+                   for column in self.columns]
+        return zip(*columns)
+
+    def to_dicts(self) -> list[dict]:
+        """Rows as dictionaries, like DatabaseManager.execute_query"""
+        return [dict(zip(self.names, row)) for row in self.iter_rows()]
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Columns as NumPy arrays, numeric ones without copying (needs numpy)"""
+        import numpy as np
+
+        converted = {}
+        for name, column in zip(self.names, self.columns):
+            if isinstance(column, array):
+                converted.setdefault(name, np.frombuffer(column, dtype=np.int64 if column.typecode == "q" else np.float64))
+            else:
+                converted.setdefault(name, np.array(column, dtype=object))
+        return converted
+
+    def to_pandas(self) -> Any:
+        """Result as a pandas DataFrame (needs pandas and numpy)"""
+        import numpy as np
+        import pandas as pd
+
+        frame = pd.DataFrame({
+            position: np.frombuffer(column, dtype=np.int64 if column.typecode == "q" else np.float64)
+            if isinstance(column, array) else column
+            for position, column in enumerate(self.columns)
+        })
+        frame.columns = self.names
+        return frame
+
+    def __repr__(self) -> str:
+        kinds = ", ".join(f"{name}: {column.typecode if isinstance(column, array) else 'list'}"
+                          for name, column in zip(self.names, self.columns))
+        return f"ColumnarResult({len(self)} rows; {kinds})"
+
+
+def fetch_columns(conn: sqlite3.Connection, query: str, params: Sequence[Any] | dict = (),
+                  batch_size: int = 1000) -> ColumnarResult:
+    """Execute a query and collect its result by column from fetchmany batches"""
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+    cur = conn.cursor()
+    try:
+        cur.execute(query, params)
+        if cur.description is None:
+            return ColumnarResult([], [])
+        names = [desc[0] for desc in cur.description]
+        builders = [_ColumnBuilder() for _ in names]
+        while batch := cur.fetchmany(batch_size):
+            for builder, values in zip(builders, zip(*batch)):
+                builder.extend(values)
+        return ColumnarResult(names, [builder.data for builder in builders])
+    finally:
+        cur.close()
@@ -0,0 +1,152 @@
+import math
+import sqlite3
+import tracemalloc
+from array import array
+
+import pytest
+from ds_1_4_columnar import _ColumnBuilder, fetch_columns
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+def build(*batches):
+    """
+    Собирает столбец из нескольких пакетов значений.
+    """
+    builder = _ColumnBuilder()
+    for batch in batches:
+        builder.extend(batch)
+    return builder.data
+
+
+class TestColumnBuilder:
+    """
+    Класс тестирования выбора типа столбца.
+    """
+
+    def test_integers(self):
+        """
+        Целые числа хранятся в array('q').
+        """
+        data = build((1, 2), (3, 2 ** 62))
+        assert isinstance(data, array) and data.typecode == "q"
+        assert data.tolist() == [1, 2, 3, 2 ** 62]
+
+    def test_reals_and_nulls(self):
+        """
+        Вещественные числа и NULL переводят столбец в array('d'), NULL хранится как NaN.
+        """
+        data = build((1, 2), (None, 2.5))
+        assert data.typecode == "d"
+        assert data[:2].tolist() == [1.0, 2.0] and math.isnan(data[2]) and data[3] == 2.5
+
+    def test_text_becomes_list(self):
+        """
+        Текст превращает столбец в список, NaN возвращаются как None.
+        """
+        assert build((1, None), ("a",)) == [1.0, None, "a"]
+        assert build(("a", None, b"x")) == ["a", None, b"x"]
+
+    def test_partial_extend_is_undone(self):
+        """
+        Значения, добавленные до ошибочного, не дублируются.
+        """
+        assert build((1, 2, 3.5, 4)).tolist() == [1.0, 2.0, 3.5, 4.0]
+        assert build((1, 2, 2 ** 70)) == [1, 2, 2 ** 70]
+
+    def test_large_integers_are_not_rounded(self):
+        """
+        Числа больше 2**53 не округляются до double ни в целом, ни в вещественном столбце,
+        и тип столбца не зависит от разбиения на пакеты.
+        """
+        assert build((2 ** 60 + 1,), (None,)) == [2 ** 60 + 1, None]
+        assert build((1.5,), (2 ** 60 + 1,)) == [1.5, 2 ** 60 + 1]
+        assert build((1.5, None), (2 ** 60 + 1,)) == build((1.5, None, 2 ** 60 + 1)) == [1.5, None, 2 ** 60 + 1]
+
+
+class TestFetchColumns:
+    """
+    Класс тестирования колоночных результатов запроса.
+    """
+
+    def test_matches_row_results(self, conn):
+        """
+        Колоночный результат совпадает с построчным при любом размере пакета.
+        """
+        conn.execute("CREATE TABLE t (i INTEGER, r REAL, s TEXT, n)")
+        rows = [(i, i / 3 if i % 5 else None, f"s{i}" if i % 7 else None, None) for i in range(1000)]
+        conn.executemany("INSERT INTO t VALUES (?, ?, ?, ?)", rows)
+        for batch_size in (1, 7, 1000, 5000):
+            result = fetch_columns(conn, "SELECT * FROM t ORDER BY i", batch_size=batch_size)
+            assert result.names == ["i", "r", "s", "n"]
+            assert len(result) == 1000
+            assert list(result.iter_rows()) == rows
+        assert [result["i"].typecode, result["r"].typecode] == ["q", "d"]
+        assert isinstance(result["s"], list)
+        assert result[0] is result["i"]
+        with pytest.raises(KeyError):
+            result["missing"]
+
+    def test_empty_and_no_result(self, conn):
+        """
+        Пустой результат и запрос без результата.
+        """
+        conn.execute("CREATE TABLE t (i INTEGER)")
+        result = fetch_columns(conn, "SELECT i FROM t")
+        assert len(result) == 0 and result.names == ["i"]
+        assert len(fetch_columns(conn, "UPDATE t SET i = 1")) == 0
+        with pytest.raises(ValueError):
+            fetch_columns(conn, "SELECT 1", batch_size=0)
+
+    def test_memory(self, conn):
+        """
+        Широкий числовой результат занимает в несколько раз меньше памяти, чем список словарей.
+        """
+        columns = [f"c{i}" for i in range(10)]
+        conn.execute(f"CREATE TABLE wide ({', '.join(column + ' REAL' for column in columns)})")
+        conn.executemany(f"INSERT INTO wide VALUES ({', '.join('?' * 10)})",
+                         ([row * 10.0 + i for i in range(10)] for row in range(20000)))
+
+        tracemalloc.start()
+        try:
+            result = fetch_columns(conn, "SELECT * FROM wide")
+            columnar = tracemalloc.get_traced_memory()[0]
+            del result
+            tracemalloc.reset_peak()
+            dicts = [dict(zip(columns, row)) for row in conn.execute("SELECT * FROM wide")]
+            by_rows = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        assert len(dicts) == 20000
+        assert by_rows > 4 * columnar
+
+    def test_manager(self, db):
+        """
+        DatabaseManager.execute_columnar возвращает те же данные, что execute_query.
+        """
+        query = "SELECT user_id, name, age FROM users ORDER BY user_id"
+        result = db.execute_columnar(query)
+        assert result.to_dicts() == db.execute_query(query)
+        assert sum(result["age"]) == sum(row["age"] for row in db.execute_query(query))
+        assert "user_id: q" in repr(result)
+
+    def test_numpy_and_pandas(self, db):
+        """
+        Преобразование в массивы NumPy и DataFrame, если библиотеки установлены.
+        """
+        np = pytest.importorskip("numpy")
+        result = db.execute_columnar("SELECT o.order_id, p.price, p.product_name FROM orders o "
+                                     "JOIN products p USING (product_id) ORDER BY o.order_id")
+        arrays = result.to_numpy()
+        assert arrays["order_id"].dtype == np.int64
+        assert arrays["price"].sum() == pytest.approx(sum(result["price"]))
+
+        pytest.importorskip("pandas")
+        frame = result.to_pandas()
+        assert list(frame.columns) == ["order_id", "price", "product_name"]
+        assert frame["product_name"].tolist() == result["product_name"]
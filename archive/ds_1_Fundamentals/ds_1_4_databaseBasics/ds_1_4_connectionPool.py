@@ -0,0 +1,224 @@
+import os
+import queue
+import shutil
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterator
+
+# Authorizer actions that change a table, mapped to the argument holding its name
+WRITE_ACTIONS = {
+    sqlite3.SQLITE_INSERT: 0,
+    sqlite3.SQLITE_UPDATE: 0,
+    sqlite3.SQLITE_DELETE: 0,
+    sqlite3.SQLITE_DROP_TABLE: 0,
+    sqlite3.SQLITE_ALTER_TABLE: 1,
+}
+
+# Authorizers active on each connection by id(), innermost last,
+# since sqlite3 cannot report the authorizer a connection already has
+_authorizers: dict[int, list[Callable[..., int]]] = {}
+
+
+class ConnectionPool:
+    """Thread-safe pool of sqlite3 connections with separate read and write pools
+
+    File databases are switched to WAL, so any number of readers run in
+    parallel with the single writer. Readers are opened with query_only,
+    writers commit or roll back when the outermost writer() block ends.
+    A thread that already holds a connection of a kind gets the same one
+    back, so nested blocks never deadlock on their own pool.
+    ":memory:" is backed by a private temporary WAL file that is deleted on
+    close(), so its readers run in parallel with the writer as well.
+    Write listeners are called with the tables an outermost writer() block
+    changed once it ends.
+    """
+
+    ROLES = ("read", "write")
+
+    def __init__(self, db_name: str, readers: int = 4, writers: int = 1, timeout: float = 5.0) -> None:
+        if readers < 1 or writers < 1:
+            raise ValueError("Pool sizes must be positive")
+        self.db_name = db_name
+        self.timeout = timeout
+        # A shared-cache memory database locks tables between its connections
+        self._temp_dir = tempfile.mkdtemp(prefix="pool-") if db_name == ":memory:" else None
+        self._target = os.path.join(self._temp_dir, "memory.db") if self._temp_dir else db_name
+        self._sizes = {"read": readers, "write": writers}
+        self._created = {"read": 0, "write": 0}
+        self._idle: dict[str, queue.LifoQueue] = {role: queue.LifoQueue() for role in self.ROLES}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._write_listeners: list[Callable[[set[str]], Any]] = []
+        self.closed = False
+
+        # The first writer switches the file to WAL
+        self._created["write"] = 1
+        self._idle["write"].put(self._connect("write"))
+
+    def _connect(self, role: str) -> sqlite3.Connection:
+        """Open a new connection configured for its role"""
+        conn = sqlite3.connect(self._target, timeout=self.timeout, check_same_thread=False)
+        if role == "write":
+            conn.execute("PRAGMA journal_mode=WAL")
+            if self._temp_dir:
+                # Nothing survives close() anyway
+                conn.execute("PRAGMA synchronous=OFF")
+        if role == "read":
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _acquire(self, role: str) -> sqlite3.Connection:
+        """Check out a connection for the current thread, reusing one it already holds"""
+        held = getattr(self._local, role, None)
+        if held is not None:
+            held[1] += 1
+            return held[0]
+        if self.closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        idle = self._idle[role]
+        try:
+            conn = idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._created[role] < self._sizes[role]
+                if can_open:
+                    self._created[role] += 1
+            if can_open:
+                try:
+                    conn = self._connect(role)
+                except BaseException:
+                    with self._lock:
+                        self._created[role] -= 1
+                    raise
+            else:
+                try:
+                    conn = idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No {role} connection available within {self.timeout}s") from None
+
+        setattr(self._local, role, [conn, 1])
+        return conn
+
+    def _release(self, role: str) -> None:
+        """Return the current thread's connection once its outermost block ends"""
+        held = getattr(self._local, role)
+        held[1] -= 1
+        if held[1]:
+            return
+        delattr(self._local, role)
+        if self.closed:
+            held[0].close()
+        else:
+            self._idle[role].put(held[0])
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection"""
+        conn = self._acquire("read")
+        try:
+            yield conn
+        finally:
+            self._release("read")
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the write connection, committing when the outermost block succeeds"""
+        conn = self._acquire("write")
+        outermost = self._local.write[1] == 1
+        written: set[str] = set()
+        track = outermost and bool(self._write_listeners)
+        try:
+            with use_authorizer(conn, _write_tracker(written)) if track else nullcontext():
+                yield conn
+            if outermost:
+                conn.commit()
+        except BaseException:
+            if outermost:
+                conn.rollback()
+            raise
+        finally:
+            self._release("write")
+            # Batches committed inside the block stay visible even after a rollback
+            if written:
+                for listener in list(self._write_listeners):
+                    listener(written)
+
+    def add_write_listener(self, listener: Callable[[set[str]], Any]) -> None:
+        """Call listener with the changed tables after every outermost writer() block"""
+        self._write_listeners.append(listener)
+
+    def remove_write_listener(self, listener: Callable[[set[str]], Any]) -> None:
+        """Stop calling a listener added with add_write_listener()"""
+        self._write_listeners.remove(listener)
+
+    def close(self) -> None:
+        """Close idle connections now and checked-out ones when they are returned"""
+        self.closed = True
+        for idle in self._idle.values():
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@contextmanager
+def use_authorizer(conn: sqlite3.Connection, authorizer: Callable[..., int]) -> Iterator[None]:
+    """Add an authorizer to a connection for the block, keeping the ones already set
+
+    Every active authorizer sees each action and the first answer other
+    than SQLITE_OK wins. The previous chain is restored when the block ends.
+    """
+    active = _authorizers.setdefault(id(conn), [])
+    active.append(authorizer)
+    try:
+        conn.set_authorizer(_chain(active))
+        yield
+    finally:
+        active.remove(authorizer)
+        if not active:
+            del _authorizers[id(conn)]
+        conn.set_authorizer(_chain(active) if active else None)
+
+
+def _chain(authorizers: list[Callable[..., int]]) -> Callable[..., int]:
+    """Authorizer calling each of authorizers in turn"""
+    if len(authorizers) == 1:
+        return authorizers[0]
+    chained = tuple(authorizers)
+
+    def authorizer(*args: Any) -> int:
+        result = sqlite3.SQLITE_OK
+        for each in chained:
+            answer = each(*args)
+            if result == sqlite3.SQLITE_OK:
+                result = answer
+        return result
+
+    return authorizer
+
+
+def _write_tracker(written: set[str]) -> Callable[..., int]:
+    """Authorizer that records the tables statements prepared on a writer change
+
+    Setting it expires cached statements, so reused ones are reported too.
+    """
+    def authorizer(action: int, *args: Any) -> int:
+        index = WRITE_ACTIONS.get(action)
+        if index is not None and args[index]:
+            written.add(args[index])
+        return sqlite3.SQLITE_OK
+
+    return authorizer
@@ -0,0 +1,198 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+from ds_1_4_connectionPool import ConnectionPool, use_authorizer
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), readers=2, timeout=0.2)
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO items(name) VALUES (?)", [("a",), ("b",)])
+    yield pool
+    pool.close()
+
+
+class TestConnectionPool:
+    """
+    Класс тестирования пула соединений.
+    """
+
+    def test_wal_and_read_only_readers(self, pool):
+        """
+        Файл переводится в WAL, читатели не могут писать.
+        """
+        with pool.reader() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items(name) VALUES ('c')")
+
+    def test_same_thread_gets_same_connection(self, pool):
+        """
+        Вложенные блоки одного потока используют одно соединение.
+        """
+        with pool.reader() as outer:
+            with pool.reader() as inner:
+                assert inner is outer
+        with pool.writer() as outer:
+            with pool.writer() as inner:
+                assert inner is outer
+
+    def test_writer_rolls_back_on_error(self, pool):
+        """
+        Ошибка внутри блока записи откатывает транзакцию.
+        """
+        with pytest.raises(RuntimeError):
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO items(name) VALUES ('c')")
+                raise RuntimeError
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 2
+
+    def test_readers_run_alongside_writer(self, pool):
+        """
+        Читатели в разных потоках работают параллельно с открытой транзакцией записи
+        и видят последнее зафиксированное состояние.
+        """
+        both_reading = threading.Barrier(2, timeout=5)
+        counts = []
+
+        def read():
+            with pool.reader() as conn:
+                both_reading.wait()
+                counts.append(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items(name) VALUES ('c')")
+            threads = [threading.Thread(target=read) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert counts == [2, 2]
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 3
+
+    def test_exhausted_pool_times_out(self, pool):
+        """
+        Если все соединения заняты, ожидание заканчивается ошибкой.
+        """
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with pool.reader():
+                holding.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait(5)
+        try:
+            with pool.reader():
+                errors = []
+                waiter = threading.Thread(target=lambda: errors.append(_try_read(pool)))
+                waiter.start()
+                waiter.join()
+            assert isinstance(errors[0], TimeoutError)
+        finally:
+            release.set()
+            thread.join()
+
+    def test_memory_database_is_shared(self):
+        """
+        ":memory:" общая для всех соединений пула, временный файл удаляется при закрытии.
+        """
+        with ConnectionPool(":memory:") as pool:
+            with pool.writer() as conn:
+                conn.execute("CREATE TABLE t (x INTEGER)")
+                conn.execute("INSERT INTO t VALUES (1)")
+            with pool.reader() as conn:
+                assert conn.execute("SELECT x FROM t").fetchall() == [(1,)]
+            path = pool._target
+        assert not os.path.exists(path)
+
+    def test_memory_reader_alongside_uncommitted_write(self):
+        """
+        Читатель ":memory:" не блокируется незафиксированной записью и видит последнее зафиксированное состояние.
+        """
+        with ConnectionPool(":memory:", timeout=0.5) as pool:
+            with pool.writer() as conn:
+                conn.execute("CREATE TABLE t (x INTEGER)")
+                conn.execute("INSERT INTO t VALUES (1)")
+            counts = []
+
+            def read():
+                with pool.reader() as conn:
+                    counts.append(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0])
+
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                thread = threading.Thread(target=read)
+                thread.start()
+                thread.join()
+            assert counts == [1]
+
+    def test_closed_pool(self, pool):
+        """
+        После закрытия пул не выдает соединений.
+        """
+        pool.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            with pool.reader():
+                pass
+
+    def test_write_listeners(self, pool):
+        """
+        Слушатели получают измененные таблицы один раз после внешнего блока записи,
+        в том числе для повторно используемых подготовленных запросов.
+        """
+        calls = []
+        pool.add_write_listener(calls.append)
+        for _ in range(2):
+            with pool.writer() as conn:
+                with pool.writer() as inner:
+                    inner.execute("INSERT INTO items(name) VALUES ('c')")
+                assert calls == [{"items"}] * len(calls)
+        with pool.writer() as conn:
+            conn.execute("CREATE TABLE other (x)")
+            conn.execute("UPDATE other SET x = 1")
+            conn.execute("SELECT COUNT(*) FROM items").fetchone()
+        assert calls == [{"items"}, {"items"}, {"other", "sqlite_master"}]
+
+        pool.remove_write_listener(calls.append)
+        with pool.writer() as conn:
+            conn.execute("DELETE FROM items")
+        assert len(calls) == 3
+
+    def test_nested_authorizers(self, pool):
+        """
+        Вложенный авторизатор работает вместе с внешним, после выхода внешний восстанавливается.
+        """
+        calls = []
+        pool.add_write_listener(calls.append)
+
+        def hide_names(action, table, column, *_):
+            return sqlite3.SQLITE_IGNORE if action == sqlite3.SQLITE_READ and column == "name" else sqlite3.SQLITE_OK
+
+        with pool.writer() as conn:
+            with use_authorizer(conn, hide_names):
+                assert conn.execute("SELECT name FROM items").fetchall() == [(None,), (None,)]
+            assert conn.execute("SELECT name FROM items").fetchall() == [("a",), ("b",)]
+            conn.execute("DELETE FROM items")
+        assert calls == [{"items"}]
+
+
+def _try_read(pool):
+    """
+    Попытка взять соединение на чтение, возвращает возникшую ошибку.
+    """
+    try:
+        with pool.reader():
+            return None
+    except TimeoutError as error:
+        return error
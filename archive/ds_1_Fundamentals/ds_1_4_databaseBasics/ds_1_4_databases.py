@@ -1,50 +1,112 @@
 import sqlite3
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Sequence
+
+from ds_1_4_bulkLoader import LoadReport, load_csv
+from ds_1_4_columnar import ColumnarResult, fetch_columns
+from ds_1_4_connectionPool import ConnectionPool
+from ds_1_4_indexAdvisor import IndexAdvisor, IndexSuggestion, Query, QueryReport
+from ds_1_4_queryCache import QueryCache, track_reads
+from ds_1_4_queryProfiler import QueryProfiler, profile_block
+
+ROW_FORMATS = ("tuple", "row", "dict")
+
+
+def iter_batches(conn: sqlite3.Connection, query: str, params: Sequence[Any] | dict = (),
+                 batch_size: int = 1000, row_format: str = "tuple") -> Iterator[list]:
+    """Yield query rows lazily as lists of up to batch_size rows
+
+    Rows are read through a separate cursor with fetchmany, so only one
+    batch is held in memory and the first rows arrive before the query ends.
+    row_format is "tuple", "row" (sqlite3.Row) or "dict".
+    """
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unknown row format: {row_format!r}")
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+
+    cur = conn.cursor()
+    if row_format == "row":
+        cur.row_factory = sqlite3.Row
+    try:
+        cur.execute(query, params)
+        if cur.description is None:
+            return
+        columns = [desc[0] for desc in cur.description]
+        while batch := cur.fetchmany(batch_size):
+            if row_format == "dict":
+                batch = [dict(zip(columns, row)) for row in batch]
+            yield batch
+    finally:
+        cur.close()
+
+
+def iter_rows(conn: sqlite3.Connection, query: str, params: Sequence[Any] | dict = (),
+              batch_size: int = 1000, row_format: str = "tuple") -> Iterator[Any]:
+    """Yield query rows lazily, fetching batch_size rows at a time (see iter_batches)"""
+    for batch in iter_batches(conn, query, params, batch_size, row_format):
+        yield from batch
 
 
 class DatabaseManager:
-    def __init__(self, db_name: str) -> None:
-        self.conn = sqlite3.connect(db_name)
-        self.cur = self.conn.cursor()
+    def __init__(self, db_name: str, pool_size: int = 4, cache: QueryCache | None = None,
+                 profiler: QueryProfiler | None = None) -> None:
+        self.pool = ConnectionPool(db_name, readers=pool_size)
+        # Opt-in result cache for execute_query, emptied by writes to the tables it read
+        self.cache = cache
+        if cache is not None:
+            self.pool.add_write_listener(cache.invalidate)
+        # Opt-in per-query stats and slow-query log for queries and profiled() blocks
+        self.profiler = profiler
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        self.pool.close()
+
+    def __enter__(self) -> "DatabaseManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def create_tables(self):
         """Create normalized tables"""
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                age INTEGER 
-            )
-            """
-        )
-
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS products (
-                product_id INTEGER PRIMARY KEY,
-                product_name TEXT NOT NULL,
-                price REAL NOT NULL,
-                category TEXT
+        with self.pool.writer() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT UNIQUE NOT NULL,
+                    age INTEGER 
+                )
+                """
             )
-            """
-        )
-
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS orders (
-                order_id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                product_id INTEGER,
-                quantity INTEGER,
-                order_date TEXT,
-                FOREIGN KEY (user_id) REFERENCES users(user_id),
-                FOREIGN KEY (product_id) REFERENCES product(product_id)
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS products (
+                    product_id INTEGER PRIMARY KEY,
+                    product_name TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    category TEXT
+                )
+                """
             )
-            """
-        )
 
-        self.conn.commit()
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS orders (
+                    order_id INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    product_id INTEGER,
+                    quantity INTEGER,
+                    order_date TEXT,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id),
+                    FOREIGN KEY (product_id) REFERENCES product(product_id)
+                )
+                """
+            )
 
     def insert_sample_data(self) -> None:
         """Insert sample data into tables"""
@@ -74,25 +136,81 @@ class DatabaseManager:
             (1007, 5, 104, 1, "2025-01-23"),
         ]
 
-        self.cur.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", users)
-        self.cur.executemany("INSERT INTO products VALUES (?, ?, ?, ?)", products)
-        self.cur.executemany("INSERT INTO orders VALUES (?, ?, ?, ?, ?)", orders)
+        with self.pool.writer() as conn:
+            conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", users)
+            conn.executemany("INSERT INTO products VALUES (?, ?, ?, ?)", products)
+            conn.executemany("INSERT INTO orders VALUES (?, ?, ?, ?, ?)", orders)
+
+    def load_csv(self, path: str, table: str, **options: Any) -> LoadReport:
+        """Bulk load a CSV file into a table through the writer connection
+
+        Options are passed to ds_1_4_bulkLoader.load_csv.
+        """
+        with self.pool.writer() as conn:
+            return load_csv(conn, path, table, **options)
+
+    def advise_indexes(self, queries: Iterable[Query],
+                       create: bool = False) -> tuple[list[IndexSuggestion], list[QueryReport]]:
+        """Suggest (and optionally create) indexes for a workload of queries"""
+        with self.pool.writer() as conn:
+            return IndexAdvisor(conn).advise(queries, create)
+
+    def execute_query(self, query: str, params: Sequence[Any] | dict = ()) -> list[dict]:
+        """Execute SQL query and return results as dictionaries
 
-        self.conn.commit()
+        With a cache, repeated queries are answered without touching SQLite
+        until a write changes one of the tables they read.
+        """
+        if self.cache is None:
+            return list(self.iter_query(query, params))
+
+        key = self.cache.make_key(query, params)
+        result = self.cache.get(key)
+        if result is None:
+            generation = self.cache.generation
+            with (self.pool.reader() as conn, track_reads(conn) as tables,
+                  profile_block(self.profiler, conn, query, params) as measured):
+                cur = conn.execute(query, params)
+                columns = tuple(desc[0] for desc in cur.description or ())
+                result = columns, cur.fetchall()
+                measured.rows = len(result[1])
+            self.cache.put(key, result, tables, generation)
+        columns, rows = result
+        return [dict(zip(columns, row)) for row in rows]
+
+    def iter_query(self, query: str, params: Sequence[Any] | dict = (),
+                   batch_size: int = 1000, row_format: str = "dict") -> Iterator[Any]:
+        """Execute SQL query and yield rows lazily in batches of batch_size"""
+        with self.pool.reader() as conn:
+            if self.profiler is None:
+                yield from iter_rows(conn, query, params, batch_size, row_format)
+            else:
+                batches = iter_batches(conn, query, params, batch_size, row_format)
+                yield from self.profiler.profile_rows(conn, query, params, batches)
 
-    def execute_query(self, query: str) -> list[dict]:
-        """Execute SQL query and return results as dictionaries"""
-        self.cur.execute(query)
-        columns = [desc[0] for desc in self.cur.description]
-        result = self.cur.fetchall()
+    def execute_columnar(self, query: str, params: Sequence[Any] | dict = (),
+                         batch_size: int = 1000) -> ColumnarResult:
+        """Execute SQL query and return results as typed columns
 
-        return [dict(zip(columns, row)) for row in result]
+        Numeric columns become arrays instead of one boxed value and one
+        dictionary per row; to_numpy() and to_pandas() convert them.
+        """
+        with self.pool.reader() as conn, profile_block(self.profiler, conn, query, params) as measured:
+            result = fetch_columns(conn, query, params, batch_size)
+            measured.rows = len(result)
+        return result
+
+    @contextmanager
+    def profiled(self, label: str | None = None, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader (or the writer) whose statements are recorded by the profiler
 
+        Rows fetched through the connection are not counted.
+        """
+        with (self.pool.writer() if write else self.pool.reader()) as conn, profile_block(self.profiler, conn, label):
+            yield conn
 
     def print_demo(self, query):
-        results = self.execute_query(query)
-        
-        for row in results:
+        for row in self.iter_query(query):
             print(f"    {row}")
     
     def demonstrate_relation_algebra(self):
@@ -137,10 +255,10 @@ class DatabaseManager:
 
 
 if __name__ == "__main__":
-    db = DatabaseManager("test_database.db")
-    db.create_tables()
-    if input("Insert data (y/n): ").lower() == "y":
+    # The pool switches a file to WAL, which would rewrite the committed test_database.db
+    with DatabaseManager(":memory:") as db:
+        db.create_tables()
         db.insert_sample_data()
-    db.demonstrate_relation_algebra()
+        db.demonstrate_relation_algebra()
 
 
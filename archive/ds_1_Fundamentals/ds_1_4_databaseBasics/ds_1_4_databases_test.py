@@ -0,0 +1,70 @@
+import sqlite3
+import tracemalloc
+
+import pytest
+from ds_1_4_databases import iter_rows
+
+
+class TestIterQuery:
+    """
+    Класс тестирования потокового чтения результатов запроса.
+    """
+
+    def test_execute_query_returns_dicts(self, db):
+        """
+        execute_query по-прежнему возвращает список словарей.
+        """
+        rows = db.execute_query("SELECT name, age FROM users WHERE age >= ? ORDER BY age", (30,))
+        assert rows == [{"name": "Alex", "age": 30}, {"name": "Rick", "age": 60}, {"name": "Guest", "age": 99}]
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 1000])
+    def test_row_formats(self, db, batch_size):
+        """
+        Кортежи, sqlite3.Row и словари при любом размере пакета.
+        """
+        query = "SELECT user_id, name FROM users ORDER BY user_id"
+
+        tuples = list(db.iter_query(query, batch_size=batch_size, row_format="tuple"))
+        rows = list(db.iter_query(query, batch_size=batch_size, row_format="row"))
+        dicts = list(db.iter_query(query, batch_size=batch_size))
+
+        assert len(tuples) == 6 and tuples[0] == (1, "Alex")
+        assert isinstance(rows[0], sqlite3.Row) and rows[0]["name"] == "Alex"
+        assert [tuple(row) for row in rows] == tuples
+        assert dicts[-1] == {"user_id": 6, "name": "Guest"}
+
+    def test_lazy_and_independent_cursor(self, db):
+        """
+        Итератор не мешает другим запросам и отдает строки до конца выборки.
+        """
+        rows = db.iter_query("SELECT user_id FROM users ORDER BY user_id", batch_size=2)
+        assert next(rows) == {"user_id": 1}
+        assert db.execute_query("SELECT COUNT(*) AS n FROM orders") == [{"n": 7}]
+        assert [row["user_id"] for row in rows] == [2, 3, 4, 5, 6]
+
+    def test_invalid_arguments(self, db):
+        """
+        Неизвестный формат строк и неположительный размер пакета.
+        """
+        with pytest.raises(ValueError):
+            list(db.iter_query("SELECT 1", row_format="list"))
+        with pytest.raises(ValueError):
+            list(db.iter_query("SELECT 1", batch_size=0))
+
+    def test_memory_stays_flat(self):
+        """
+        Память при чтении большой выборки ограничена размером пакета.
+        """
+        conn = sqlite3.connect(":memory:")
+        query = """
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < 200000)
+            SELECT n, 'row ' || n FROM seq
+        """
+        tracemalloc.start()
+        count = sum(1 for _ in iter_rows(conn, query, batch_size=500))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        conn.close()
+
+        assert count == 200000
+        assert peak < 2_000_000
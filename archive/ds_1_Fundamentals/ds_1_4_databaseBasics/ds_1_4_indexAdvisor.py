@@ -0,0 +1,248 @@
+import argparse
+import sqlite3
+import time
+from typing import Any, Iterable, Sequence
+
+from ds_1_4_bulkLoader import quote_identifier
+from ds_1_4_connectionPool import use_authorizer
+
+Query = str | tuple[str, Sequence[Any] | dict]
+# Authorizer actions of a statement that only reads
+READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def _split_query(query: Query) -> tuple[str, Sequence[Any] | dict]:
+    return (query, ()) if isinstance(query, str) else query
+
+
+def plan_cost(plan: Iterable[str]) -> tuple[int, int, int, int]:
+    """Rank a query plan, smaller is better
+
+    Counts table scans, automatic (per-query) indexes, temporary B-trees
+    for sorting or DISTINCT, and scans that read the table rather than
+    a covering index.
+    """
+    scans = automatic = temp_trees = uncovered_scans = 0
+    for detail in plan:
+        if "AUTOMATIC" in detail:
+            automatic += 1
+        elif detail.startswith("SCAN ") and "SUBQUERY" not in detail and "CONSTANT ROW" not in detail:
+            scans += 1
+            if "COVERING INDEX" not in detail:
+                uncovered_scans += 1
+        elif "TEMP B-TREE" in detail:
+            temp_trees += 1
+    return scans, automatic, temp_trees, uncovered_scans
+
+
+class IndexSuggestion:
+    """Index proposed for a table"""
+
+    def __init__(self, table: str, columns: Sequence[str]) -> None:
+        self.table = table
+        self.columns = tuple(columns)
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{'_'.join(self.columns)}"
+
+    @property
+    def sql(self) -> str:
+        columns = ", ".join(quote_identifier(column) for column in self.columns)
+        return f"CREATE INDEX IF NOT EXISTS {quote_identifier(self.name)} ON {quote_identifier(self.table)} ({columns})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IndexSuggestion) and (self.table, self.columns) == (other.table, other.columns)
+
+    def __hash__(self) -> int:
+        return hash((self.table, self.columns))
+
+    def __repr__(self) -> str:
+        return f"IndexSuggestion({self.table!r}, {list(self.columns)!r})"
+
+
+class QueryReport:
+    """Plan and timing of one workload query before and after the suggested indexes"""
+
+    def __init__(self, query: str, plan_before: list[str], seconds_before: float) -> None:
+        self.query = query
+        self.plan_before = plan_before
+        self.seconds_before = seconds_before
+        self.plan_after: list[str] = plan_before
+        self.seconds_after = seconds_before
+
+    def __str__(self) -> str:
+        lines = [" ".join(self.query.split())]
+        lines += [f"    before ({self.seconds_before * 1000:.3f} ms): {detail}" for detail in self.plan_before]
+        lines += [f"    after  ({self.seconds_after * 1000:.3f} ms): {detail}" for detail in self.plan_after]
+        return "\n".join(lines)
+
+
+class IndexAdvisor:
+    """Suggest secondary indexes for a workload from EXPLAIN QUERY PLAN
+
+    Candidate columns are the columns each query reads, collected with an
+    authorizer while the query is prepared. Candidates are tried one at a
+    time inside a savepoint; the one that removes the most scans,
+    automatic indexes and temp B-trees is kept, until no candidate helps.
+    A kept index is extended with the other columns the workload reads
+    from its table when that makes it covering and lowers the cost further.
+    The connection must be able to write, the what-if indexes are rolled
+    back unless create=True.
+    """
+
+    _SAVEPOINT = "index_advisor"
+
+    def __init__(self, conn: sqlite3.Connection, repeat: int = 5) -> None:
+        self.conn = conn
+        self.repeat = repeat
+
+    def explain(self, query: str, params: Sequence[Any] | dict = ()) -> list[str]:
+        """Plan details of a query, one line per plan step"""
+        return [row[-1] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    def columns_read(self, query: str, params: Sequence[Any] | dict = ()) -> dict[str, set[str]]:
+        """Tables and columns a query reads, as reported to the authorizer
+
+        Raises ValueError for statements that do more than read, since
+        the workload is executed repeatedly to time it.
+        """
+        read: dict[str, set[str]] = {}
+        read_only = True
+
+        def authorizer(action: int, table: str | None, column: str | None, *_: Any) -> int:
+            nonlocal read_only
+            if action not in READ_ACTIONS:
+                read_only = False
+            elif action == sqlite3.SQLITE_READ and table and column and not table.startswith("sqlite_"):
+                read.setdefault(table, set()).add(column)
+            return sqlite3.SQLITE_OK
+
+        with use_authorizer(self.conn, authorizer):
+            self.explain(query, params)
+        if not read_only:
+            raise ValueError(f"Only queries that read can be advised on: {query.strip()}")
+        return read
+
+    def _time(self, query: str, params: Sequence[Any] | dict) -> float:
+        best = float("inf")
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            self.conn.execute(query, params).fetchall()
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def _workload_cost(self, queries: list[tuple[str, Sequence[Any] | dict]]) -> tuple[int, ...]:
+        costs = [plan_cost(self.explain(query, params)) for query, params in queries]
+        return tuple(sum(parts) for parts in zip(*costs))
+
+    def _rowid_alias(self, table: str) -> set[str]:
+        """INTEGER PRIMARY KEY column of a table, every index already holds it as the rowid"""
+        info = self.conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+        return {name for _, name, kind, _, _, pk in info if pk == 1 and kind.upper() == "INTEGER"}
+
+    def _candidates(self, read: dict[str, set[str]]) -> list[IndexSuggestion]:
+        """Single-column indexes on read columns that are not already a leading index column"""
+        candidates = []
+        for table, columns in sorted(read.items()):
+            if self.conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (table,)).fetchone() != ("table",):
+                continue
+            rowid_alias = self._rowid_alias(table)
+            leading = set()
+            for index in self.conn.execute(f"PRAGMA index_list({quote_identifier(table)})").fetchall():
+                first = self.conn.execute(f"PRAGMA index_info({quote_identifier(index[1])})").fetchone()
+                if first is not None:
+                    leading.add(first[2])
+            for column in sorted(columns - rowid_alias - leading):
+                candidates.append(IndexSuggestion(table, [column]))
+        return candidates
+
+    def _try(self, suggestion: IndexSuggestion, queries: list[tuple[str, Sequence[Any] | dict]]) -> tuple[int, ...]:
+        """Workload cost with one extra index, which is dropped again"""
+        self.conn.execute(f"SAVEPOINT {self._SAVEPOINT}_try")
+        try:
+            self.conn.execute(suggestion.sql)
+            return self._workload_cost(queries)
+        finally:
+            self.conn.execute(f"ROLLBACK TO {self._SAVEPOINT}_try")
+            self.conn.execute(f"RELEASE {self._SAVEPOINT}_try")
+
+    def advise(self, queries: Iterable[Query], create: bool = False) -> tuple[list[IndexSuggestion], list[QueryReport]]:
+        """Suggest indexes for a workload and report plans and timings before and after
+
+        Args:
+            queries: SQL strings or (sql, params) pairs
+            create: Keep the suggested indexes instead of rolling them back
+
+        The analysis runs inside a SAVEPOINT and never commits: in a transaction
+        the caller already opened, pending writes and created indexes stay part
+        of it until the caller commits or rolls back.
+
+        Returns:
+            Suggested indexes and one report per query
+        """
+        workload = [_split_query(query) for query in queries]
+        read: dict[str, set[str]] = {}
+        for query, params in workload:
+            for table, columns in self.columns_read(query, params).items():
+                read.setdefault(table, set()).update(columns)
+
+        reports = [QueryReport(query, self.explain(query, params), self._time(query, params))
+                   for query, params in workload]
+
+        suggestions: list[IndexSuggestion] = []
+        self.conn.execute(f"SAVEPOINT {self._SAVEPOINT}")
+        try:
+            cost = self._workload_cost(workload)
+            while True:
+                # Turning a scan into a covering scan alone is not worth a new index
+                best, best_cost = None, cost
+                for candidate in self._candidates(read):
+                    candidate_cost = self._try(candidate, workload)
+                    if candidate_cost[:3] < cost[:3] and (best is None or candidate_cost < best_cost):
+                        best, best_cost = candidate, candidate_cost
+                if best is None:
+                    break
+
+                others = sorted(read[best.table] - set(best.columns) - self._rowid_alias(best.table))
+                covering = IndexSuggestion(best.table, list(best.columns) + others)
+                if others:
+                    covering_cost = self._try(covering, workload)
+                    if covering_cost < best_cost:
+                        best, best_cost = covering, covering_cost
+
+                self.conn.execute(best.sql)
+                suggestions.append(best)
+                cost = best_cost
+
+            for report, (query, params) in zip(reports, workload):
+                report.plan_after = self.explain(query, params)
+                report.seconds_after = self._time(query, params)
+        finally:
+            if not create:
+                self.conn.execute(f"ROLLBACK TO {self._SAVEPOINT}")
+            self.conn.execute(f"RELEASE {self._SAVEPOINT}")
+        return suggestions, reports
+
+
+def _main(argv: list[str] | None = None) -> None:
+    """Print suggested indexes and before/after plans for queries on a database"""
+    parser = argparse.ArgumentParser(description="SQLite index advisor")
+    parser.add_argument("database", help="SQLite database file")
+    parser.add_argument("queries", nargs="+", help="SQL queries of the workload")
+    parser.add_argument("--create", action="store_true", help="create the suggested indexes")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.database)
+    try:
+        suggestions, reports = IndexAdvisor(conn).advise(args.queries, create=args.create)
+    finally:
+        conn.close()
+    for suggestion in suggestions:
+        print(suggestion.sql)
+    for report in reports:
+        print(report)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,88 @@
+import pytest
+from ds_1_4_indexAdvisor import IndexSuggestion, plan_cost
+
+WORKLOAD = [
+    "SELECT user_id, name FROM users WHERE user_id NOT IN (SELECT DISTINCT user_id FROM orders)",
+    ("SELECT * FROM orders WHERE user_id = ?", (3,)),
+    "SELECT name, age FROM users WHERE age > 20 ORDER BY age",
+    """
+        SELECT u.name, p.product_name, o.quantity
+        FROM users u
+        JOIN orders o ON u.user_id = o.user_id
+        JOIN products p ON p.product_id = o.product_id
+    """,
+]
+
+
+def index_names(db):
+    return {row["name"] for row in db.execute_query("SELECT name FROM sqlite_master WHERE type = 'index'")
+            if not row["name"].startswith("sqlite_")}
+
+
+class TestIndexAdvisor:
+    """
+    Класс тестирования советника по индексам.
+    """
+
+    def test_plan_cost(self):
+        """
+        Оценка плана: сканирования, автоматические индексы, временные деревья.
+        """
+        plan = ["SCAN o", "SEARCH u USING AUTOMATIC COVERING INDEX (age=?)", "USE TEMP B-TREE FOR ORDER BY",
+                "SCAN users USING COVERING INDEX idx_users_age", "SEARCH p USING INTEGER PRIMARY KEY (rowid=?)"]
+        assert plan_cost(plan) == (2, 1, 1, 1)
+
+    def test_suggests_join_and_filter_indexes(self, db):
+        """
+        Предлагаются индексы на столбцы соединения и фильтра, без создания.
+        """
+        suggestions, reports = db.advise_indexes(WORKLOAD)
+
+        assert set(suggestions) == {IndexSuggestion("orders", ["user_id"]), IndexSuggestion("users", ["age", "name"])}
+        assert index_names(db) == set()
+        assert reports[1].plan_before == ["SCAN orders"]
+        assert reports[1].plan_after == ["SEARCH orders USING INDEX idx_orders_user_id (user_id=?)"]
+        assert reports[2].plan_after == ["SEARCH users USING COVERING INDEX idx_users_age_name (age>?)"]
+        assert all(report.seconds_before > 0 and report.seconds_after > 0 for report in reports)
+
+    def test_create_indexes(self, db):
+        """
+        Предложенные индексы создаются и повторный анализ ничего не предлагает.
+        """
+        suggestions, _ = db.advise_indexes(WORKLOAD, create=True)
+
+        assert index_names(db) == {suggestion.name for suggestion in suggestions}
+        assert db.advise_indexes(WORKLOAD)[0] == []
+
+    def test_unavoidable_scan_gets_no_index(self, db):
+        """
+        Полное чтение таблицы не приводит к лишним индексам.
+        """
+        suggestions, reports = db.advise_indexes(["SELECT name, email FROM users"])
+
+        assert suggestions == []
+        assert reports[0].plan_after == reports[0].plan_before
+
+    def test_writes_are_rejected(self, db):
+        """
+        Нечитающие запросы в нагрузке отклоняются до выполнения, данные не меняются.
+        """
+        with pytest.raises(ValueError):
+            db.advise_indexes(["SELECT * FROM orders WHERE user_id = 3", "DELETE FROM orders WHERE user_id = 3"])
+        with pytest.raises(ValueError):
+            db.advise_indexes([("UPDATE users SET age = age + 1 WHERE user_id = ?", (1,))])
+        assert db.execute_query("SELECT COUNT(*) AS n FROM orders") == [{"n": 7}]
+        assert db.execute_query("SELECT age FROM users WHERE user_id = 1") == [{"age": 30}]
+
+    def test_pending_writes_are_not_committed(self, db):
+        """
+        Анализ внутри открытой транзакции не фиксирует ее: откат отменяет и запись, и индексы.
+        """
+        with pytest.raises(RuntimeError):
+            with db.pool.writer() as conn:
+                conn.execute("DELETE FROM orders WHERE user_id = 3")
+                db.advise_indexes(WORKLOAD, create=True)
+                assert conn.in_transaction
+                raise RuntimeError
+        assert db.execute_query("SELECT COUNT(*) AS n FROM orders") == [{"n": 7}]
+        assert index_names(db) == set()
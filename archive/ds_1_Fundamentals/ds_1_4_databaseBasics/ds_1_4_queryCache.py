@@ -0,0 +1,140 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterable, Iterator, Sequence
+
+from ds_1_4_connectionPool import use_authorizer
+
+# String literals are kept as they are, whitespace elsewhere is collapsed
+_SQL_TOKEN = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|\s+""")
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace outside string literals and drop a trailing semicolon"""
+    normalized = _SQL_TOKEN.sub(lambda match: match.group(1) or " ", query).strip()
+    return normalized[:-1].rstrip() if normalized.endswith(";") else normalized
+
+
+@contextmanager
+def track_reads(conn: sqlite3.Connection) -> Iterator[set[str]]:
+    """Collect the tables read by statements prepared inside the block
+
+    Setting the authorizer expires cached statements, so every statement
+    is prepared again and reported even if it ran before.
+    """
+    tables: set[str] = set()
+
+    def authorizer(action: int, table: str | None, *_: Any) -> int:
+        if action == sqlite3.SQLITE_READ and table:
+            tables.add(table)
+        return sqlite3.SQLITE_OK
+
+    with use_authorizer(conn, authorizer):
+        yield tables
+
+
+class QueryCache:
+    """LRU cache of query results with a TTL and invalidation by table
+
+    Entries are keyed by normalized SQL and parameters and remember the
+    tables they were read from; invalidate() drops every entry that
+    depends on a written table. A result computed while one of its
+    tables was written is not stored, see generation.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float | None = 60.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if max_entries < 1:
+            raise ValueError("Cache size must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, frozenset[str], float]] = OrderedDict()
+        self._by_table: dict[str, set[Hashable]] = {}
+        self._table_generation: dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, params: Sequence[Any] | dict = ()) -> Hashable:
+        """Cache key of a query and its parameters"""
+        if isinstance(params, dict):
+            return normalize_sql(query), tuple(sorted(params.items()))
+        return normalize_sql(query), tuple(params)
+
+    @property
+    def generation(self) -> int:
+        """Write counter to read before running a query and pass to put()"""
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < self._clock():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, tables: Iterable[str], generation: int) -> bool:
+        """Store a result read from tables, unless one of them was written since generation
+
+        Returns:
+            True if the value was stored
+        """
+        tables = frozenset(tables)
+        with self._lock:
+            if any(self._table_generation.get(table, -1) > generation for table in tables):
+                return False
+            if key in self._entries:
+                self._drop(key)
+            expires = self._clock() + self.ttl if self.ttl is not None else float("inf")
+            self._entries[key] = (value, tables, expires)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            return True
+
+    def _drop(self, key: Hashable) -> None:
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table[table]
+            keys.discard(key)
+            if not keys:
+                del self._by_table[table]
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """Drop entries that read any of the written tables
+
+        Returns:
+            Number of dropped entries
+        """
+        with self._lock:
+            self._generation += 1
+            dropped = 0
+            for table in tables:
+                self._table_generation[table] = self._generation
+                for key in list(self._by_table.get(table, ())):
+                    self._drop(key)
+                    dropped += 1
+            self.invalidations += dropped
+            return dropped
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,192 @@
+import sqlite3
+import threading
+
+import pytest
+from ds_1_4_queryCache import QueryCache, normalize_sql, track_reads
+
+
+class FakeClock:
+    """
+    Управляемые часы для проверки TTL.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def manager(make_manager):
+    return make_manager(cache=QueryCache(max_entries=8))
+
+
+class TestQueryCache:
+    """
+    Класс тестирования кэша результатов запросов.
+    """
+
+    def test_normalize_sql(self):
+        """
+        Пробелы схлопываются везде, кроме строковых литералов.
+        """
+        assert normalize_sql("  SELECT *\n\tFROM  users ;") == "SELECT * FROM users"
+        assert normalize_sql("SELECT 'a  b'") != normalize_sql("SELECT 'a b'")
+        assert QueryCache.make_key("SELECT ?", [1]) == QueryCache.make_key("SELECT  ?", (1,))
+        assert QueryCache.make_key("SELECT :a, :b", {"b": 2, "a": 1}) == \
+            QueryCache.make_key("SELECT :a, :b", {"a": 1, "b": 2})
+
+    def test_lru_limit(self):
+        """
+        При переполнении вытесняется давно не использованная запись.
+        """
+        cache = QueryCache(max_entries=2)
+        cache.put("a", 1, {"t"}, cache.generation)
+        cache.put("b", 2, {"t"}, cache.generation)
+        assert cache.get("a") == 1
+        cache.put("c", 3, {"t"}, cache.generation)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert (cache.hits, cache.misses) == (3, 1)
+        with pytest.raises(ValueError):
+            QueryCache(max_entries=0)
+
+    def test_ttl(self):
+        """
+        Запись истекает через ttl секунд.
+        """
+        clock = FakeClock()
+        cache = QueryCache(ttl=10, clock=clock)
+        cache.put("a", 1, (), cache.generation)
+        clock.now = 10
+        assert cache.get("a") == 1
+        clock.now = 10.5
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_by_table(self):
+        """
+        Сбрасываются только записи, читавшие измененные таблицы.
+        """
+        cache = QueryCache()
+        cache.put("users", 1, {"users"}, cache.generation)
+        cache.put("join", 2, {"users", "orders"}, cache.generation)
+        cache.put("products", 3, {"products"}, cache.generation)
+        assert cache.invalidate({"orders"}) == 1
+        assert cache.get("join") is None
+        assert cache.get("users") == 1 and cache.get("products") == 3
+        assert cache.invalidate({"users", "products"}) == 2
+        assert len(cache) == 0
+
+    def test_stale_result_is_not_stored(self):
+        """
+        Результат, прочитанный до записи в его таблицу, не попадает в кэш.
+        """
+        cache = QueryCache()
+        generation = cache.generation
+        cache.invalidate({"users"})
+        assert not cache.put("users", 1, {"users"}, generation)
+        assert cache.put("products", 2, {"products"}, generation)
+        assert cache.put("users", 1, {"users"}, cache.generation)
+
+    def test_track_reads(self):
+        """
+        Авторизатор сообщает таблицы и для уже подготовленного запроса, включая таблицы представлений.
+        """
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE a (x)")
+        conn.execute("CREATE TABLE b (y)")
+        conn.execute("CREATE VIEW v AS SELECT x, y FROM a, b")
+        conn.execute("SELECT * FROM v").fetchall()
+        with track_reads(conn) as tables:
+            conn.execute("SELECT * FROM v").fetchall()
+        assert {"a", "b"} <= tables
+        conn.close()
+
+
+class TestManagerCache:
+    """
+    Класс тестирования кэша в DatabaseManager.
+    """
+
+    def test_hit_skips_sqlite(self, manager):
+        """
+        Повторный запрос отвечается из кэша без обращения к SQLite.
+        """
+        query = "SELECT name, age FROM users WHERE age > ? ORDER BY name"
+        first = manager.execute_query(query, (30,))
+
+        statements = []
+        with manager.pool.reader() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                second = manager.execute_query("SELECT name, age\n  FROM users WHERE age > ? ORDER BY name;", (30,))
+            finally:
+                conn.set_trace_callback(None)
+        assert second == first
+        assert second is not first
+        assert statements == []
+        assert manager.cache.hits == 1
+
+    def test_write_invalidates_dependent_queries(self, manager):
+        """
+        Запись в таблицу сбрасывает зависящие от нее запросы и не трогает остальные.
+        """
+        users = "SELECT COUNT(*) AS n FROM users"
+        joined = "SELECT COUNT(*) AS n FROM orders JOIN products USING (product_id)"
+        assert manager.execute_query(users) == [{"n": 6}]
+        assert manager.execute_query(joined) == [{"n": 7}]
+
+        with manager.pool.writer() as conn:
+            conn.execute("INSERT INTO products VALUES (105, 'Cable', 9.99, 'Electronics')")
+        assert len(manager.cache) == 1
+        assert manager.execute_query(users) == [{"n": 6}]
+        assert manager.cache.hits == 1
+
+        with manager.pool.writer() as conn:
+            conn.execute("INSERT INTO users VALUES (7, 'Eve', 'eve@example.com', 22)")
+        assert manager.execute_query(users) == [{"n": 7}]
+
+    def test_write_with_index_advisor(self, manager):
+        """
+        Советчик индексов в том же блоке записи не отключает отслеживание записей.
+        """
+        query = "SELECT age FROM users WHERE user_id = 1"
+        assert manager.execute_query(query) == [{"age": 30}]
+        with manager.pool.writer() as conn:
+            manager.advise_indexes(["SELECT name FROM users WHERE age > 20"])
+            conn.execute("UPDATE users SET age = age + 1")
+        assert manager.cache.invalidations == 1
+        assert manager.execute_query(query) == [{"age": 31}]
+
+    def test_concurrent_reads_and_writes(self, manager):
+        """
+        При параллельных записях кэш не возвращает устаревшие данные после записи.
+        """
+        query = "SELECT COUNT(*) AS n FROM users"
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            while not stop.is_set():
+                try:
+                    manager.execute_query(query)
+                except Exception as error:
+                    errors.append(error)
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+        try:
+            for user_id in range(7, 57):
+                with manager.pool.writer() as conn:
+                    conn.execute("INSERT INTO users VALUES (?, ?, ?, ?)",
+                                 (user_id, f"user{user_id}", f"user{user_id}@example.com", 20))
+                assert manager.execute_query(query) == [{"n": user_id}]
+        finally:
+            stop.set()
+            for thread in readers:
+                thread.join()
+        assert errors == []
@@ -0,0 +1,254 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Sequence
+
+from ds_1_4_queryCache import normalize_sql
+
+# Marks the end of a profiled batch iterator
+_END = object()
+# Measurements running on each connection, outermost first; sqlite3 cannot
+# report the handlers a connection already has, so they are shared. Keyed by
+# the connection itself, which cannot be weakly referenced, so an entry keeps
+# it alive until its last measurement detaches and id() is never reused
+_measuring: dict[sqlite3.Connection, list["Measurement"]] = {}
+
+
+class QueryStats:
+    """Totals for one normalized query"""
+
+    def __init__(self, sql: str) -> None:
+        self.sql = sql
+        self.calls = 0
+        self.rows = 0
+        self.vm_steps = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "calls": self.calls,
+            "rows": self.rows,
+            "vm_steps": self.vm_steps,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.mean_seconds * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class SlowQuery:
+    """One execution that took at least the slow threshold"""
+
+    def __init__(self, sql: str, params: Any, seconds: float, rows: int, vm_steps: int,
+                 statements: list[str], plan: list[str]) -> None:
+        self.sql = sql
+        self.params = params
+        self.seconds = seconds
+        self.rows = rows
+        self.vm_steps = vm_steps
+        self.statements = statements
+        self.plan = plan
+
+    def __str__(self) -> str:
+        lines = [f"{self.seconds * 1000:.3f} ms, {self.rows} rows, ~{self.vm_steps} VM steps: {self.sql}"]
+        lines += [f"    {detail}" for detail in self.plan]
+        return "\n".join(lines)
+
+
+class Measurement:
+    """Wall time, rows, VM steps and traced SQL of one profiled block"""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.vm_steps = 0
+        self.seconds = 0.0
+        self.statements: list[str] = []
+        self._started: float | None = None
+
+    def start(self) -> None:
+        if self._started is None:
+            self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._started is not None:
+            self.seconds += time.perf_counter() - self._started
+            self._started = None
+
+
+class QueryProfiler:
+    """Per-query statistics and a slow-query log
+
+    A profiled block installs a progress handler that counts SQLite VM
+    steps (in units of progress_steps) and a trace callback that captures
+    the executed SQL. Totals are kept per normalized query; executions of
+    at least slow_threshold seconds go to a bounded log together with
+    their EXPLAIN QUERY PLAN, which is only run for those.
+    """
+
+    def __init__(self, slow_threshold: float = 0.1, max_slow: int = 100,
+                 progress_steps: int = 1000) -> None:
+        if progress_steps < 1:
+            raise ValueError("progress_steps must be positive")
+        self.slow_threshold = slow_threshold
+        self.progress_steps = progress_steps
+        self.enabled = True
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=max_slow)
+        self._stats: dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, conn: sqlite3.Connection, sql: str | None = None,
+                params: Sequence[Any] | dict = ()) -> Iterator[Measurement]:
+        """Profile the statements run on conn inside the block
+
+        sql names the entry in the stats; without it the traced
+        statements are used. Set the yielded measurement's rows when
+        the block fetches rows itself. Blocks nested on one connection
+        all see the inner statements, counted in the outermost block's
+        progress_steps.
+        """
+        measurement = Measurement()
+        if not self.enabled:
+            yield measurement
+            return
+
+        _attach(conn, measurement, self.progress_steps)
+        try:
+            yield measurement
+        finally:
+            _detach(conn, measurement)
+            self._record(conn, measurement, sql, params)
+
+    def profile_rows(self, conn: sqlite3.Connection, sql: str, params: Sequence[Any] | dict,
+                     batches: Iterable[list]) -> Iterator[Any]:
+        """Yield the rows of batches fetched on conn, timing only the fetching
+
+        The handlers are attached only while a batch is fetched, so neither
+        the consumer's time nor statements it runs on conn between rows are
+        counted, and a generator that is never finished leaves none behind.
+        The stats are recorded once the generator ends or is closed.
+        """
+        if not self.enabled:
+            for batch in batches:
+                yield from batch
+            return
+
+        measurement = Measurement()
+        iterator = iter(batches)
+        count = 0
+        try:
+            while True:
+                _attach(conn, measurement, self.progress_steps)
+                try:
+                    batch = next(iterator, _END)
+                finally:
+                    _detach(conn, measurement)
+                if batch is _END:
+                    break
+                for row in batch:
+                    count += 1
+                    yield row
+        finally:
+            measurement.rows += count
+            self._record(conn, measurement, sql, params)
+
+    def _record(self, conn: sqlite3.Connection, measurement: Measurement, sql: str | None,
+                params: Sequence[Any] | dict) -> None:
+        key = normalize_sql(sql) if sql is not None else \
+            "; ".join(normalize_sql(statement) for statement in measurement.statements)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(key)
+            stats.calls += 1
+            stats.rows += measurement.rows
+            stats.vm_steps += measurement.vm_steps
+            stats.total_seconds += measurement.seconds
+            stats.max_seconds = max(stats.max_seconds, measurement.seconds)
+        if measurement.seconds >= self.slow_threshold:
+            explained = [(sql, params)] if sql is not None else [(statement, ()) for statement in measurement.statements]
+            self.slow_queries.append(SlowQuery(key, params, measurement.seconds, measurement.rows,
+                                               measurement.vm_steps, measurement.statements,
+                                               _explain(conn, explained)))
+
+    def stats(self) -> list[QueryStats]:
+        """Totals per query, most total time first"""
+        with self._lock:
+            return sorted(self._stats.values(), key=lambda stats: stats.total_seconds, reverse=True)
+
+    def format_stats(self, limit: int = 20) -> str:
+        """Stats as a text table"""
+        header = f"{'calls':>7} {'rows':>9} {'vm_steps':>11} {'total_ms':>10} {'mean_ms':>9} {'max_ms':>9}  sql"
+        lines = [header]
+        for stats in self.stats()[:limit]:
+            lines.append(f"{stats.calls:>7} {stats.rows:>9} {stats.vm_steps:>11} "
+                         f"{stats.total_seconds * 1000:>10.3f} {stats.mean_seconds * 1000:>9.3f} "
+                         f"{stats.max_seconds * 1000:>9.3f}  {stats.sql}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget all stats and slow queries"""
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+
+
+@contextmanager
+def profile_block(profiler: QueryProfiler | None, conn: sqlite3.Connection, sql: str | None = None,
+                  params: Sequence[Any] | dict = ()) -> Iterator[Measurement]:
+    """QueryProfiler.measure() that only yields an unused measurement without a profiler"""
+    if profiler is None:
+        yield Measurement()
+    else:
+        with profiler.measure(conn, sql, params) as measurement:
+            yield measurement
+
+
+def _attach(conn: sqlite3.Connection, measurement: Measurement, steps: int) -> None:
+    """Start a measurement on conn, installing the shared handlers for the first one"""
+    active = _measuring.get(conn)
+    if active is None:
+        active = _measuring[conn] = []
+
+        def count_steps() -> int:
+            for each in active:
+                each.vm_steps += steps
+            return 0
+
+        def trace(statement: str) -> None:
+            for each in active:
+                each.statements.append(statement)
+
+        conn.set_progress_handler(count_steps, steps)
+        conn.set_trace_callback(trace)
+    active.append(measurement)
+    measurement.start()
+
+
+def _detach(conn: sqlite3.Connection, measurement: Measurement) -> None:
+    """Stop a measurement on conn, removing the handlers after the last one"""
+    measurement.stop()
+    active = _measuring[conn]
+    active.remove(measurement)
+    if not active:
+        del _measuring[conn]
+        conn.set_progress_handler(None, 0)
+        conn.set_trace_callback(None)
+
+
+def _explain(conn: sqlite3.Connection, queries: list[tuple[str, Sequence[Any] | dict]]) -> list[str]:
+    """EXPLAIN QUERY PLAN details of queries, skipping statements that cannot be explained"""
+    plan = []
+    for query, params in queries:
+        try:
+            plan += [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+        except sqlite3.Error:
+            continue
+    return plan
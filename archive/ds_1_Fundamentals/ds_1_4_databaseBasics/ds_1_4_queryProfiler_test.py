@@ -0,0 +1,153 @@
+import time
+
+import pytest
+from ds_1_4_queryProfiler import QueryProfiler, _measuring
+
+
+@pytest.fixture
+def manager(make_manager):
+    return make_manager(profiler=QueryProfiler(slow_threshold=10))
+
+
+class TestQueryProfiler:
+    """
+    Класс тестирования профилировщика запросов.
+    """
+
+    def test_stats_per_normalized_query(self, manager):
+        """
+        Вызовы одного запроса с разными пробелами суммируются в одной строке статистики.
+        """
+        manager.execute_query("SELECT * FROM users WHERE age > ?", (18,))
+        list(manager.iter_query("SELECT *\n  FROM users\n  WHERE age > ?;", (50,)))
+        manager.execute_query("SELECT COUNT(*) FROM orders")
+
+        stats = {entry.sql: entry for entry in manager.profiler.stats()}
+        users = stats["SELECT * FROM users WHERE age > ?"]
+        assert users.calls == 2
+        assert users.rows == 5 + 2
+        assert users.max_seconds <= users.total_seconds
+        assert stats["SELECT COUNT(*) FROM orders"].rows == 1
+        assert "SELECT * FROM users WHERE age > ?" in manager.profiler.format_stats()
+        assert users.to_dict()["calls"] == 2
+
+    def test_vm_steps(self, make_manager):
+        """
+        Обработчик прогресса считает шаги виртуальной машины SQLite.
+        """
+        manager = make_manager(profiler=QueryProfiler(progress_steps=10))
+        query = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 10000) SELECT SUM(i) FROM n"
+        assert manager.execute_query(query) == [{"SUM(i)": 50005000}]
+        assert manager.profiler.stats()[0].vm_steps > 10000
+        manager.execute_query("SELECT 1")
+        steps = {entry.sql: entry.vm_steps for entry in manager.profiler.stats()}
+        assert steps["SELECT 1"] < 100
+
+    def test_slow_query_log(self, manager):
+        """
+        Запросы дольше порога попадают в журнал вместе с планом выполнения.
+        """
+        manager.execute_query("SELECT name FROM users WHERE age > 20")
+        assert len(manager.profiler.slow_queries) == 0
+
+        manager.profiler.slow_threshold = 0
+        manager.execute_query("SELECT name FROM users WHERE age > ?", (20,))
+        slow = manager.profiler.slow_queries[-1]
+        assert slow.sql == "SELECT name FROM users WHERE age > ?"
+        assert slow.params == (20,)
+        assert slow.rows == 4
+        assert any(detail.startswith("SCAN") for detail in slow.plan)
+        assert slow.plan[0] in str(slow)
+
+    def test_slow_log_is_bounded(self, make_manager):
+        """
+        Журнал медленных запросов хранит только последние записи.
+        """
+        profiler = QueryProfiler(slow_threshold=0, max_slow=3)
+        manager = make_manager(profiler=profiler)
+        for i in range(10):
+            manager.execute_query("SELECT ?", (i,))
+        assert [slow.params for slow in profiler.slow_queries] == [(7,), (8,), (9,)]
+        profiler.reset()
+        assert profiler.stats() == [] and len(profiler.slow_queries) == 0
+
+    def test_profiled_block_traces_sql(self, manager):
+        """
+        В блоке profiled() записываются все выполненные на соединении запросы с подставленными параметрами.
+        """
+        manager.profiler.slow_threshold = 0
+        with manager.profiled(write=True) as conn:
+            conn.execute("UPDATE users SET age = age + 1 WHERE user_id = ?", (1,))
+            conn.execute("SELECT age FROM users WHERE user_id = 1").fetchone()
+        slow = manager.profiler.slow_queries[-1]
+        assert "UPDATE users SET age = age + 1 WHERE user_id = 1" in slow.statements
+        assert "UPDATE users SET age = age + 1 WHERE user_id = 1" in slow.sql
+        assert any("USING INTEGER PRIMARY KEY" in detail for detail in slow.plan)
+
+        with manager.profiled("labelled") as conn:
+            conn.execute("SELECT 1").fetchone()
+        with manager.pool.reader() as conn:
+            conn.execute("SELECT 2").fetchone()
+        stats = {entry.sql: entry for entry in manager.profiler.stats()}
+        assert stats["labelled"].calls == 1
+        assert not any("SELECT 2" in sql for sql in stats)
+
+    def test_nested_measure(self, manager):
+        """
+        Запрос внутри profiled() на том же соединении не сбрасывает измерение внешнего блока.
+        """
+        manager.profiler.progress_steps = 1
+        with manager.profiled("outer") as conn:
+            rows = manager.execute_query("SELECT * FROM users WHERE age > ?", (18,))
+            conn.execute("SELECT COUNT(*) FROM orders").fetchone()
+        stats = {entry.sql: entry for entry in manager.profiler.stats()}
+        assert stats["outer"].vm_steps > 0
+        assert stats["SELECT * FROM users WHERE age > ?"].rows == len(rows)
+
+        manager.profiler.slow_threshold = 0
+        with manager.profiled("traced"):
+            manager.execute_query("SELECT name FROM users")
+            with manager.pool.reader() as conn:
+                conn.execute("SELECT 3").fetchone()
+        traced = [entry for entry in manager.profiler.slow_queries if entry.sql == "traced"][0]
+        assert traced.statements[0] == "SELECT name FROM users"
+        assert "SELECT 3" in traced.statements
+
+    def test_consumer_time_is_not_counted(self, manager):
+        """
+        Время обработки строк вызывающим кодом не входит во время запроса.
+        """
+        for _ in manager.iter_query("SELECT * FROM users"):
+            time.sleep(0.02)
+        assert manager.profiler.stats()[0].total_seconds < 0.02
+
+    def test_abandoned_iteration(self, manager):
+        """
+        Прерванный перебор строк не оставляет обработчики на соединении пула и не собирает чужие запросы.
+        """
+        manager.profiler.slow_threshold = 0
+        rows = manager.iter_query("SELECT name FROM users ORDER BY user_id", batch_size=1)
+        next(rows)
+        with manager.pool.reader() as conn:
+            assert conn not in _measuring
+            conn.execute("SELECT COUNT(*) FROM orders").fetchone()
+        rows.close()
+
+        assert _measuring == {}
+        [entry] = manager.profiler.slow_queries
+        assert entry.rows == 1
+        assert entry.statements == ["SELECT name FROM users ORDER BY user_id"]
+
+        for _ in manager.iter_query("SELECT name FROM users"):
+            break
+        stats = {entry.sql: entry for entry in manager.profiler.stats()}
+        assert stats["SELECT name FROM users"].rows == 1
+        assert _measuring == {}
+
+    def test_disabled(self, manager):
+        """
+        Выключенный профилировщик ничего не записывает.
+        """
+        manager.profiler.enabled = False
+        manager.execute_query("SELECT * FROM users")
+        assert manager.profiler.stats() == []
@@ -1,33 +1,59 @@
+import importlib.util
 import sqlite3
-from pprint import pprint
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+# DatabaseJoins builds on the pool, profiler and index advisor of the previous
+# lesson. Lessons are plain folders, so that one is put on the import path
+# unless its modules are importable already
+if importlib.util.find_spec("ds_1_4_connectionPool") is None:
+    sys.path.append(str(Path(__file__).resolve().parents[1] / "ds_1_4_databaseBasics"))
+
+from ds_1_4_connectionPool import ConnectionPool
+from ds_1_4_databases import iter_batches, iter_rows
+from ds_1_4_indexAdvisor import IndexAdvisor, IndexSuggestion, Query, QueryReport
+from ds_1_4_queryProfiler import QueryProfiler, profile_block
+
 
 class DatabaseJoins:
-    def __init__(self, db_path: str) -> None:
-        self.conn = sqlite3.connect(db_path)
-        self.cur = self.conn.cursor()
+    def __init__(self, db_path: str, pool_size: int = 4, profiler: QueryProfiler | None = None) -> None:
+        self.pool = ConnectionPool(db_path, readers=pool_size)
+        self.profiler = profiler
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        self.pool.close()
+
+    def __enter__(self) -> "DatabaseJoins":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def create_tables(self):
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                sex TEXT NOT NULL,
-                age INTEGER NOT NULL
-        )    
-        """)
-
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                topic TEXT NOT NULL,
-                user_id INTEGER NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-        """)
-
-        self.conn.commit()
+        with self.pool.writer() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL UNIQUE,
+                    sex TEXT NOT NULL,
+                    age INTEGER NOT NULL
+            )    
+            """)
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users(id)
+            )
+            """)
 
     def insert_sample_data(self):
+        """Insert sample users and posts unless the tables already hold data"""
         users = [
             ('utyara3', 'male', 16),
             ('coolboy', 'male', 40),
@@ -46,9 +72,40 @@ class DatabaseJoins:
             ('sqlite3 python', 1)
         ]
 
-        self.cur.executemany("INSERT INTO users(username, sex, age) VALUES (?, ?, ?)", users)
-        self.cur.executemany("INSERT INTO posts(topic, user_id) VALUES (?, ?)", posts)
-    
+        with self.pool.writer() as conn:
+            # Reruns of the demo must not trip over the UNIQUE usernames
+            if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return
+            conn.executemany("INSERT INTO users(username, sex, age) VALUES (?, ?, ?)", users)
+            conn.executemany("INSERT INTO posts(topic, user_id) VALUES (?, ?)", posts)
+
+    def iter_query(self, query: str, params: Sequence[Any] | dict = (),
+                   batch_size: int = 1000, row_format: str = "dict") -> Iterator[Any]:
+        """Execute SQL query and yield rows lazily in batches of batch_size"""
+        with self.pool.reader() as conn:
+            if self.profiler is None:
+                yield from iter_rows(conn, query, params, batch_size, row_format)
+            else:
+                batches = iter_batches(conn, query, params, batch_size, row_format)
+                yield from self.profiler.profile_rows(conn, query, params, batches)
+
+    @contextmanager
+    def profiled(self, label: str | None = None, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader (or the writer) whose statements are recorded by the profiler"""
+        with (self.pool.writer() if write else self.pool.reader()) as conn, profile_block(self.profiler, conn, label):
+            yield conn
+
+    def advise_indexes(self, queries: Iterable[Query],
+                       create: bool = False) -> tuple[list[IndexSuggestion], list[QueryReport]]:
+        """Suggest (and optionally create) indexes for a workload of queries"""
+        with self.pool.writer() as conn:
+            return IndexAdvisor(conn).advise(queries, create)
+
+    def print_query(self, query: str) -> None:
+        """Print query rows as they are fetched"""
+        for row in self.iter_query(query, row_format="tuple"):
+            print(f"    {row}")
+
     def demonstrate_joins(self):
         #1. Inner JOIN
         query = """
@@ -59,7 +116,7 @@ class DatabaseJoins:
             ORDER BY u.username
         """
         print("1. Inner Join:\n")
-        pprint(self.cur.execute(query).fetchall())
+        self.print_query(query)
 
         #2. Outer JOIN (Left)
         query = """
@@ -70,7 +127,7 @@ class DatabaseJoins:
             ORDER BY u.username
         """
         print("\nLeft Outer Join:")
-        pprint(self.cur.execute(query).fetchall())
+        self.print_query(query)
         
         #3. Outer JOIN (Right)
         query = """
@@ -81,7 +138,7 @@ class DatabaseJoins:
             ORDER BY u.username
         """
         print("\nRight Outer Join:")
-        pprint(self.cur.execute(query).fetchall())
+        self.print_query(query)
         
         #4. Cross Join
         query = """
@@ -90,7 +147,7 @@ class DatabaseJoins:
             CROSS JOIN users u
         """
         print("\nCross Join:")
-        pprint(self.cur.execute(query).fetchall())
+        self.print_query(query)
         
 
         #5. Full Join
@@ -108,7 +165,7 @@ class DatabaseJoins:
             ORDER BY u.username
         """
         print("\nFull Join:")
-        pprint(self.cur.execute(query).fetchall())
+        self.print_query(query)
         #6. Theta Join
         query = """
             SELECT u.username, p.topic
@@ -118,13 +175,11 @@ class DatabaseJoins:
             ORDER BY u.username
         """
         print("\nTheta Join:")
-        pprint(self.cur.execute(query).fetchall())
+        self.print_query(query)
 
 if __name__ == "__main__":
-    try:
-        db = DatabaseJoins("test_database.db")
+    # The pool switches a file to WAL, which would rewrite the committed test_database.db
+    with DatabaseJoins(":memory:") as db:
         db.create_tables()
         db.insert_sample_data()
         db.demonstrate_joins()
-    finally:
-        db.conn.close()
@@ -0,0 +1,69 @@
+import pytest
+from ds_1_5_databaseJoins import DatabaseJoins, QueryProfiler
+
+INNER_JOIN = "SELECT u.username, p.topic FROM users u JOIN posts p ON p.user_id = u.id ORDER BY p.id"
+
+
+@pytest.fixture
+def db():
+    joins = DatabaseJoins(":memory:", profiler=QueryProfiler())
+    joins.create_tables()
+    joins.insert_sample_data()
+    yield joins
+    joins.close()
+
+
+class TestDatabaseJoins:
+    """
+    Класс тестирования соединений таблиц в SQLite.
+    """
+
+    def test_iter_query_rows(self, db):
+        """
+        По умолчанию строки возвращаются словарями, как в DatabaseManager, по запросу кортежами.
+        """
+        rows = list(db.iter_query(INNER_JOIN, batch_size=2))
+        assert len(rows) == 7
+        assert rows[0] == {"username": "utyara3", "topic": "my data science roadmap"}
+
+        rows = list(db.iter_query("SELECT username FROM users WHERE age > ? ORDER BY id", (20,), row_format="tuple"))
+        assert rows == [("coolboy",), ("lily13",), ("j3ssy",)]
+
+    def test_sample_data_is_idempotent(self, db):
+        """
+        Повторная вставка тестовых данных не нарушает UNIQUE и не дублирует строки.
+        """
+        db.insert_sample_data()
+        assert list(db.iter_query("SELECT COUNT(*) AS n FROM users")) == [{"n": 5}]
+        assert list(db.iter_query("SELECT COUNT(*) AS n FROM posts")) == [{"n": 7}]
+
+    def test_demonstrate_joins(self, db, capsys):
+        """
+        Демонстрация печатает каждое соединение: у внешних есть строки с NULL, перекрестное дает 5 * 7 строк.
+        """
+        db.demonstrate_joins()
+        sections = capsys.readouterr().out.split("\n\n")
+        rows = {section.splitlines()[0]: [line for line in section.splitlines()[1:] if line.strip()]
+                for section in sections if section.strip()}
+        assert len(rows["Left Outer Join:"]) == 8
+        assert "    ('el1sabeth', None)" in rows["Left Outer Join:"]
+        assert len(rows["Cross Join:"]) == 35
+        assert "Theta Join:" in rows
+
+    def test_profiler(self, db):
+        """
+        DatabaseJoins записывает статистику своих запросов.
+        """
+        rows = list(db.iter_query(INNER_JOIN))
+        stats = db.profiler.stats()
+        assert len(stats) == 1
+        assert stats[0].rows == len(rows) > 0
+
+    def test_advise_indexes(self, db):
+        """
+        Для соединения пользователей и постов предлагается индекс на posts.user_id.
+        """
+        suggestions, _ = db.advise_indexes([
+            "SELECT u.username, p.topic FROM users u LEFT JOIN posts p ON p.user_id = u.id",
+        ])
+        assert [(suggestion.table, suggestion.columns[0]) for suggestion in suggestions] == [("posts", "user_id")]
@@ -0,0 +1,393 @@
+import argparse
+import random
+import sqlite3
+import time
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+JOIN_KINDS = ("inner", "left", "right", "full", "cross", "theta")
+ALGORITHMS = ("auto", "hash", "merge", "nested_loop")
+
+KeySpec = int | str | Sequence[int | str] | Callable[[Any], Any]
+Condition = Callable[[Any, Any], bool]
+Pair = tuple[Any, Any]
+
+# (keep unmatched left rows, keep unmatched right rows) for joins with a condition
+_OUTER = {
+    "inner": (False, False),
+    "theta": (False, False),
+    "left": (True, False),
+    "right": (False, True),
+    "full": (True, True),
+}
+
+# Marks an exhausted input
+_END = object()
+
+
+def key_getter(spec: KeySpec) -> Callable[[Any], Any]:
+    """Key function for a column index or name (tuple rows or dict rows), several of them, or a callable"""
+    if callable(spec):
+        return spec
+    if isinstance(spec, (int, str)):
+        return itemgetter(spec)
+    spec = tuple(spec)
+    if not spec:
+        raise ValueError("Join key needs at least one column")
+    return itemgetter(*spec)
+
+
+def _is_null(key: Any) -> bool:
+    """NULL keys never match, like in SQL"""
+    return key is None or (type(key) is tuple and any(part is None for part in key))
+
+
+def _outer_flags(kind: str) -> tuple[bool, bool]:
+    try:
+        return _OUTER[kind]
+    except KeyError:
+        raise ValueError(f"Unknown join kind for a conditional join: {kind!r}") from None
+
+
+def _keys(left_on: Optional[KeySpec], right_on: Optional[KeySpec]) -> tuple[Callable, Callable]:
+    if left_on is None or right_on is None:
+        raise ValueError("Equi-joins need both left_on and right_on")
+    if not callable(left_on) and not callable(right_on) and \
+            not isinstance(left_on, (int, str)) and not isinstance(right_on, (int, str)) and \
+            len(left_on) != len(right_on):
+        raise ValueError("left_on and right_on must have the same number of columns")
+    return key_getter(left_on), key_getter(right_on)
+
+
+def _build_side(left: Iterable[Any], right: Iterable[Any]) -> tuple[bool, Iterable[Any], Iterable[Any]]:
+    """Pick the smaller input to build the hash table on
+
+    Sized inputs are compared by len(). Otherwise both are read in
+    lockstep until one runs out, which holds at most twice the smaller
+    input in memory; the rest of the other one is still streamed.
+    """
+    if hasattr(left, "__len__") and hasattr(right, "__len__"):
+        return len(left) <= len(right), left, right
+    lefts, rights = iter(left), iter(right)
+    seen_left: list[Any] = []
+    seen_right: list[Any] = []
+    while True:
+        row = next(lefts, _END)
+        if row is _END:
+            return True, seen_left, chain(seen_right, rights)
+        seen_left.append(row)
+        row = next(rights, _END)
+        if row is _END:
+            return False, chain(seen_left, lefts), seen_right
+        seen_right.append(row)
+
+
+def hash_join(left: Iterable[Any], right: Iterable[Any], left_on: KeySpec, right_on: KeySpec,
+              kind: str = "inner", condition: Optional[Condition] = None) -> Iterator[Pair]:
+    """Equi-join by building a hash table on the smaller input and streaming the other
+
+    Yields (left_row, right_row) pairs, with None for the missing side of
+    outer join rows. condition, if given, must also hold for a match.
+    Unmatched rows of the build side come last.
+    """
+    keep_left, keep_right = _outer_flags(kind)
+    left_key, right_key = _keys(left_on, right_on)
+    build_left, left, right = _build_side(left, right)
+    if build_left:
+        build, probe, build_key, probe_key, keep_build, keep_probe = left, right, left_key, right_key, keep_left, keep_right
+    else:
+        build, probe, build_key, probe_key, keep_build, keep_probe = right, left, right_key, left_key, keep_right, keep_left
+
+    rows: list[Any] = []
+    table: dict[Any, list[int]] = {}
+    for row in build:
+        key = build_key(row)
+        if not _is_null(key):
+            table.setdefault(key, []).append(len(rows))
+        rows.append(row)
+    matched = bytearray(len(rows)) if keep_build else None
+
+    for row in probe:
+        key = probe_key(row)
+        found = False
+        if not _is_null(key):
+            for i in table.get(key, ()):
+                pair = (rows[i], row) if build_left else (row, rows[i])
+                if condition is None or condition(*pair):
+                    found = True
+                    if matched is not None:
+                        matched[i] = 1
+                    yield pair
+        if keep_probe and not found:
+            yield (None, row) if build_left else (row, None)
+
+    if matched is not None:
+        for i, row in enumerate(rows):
+            if not matched[i]:
+                yield (row, None) if build_left else (None, row)
+
+
+def _sorted_by_key(rows: Iterable[Any], key: Callable[[Any], Any], presorted: bool) -> Iterator[tuple[Any, Any]]:
+    """(key, row) pairs in key order, NULL keys first unless the input is presorted"""
+    if presorted:
+        return _check_sorted((key(row), row) for row in rows)
+    nulls, keyed = [], []
+    for row in rows:
+        row_key = key(row)
+        (nulls if _is_null(row_key) else keyed).append((row_key, row))
+    keyed.sort(key=itemgetter(0))
+    return chain(nulls, keyed)
+
+
+def _check_sorted(keyed: Iterator[tuple[Any, Any]]) -> Iterator[tuple[Any, Any]]:
+    previous = _END
+    for item in keyed:
+        if not _is_null(item[0]):
+            if previous is not _END and item[0] < previous:
+                raise ValueError("Input of a presorted merge join is not sorted by its key")
+            previous = item[0]
+        yield item
+
+
+def merge_join(left: Iterable[Any], right: Iterable[Any], left_on: KeySpec, right_on: KeySpec,
+               kind: str = "inner", condition: Optional[Condition] = None, presorted: bool = False) -> Iterator[Pair]:
+    """Equi-join by merging both inputs in key order
+
+    Inputs are sorted first (keys must be comparable) unless presorted,
+    in which case both are streamed and only one group of equal right
+    keys is held in memory. Output is in key order.
+    """
+    keep_left, keep_right = _outer_flags(kind)
+    left_key, right_key = _keys(left_on, right_on)
+    lefts = _sorted_by_key(left, left_key, presorted)
+    rights = _sorted_by_key(right, right_key, presorted)
+
+    left_item = next(lefts, _END)
+    right_item = next(rights, _END)
+    while left_item is not _END and right_item is not _END:
+        key, left_row = left_item
+        right_key_value, right_row = right_item
+        if _is_null(key) or (not _is_null(right_key_value) and key < right_key_value):
+            if keep_left:
+                yield left_row, None
+            left_item = next(lefts, _END)
+            continue
+        if _is_null(right_key_value) or right_key_value < key:
+            if keep_right:
+                yield None, right_row
+            right_item = next(rights, _END)
+            continue
+
+        group = [right_row]
+        right_item = next(rights, _END)
+        while right_item is not _END and right_item[0] == key:
+            group.append(right_item[1])
+            right_item = next(rights, _END)
+        matched = bytearray(len(group)) if keep_right else None
+        while left_item is not _END and left_item[0] == key:
+            left_row = left_item[1]
+            found = False
+            for i, right_row in enumerate(group):
+                if condition is None or condition(left_row, right_row):
+                    found = True
+                    if matched is not None:
+                        matched[i] = 1
+                    yield left_row, right_row
+            if keep_left and not found:
+                yield left_row, None
+            left_item = next(lefts, _END)
+        if matched is not None:
+            for i, right_row in enumerate(group):
+                if not matched[i]:
+                    yield None, right_row
+
+    while keep_left and left_item is not _END:
+        yield left_item[1], None
+        left_item = next(lefts, _END)
+    while keep_right and right_item is not _END:
+        yield None, right_item[1]
+        right_item = next(rights, _END)
+
+
+def nested_loop_join(left: Iterable[Any], right: Iterable[Any], left_on: Optional[KeySpec] = None,
+                     right_on: Optional[KeySpec] = None, kind: str = "inner",
+                     condition: Optional[Condition] = None) -> Iterator[Pair]:
+    """Join by comparing every left row with every right row
+
+    Handles every join kind, including cross joins and theta joins with
+    an arbitrary condition. The right input is held in memory, the left
+    one is streamed.
+    """
+    inner = list(right)
+    if kind == "cross":
+        if condition is not None or left_on is not None or right_on is not None:
+            raise ValueError("Cross joins take no keys or condition")
+        for left_row in left:
+            for right_row in inner:
+                yield left_row, right_row
+        return
+
+    keep_left, keep_right = _outer_flags(kind)
+    if left_on is None and right_on is None:
+        if condition is None:
+            raise ValueError(f"A {kind} join needs keys or a condition")
+        left_key = None
+        right_keys: list[Any] = []
+    else:
+        left_key, right_key = _keys(left_on, right_on)
+        right_keys = [right_key(row) for row in inner]
+    matched = bytearray(len(inner)) if keep_right else None
+
+    for left_row in left:
+        key = left_key(left_row) if left_key is not None else None
+        if left_key is not None and _is_null(key):
+            if keep_left:
+                yield left_row, None
+            continue
+        found = False
+        for i, right_row in enumerate(inner):
+            if left_key is not None and right_keys[i] != key:
+                continue
+            if condition is not None and not condition(left_row, right_row):
+                continue
+            found = True
+            if matched is not None:
+                matched[i] = 1
+            yield left_row, right_row
+        if keep_left and not found:
+            yield left_row, None
+
+    if matched is not None:
+        for i, right_row in enumerate(inner):
+            if not matched[i]:
+                yield None, right_row
+
+
+def join(left: Iterable[Any], right: Iterable[Any], on: Optional[KeySpec] = None,
+         left_on: Optional[KeySpec] = None, right_on: Optional[KeySpec] = None, kind: str = "inner",
+         condition: Optional[Condition] = None, algorithm: str = "auto", presorted: bool = False) -> Iterator[Pair]:
+    """Join two iterables of tuples or dicts and stream (left_row, right_row) pairs
+
+    Args:
+        left, right: Rows to join
+        on: Key for both sides, or left_on and right_on separately: a column
+            index or name, a sequence of them, or a function of the row
+        kind: "inner", "left", "right", "full", "cross" or "theta"
+        condition: Predicate on (left_row, right_row); required for theta
+            joins and checked in addition to the keys otherwise
+        algorithm: "hash", "merge", "nested_loop", or "auto" (hash join for
+            equi-joins, merge join for presorted inputs, nested loop otherwise)
+        presorted: Inputs are already sorted by key, the merge join streams them
+
+    Returns:
+        Iterator of pairs, with None for the missing side of outer join rows
+    """
+    if kind not in JOIN_KINDS:
+        raise ValueError(f"Unknown join kind: {kind!r}")
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown join algorithm: {algorithm!r}")
+    if on is not None:
+        if left_on is not None or right_on is not None:
+            raise ValueError("Pass either on or left_on/right_on")
+        left_on = right_on = on
+    if kind == "theta" and condition is None:
+        raise ValueError("Theta joins need a condition")
+
+    # The join functions are generators, check arguments before the first row is asked for
+    has_keys = left_on is not None or right_on is not None
+    if kind == "cross" and (has_keys or condition is not None):
+        raise ValueError("Cross joins take no keys or condition")
+    if kind != "cross" and not has_keys and condition is None:
+        raise ValueError(f"A {kind} join needs keys or a condition")
+    if has_keys:
+        _keys(left_on, right_on)
+    if algorithm == "auto":
+        if kind == "cross" or not has_keys:
+            algorithm = "nested_loop"
+        else:
+            algorithm = "merge" if presorted else "hash"
+    if algorithm == "nested_loop":
+        return nested_loop_join(left, right, left_on, right_on, kind, condition)
+    if kind == "cross" or not has_keys:
+        raise ValueError(f"The {algorithm} join needs join keys")
+    if algorithm == "hash":
+        return hash_join(left, right, left_on, right_on, kind, condition)
+    return merge_join(left, right, left_on, right_on, kind, condition, presorted)
+
+
+# SQL of the benchmarked joins, users u and posts p matched on p.user_id = u.id
+BENCHMARK_SQL = {
+    "inner": "SELECT * FROM users u JOIN posts p ON p.user_id = u.id",
+    "left": "SELECT * FROM users u LEFT JOIN posts p ON p.user_id = u.id",
+    "right": "SELECT * FROM users u RIGHT JOIN posts p ON p.user_id = u.id",
+    "full": "SELECT * FROM users u FULL JOIN posts p ON p.user_id = u.id",
+}
+
+
+def benchmark_data(users: int, posts: int, seed: int = 0) -> tuple[list[tuple], list[tuple]]:
+    """Random users (id, username, sex, age) and posts (id, topic, user_id) shaped like DatabaseJoins
+
+    About one user in ten has no posts and one post in twenty has no author.
+    """
+    rng = random.Random(seed)
+    user_rows = [(i, f"user{i}", rng.choice(("male", "female")), rng.randint(12, 70)) for i in range(1, users + 1)]
+    authors = [i for i in range(1, users + 1) if rng.random() >= 0.1] or [1]
+    post_rows = [(i, f"topic{i}", rng.choice(authors) if rng.random() >= 0.05 else users + 1 + i)
+                 for i in range(1, posts + 1)]
+    return user_rows, post_rows
+
+
+def benchmark(users: int = 20_000, posts: int = 100_000, repeat: int = 3,
+              algorithms: Sequence[str] = ("hash", "merge")) -> list[tuple[str, str, int, float]]:
+    """Time the engine against SQLite on the same in-memory data, posts.user_id indexed
+
+    Returns:
+        (join kind, "sqlite" or algorithm, result rows, best seconds) per run
+    """
+    user_rows, post_rows = benchmark_data(users, posts)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, sex TEXT, age INTEGER)")
+    conn.execute("CREATE TABLE posts (id INTEGER PRIMARY KEY, topic TEXT, user_id INTEGER)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", user_rows)
+    conn.executemany("INSERT INTO posts VALUES (?, ?, ?)", post_rows)
+    # SQLite has no automatic index for RIGHT and FULL joins, without this they are quadratic
+    conn.execute("CREATE INDEX idx_posts_user_id ON posts (user_id)")
+
+    def best_of(run: Callable[[], list]) -> tuple[int, float]:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = run()
+            best = min(best, time.perf_counter() - started)
+        return len(rows), best
+
+    results = []
+    try:
+        for kind, sql in BENCHMARK_SQL.items():
+            results.append((kind, "sqlite", *best_of(lambda: conn.execute(sql).fetchall())))
+            for algorithm in algorithms:
+                results.append((kind, algorithm, *best_of(
+                    lambda: list(join(user_rows, post_rows, left_on=0, right_on=2, kind=kind, algorithm=algorithm)))))
+    finally:
+        conn.close()
+    return results
+
+
+def _main(argv: Optional[list[str]] = None) -> None:
+    """Print engine and SQLite timings for inner, left, right and full joins"""
+    parser = argparse.ArgumentParser(description="In-memory join engine benchmark against SQLite")
+    parser.add_argument("--users", type=int, default=20_000, help="rows in the users table")
+    parser.add_argument("--posts", type=int, default=100_000, help="rows in the posts table")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per join, the best is reported")
+    parser.add_argument("--algorithm", action="append", choices=ALGORITHMS[1:],
+                        help="engine algorithms to time, may be repeated (default: hash and merge)")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.users, args.posts, args.repeat, args.algorithm or ("hash", "merge"))
+    for kind, engine, rows, seconds in results:
+        print(f"{kind:>6} {engine:>12}: {rows:>9} rows in {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    _main()
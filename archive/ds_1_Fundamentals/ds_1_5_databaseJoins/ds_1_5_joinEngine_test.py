@@ -0,0 +1,188 @@
+import random
+import sqlite3
+from collections import Counter
+from itertools import count, islice
+
+import pytest
+from ds_1_5_joinEngine import benchmark, benchmark_data, hash_join, join, merge_join, nested_loop_join
+
+USERS = [
+    (1, 'utyara3', 'male', 16),
+    (2, 'coolboy', 'male', 40),
+    (3, 'lily13', 'female', 22),
+    (4, 'j3ssy', 'male', 25),
+    (5, 'el1sabeth', 'female', 13),
+]
+POSTS = [
+    (1, 'my data science roadmap', 1),
+    (2, 'beauty-blog', 3),
+    (3, 'programming', 1),
+    (4, 'how to repair your car', 4),
+    (5, 'dota2 strategyes', 2),
+    (6, 'cs2 grenades', 2),
+    (7, 'orphan', 9),
+    (8, 'anonymous', None),
+]
+SQL_KINDS = {"inner": "JOIN", "left": "LEFT JOIN", "right": "RIGHT JOIN", "full": "FULL JOIN"}
+EQUI_ALGORITHMS = ("hash", "merge", "nested_loop")
+
+
+def sqlite_join(users, posts, kind, on="p.user_id = u.id"):
+    """
+    Результат того же соединения в SQLite.
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id, username, sex, age)")
+    conn.execute("CREATE TABLE posts (id, topic, user_id)")
+    conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", users)
+    conn.executemany("INSERT INTO posts VALUES (?, ?, ?)", posts)
+    clause = "CROSS JOIN posts p" if kind == "cross" else f"{SQL_KINDS.get(kind, 'JOIN')} posts p ON {on}"
+    rows = conn.execute(f"SELECT u.*, p.* FROM users u {clause}").fetchall()
+    conn.close()
+    return Counter(rows)
+
+
+def flatten(pairs, left_width=4, right_width=3):
+    """
+    Пары строк в строки SQLite, отсутствующая сторона заполняется NULL.
+    """
+    return Counter((left or (None,) * left_width) + (right or (None,) * right_width) for left, right in pairs)
+
+
+class TestJoinEngine:
+    """
+    Класс тестирования соединений в памяти.
+    """
+
+    @pytest.mark.parametrize("algorithm", EQUI_ALGORITHMS)
+    @pytest.mark.parametrize("kind", SQL_KINDS)
+    def test_matches_sqlite(self, kind, algorithm):
+        """
+        Каждый алгоритм дает тот же результат, что SQLite, включая NULL и ключи без пары.
+        """
+        pairs = join(USERS, POSTS, left_on=0, right_on=2, kind=kind, algorithm=algorithm)
+        assert flatten(pairs) == sqlite_join(USERS, POSTS, kind)
+
+    @pytest.mark.parametrize("algorithm", EQUI_ALGORITHMS)
+    @pytest.mark.parametrize("kind", SQL_KINDS)
+    def test_random_data(self, kind, algorithm):
+        """
+        Случайные данные с повторяющимися ключами и NULL, входы-генераторы без len().
+        """
+        rng = random.Random(kind + algorithm)
+        users = [(i, f"u{i}", "x", rng.choice([None, *range(8)])) for i in range(60)]
+        posts = [(i, f"p{i}", rng.choice([None, *range(10)])) for i in range(90)]
+        pairs = join((row for row in users), (row for row in posts), left_on=3, right_on=2,
+                     kind=kind, algorithm=algorithm)
+        assert flatten(pairs) == sqlite_join(users, posts, kind, on="p.user_id = u.age")
+
+    def test_cross_join(self):
+        """
+        Декартово произведение.
+        """
+        pairs = list(join(USERS, POSTS, kind="cross"))
+        assert len(pairs) == len(USERS) * len(POSTS)
+        assert flatten(pairs) == sqlite_join(USERS, POSTS, "cross")
+        with pytest.raises(ValueError):
+            list(join(USERS, POSTS, on=0, kind="cross"))
+
+    @pytest.mark.parametrize("kind", ["theta", "left", "right", "full"])
+    def test_theta_joins(self, kind):
+        """
+        Соединения по произвольному условию, как тета-соединение в DatabaseJoins.
+        Условие на Python само учитывает NULL: в SQL сравнение с NULL ложно.
+        """
+        pairs = join(USERS, POSTS, kind=kind, condition=lambda user, post: post[2] is not None and user[0] != post[2])
+        assert flatten(pairs) == sqlite_join(USERS, POSTS, kind, on="u.id != p.user_id")
+        with pytest.raises(ValueError):
+            join(USERS, POSTS, kind="theta")
+
+    @pytest.mark.parametrize("algorithm", EQUI_ALGORITHMS)
+    def test_keys_with_condition(self, algorithm):
+        """
+        Дополнительное условие проверяется вместе с ключами.
+        """
+        pairs = join(USERS, POSTS, left_on=0, right_on=2, kind="left", algorithm=algorithm,
+                     condition=lambda user, post: "o" in post[1])
+        assert flatten(pairs) == sqlite_join(USERS, POSTS, "left", on="p.user_id = u.id AND p.topic LIKE '%o%'")
+
+    @pytest.mark.parametrize("algorithm", EQUI_ALGORITHMS)
+    def test_dict_rows_and_composite_keys(self, algorithm):
+        """
+        Строки-словари и составной ключ.
+        """
+        left = [{"a": i % 3, "b": i % 2, "name": f"l{i}"} for i in range(12)]
+        right = [{"x": i % 3, "y": i % 2, "value": i} for i in range(8)]
+        pairs = list(join(left, right, left_on=("a", "b"), right_on=("x", "y"), algorithm=algorithm))
+        expected = [(l, r) for l in left for r in right if (l["a"], l["b"]) == (r["x"], r["y"])]
+        assert sorted((l["name"], r["value"]) for l, r in pairs) == sorted((l["name"], r["value"]) for l, r in expected)
+        with pytest.raises(ValueError):
+            join(left, right, left_on=("a", "b"), right_on=("x",))
+
+    def test_streams_output(self):
+        """
+        Результат выдается потоком: бесконечные входы не мешают получить первые строки.
+        """
+        users = [(i, f"user{i}") for i in range(5)]
+        posts = ((i, i % 5) for i in count())
+        assert len(list(islice(hash_join(users, posts, 0, 1), 20))) == 20
+
+        left = ((i, i // 2) for i in count())
+        right = ((i, i) for i in count())
+        first = list(islice(merge_join(left, right, 1, 1, presorted=True), 5))
+        assert [(l[0], r[0]) for l, r in first] == [(0, 0), (1, 0), (2, 1), (3, 1), (4, 2)]
+
+        assert len(list(islice(nested_loop_join(count(), [1, 2], kind="cross"), 7))) == 7
+
+    def test_build_side_is_smaller_input(self):
+        """
+        Хеш-таблица строится по меньшему входу, больший читается потоком.
+        """
+        read = []
+
+        def posts():
+            for i in range(10_000):
+                read.append(i)
+                yield (i, i % 3)
+
+        pairs = hash_join([(0,), (1,), (2,)], posts(), 0, 1, kind="left")
+        assert next(pairs) == ((0,), (0, 0))
+        assert len(read) < 10
+
+        small = ((i,) for i in range(3))
+        pairs = hash_join(posts(), small, 1, 0, kind="full")
+        assert sum(1 for left, right in pairs if right is None) == 0
+
+    def test_presorted_input_is_checked(self):
+        """
+        Неотсортированный вход при presorted=True вызывает ошибку.
+        """
+        with pytest.raises(ValueError):
+            list(merge_join([(2,), (1,)], [(1,), (2,)], 0, 0, presorted=True))
+
+    def test_invalid_arguments(self):
+        """
+        Неизвестные виды соединений и алгоритмы.
+        """
+        with pytest.raises(ValueError):
+            join(USERS, POSTS, on=0, kind="outer")
+        with pytest.raises(ValueError):
+            join(USERS, POSTS, on=0, algorithm="index")
+        with pytest.raises(ValueError):
+            join(USERS, POSTS, kind="left", algorithm="hash", condition=lambda u, p: True)
+        with pytest.raises(ValueError):
+            join(USERS, POSTS, on=0, left_on=0, right_on=2)
+
+    def test_benchmark(self):
+        """
+        Бенчмарк возвращает для каждого вида соединения одинаковое число строк у SQLite и движка.
+        """
+        results = benchmark(users=200, posts=1000, repeat=1, algorithms=("hash", "merge", "nested_loop"))
+        by_kind = {}
+        for kind, engine, rows, seconds in results:
+            by_kind.setdefault(kind, set()).add(rows)
+            assert seconds >= 0
+        assert set(by_kind) == {"inner", "left", "right", "full"}
+        assert all(len(counts) == 1 for counts in by_kind.values())
+        users, posts = benchmark_data(200, 1000)
+        assert len(users) == 200 and len(posts) == 1000